@@ -0,0 +1,32 @@
+"""Add composite query indexes
+
+Revision ID: 4f1d2c7a9b3e
+Revises: 98c40ddc8b13
+Create Date: 2026-10-16 09:30:12.418305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f1d2c7a9b3e'
+down_revision: Union[str, Sequence[str], None] = '98c40ddc8b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_point_sim_winner', 'simulation_points', ['simulation_id', 'winner_team'], unique=False)
+    op.create_index('ix_point_sim_num', 'simulation_points', ['simulation_id', 'point_number'], unique=False)
+    op.create_index('ix_ia_sim_method_rank', 'importance_analyses', ['simulation_id', 'method', 'rank'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_ia_sim_method_rank', table_name='importance_analyses')
+    op.drop_index('ix_point_sim_num', table_name='simulation_points')
+    op.drop_index('ix_point_sim_winner', table_name='simulation_points')
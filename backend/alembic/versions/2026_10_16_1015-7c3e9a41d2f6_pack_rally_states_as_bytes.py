@@ -0,0 +1,82 @@
+"""Pack rally states as bytes
+
+Revision ID: 7c3e9a41d2f6
+Revises: 4f1d2c7a9b3e
+Create Date: 2026-10-16 10:15:47.093214
+
+"""
+import json
+from typing import Any, Sequence, Union
+
+from alembic import op
+import msgpack
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3e9a41d2f6'
+down_revision: Union[str, Sequence[str], None] = '4f1d2c7a9b3e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rows decoded per round trip when downgrading
+DOWNGRADE_BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows keep their JSON as UTF-8 bytes, which the model still reads;
+    # new rows are written as msgpack
+    op.add_column('simulation_points', sa.Column('rally_states_bin', sa.LargeBinary(), nullable=True))
+    op.execute(
+        "UPDATE simulation_points "
+        "SET rally_states_bin = pg_catalog.convert_to(rally_states::text, 'UTF8')"
+    )
+    op.alter_column('simulation_points', 'rally_states_bin', nullable=False)
+    op.drop_column('simulation_points', 'rally_states')
+    op.alter_column('simulation_points', 'rally_states_bin', new_column_name='rally_states')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Rows hold msgpack, or UTF-8 JSON if they were migrated or written
+    # without msgpack; PostgreSQL cannot read the former, so each batch of
+    # rows is decoded here and written back as JSONB
+    op.add_column('simulation_points', sa.Column('rally_states_json', postgresql.JSONB(), nullable=True))
+    points = sa.table(
+        'simulation_points',
+        sa.column('id', sa.Integer),
+        sa.column('rally_states', sa.LargeBinary),
+        sa.column('rally_states_json', postgresql.JSONB)
+    )
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(points.c.id, points.c.rally_states)
+            .where(points.c.id > last_id)
+            .order_by(points.c.id)
+            .limit(DOWNGRADE_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            points.update()
+            .where(points.c.id == sa.bindparam('point_id'))
+            .values(rally_states_json=sa.bindparam('states')),
+            [{'point_id': row.id, 'states': _unpack_rally_states(row.rally_states)} for row in rows]
+        )
+        last_id = rows[-1].id
+    op.alter_column('simulation_points', 'rally_states_json', nullable=False)
+    op.drop_column('simulation_points', 'rally_states')
+    op.alter_column('simulation_points', 'rally_states_json', new_column_name='rally_states')
+
+
+def _unpack_rally_states(data: bytes) -> Any:
+    """Decode one packed rally states value, msgpack or UTF-8 JSON."""
+    data = bytes(data)
+    # msgpack never starts an array or map with a JSON opening byte
+    if data[:1] in (b"[", b"{"):
+        return json.loads(data)
+    return msgpack.unpackb(data, raw=False)
@@ -0,0 +1,47 @@
+"""Gunicorn settings for serving the API in production.
+
+Run from the directory that contains the ``bvsim`` package::
+
+    gunicorn -c gunicorn_conf.py bvsim.main:app
+"""
+
+import os
+import warnings
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+
+# Worker processes, each running its own event loop. Background jobs keep
+# their state in process memory (simulation_status, simulation_results and
+# _analysis_results), so a status poll only finds its job on the worker
+# that started it: serve from one worker until that state moves to a
+# shared store.
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+worker_class = "bvsim.workers.UvloopWorker"
+
+# The server is CPU-bound: each worker's compiled kernels and simulation
+# pools get an equal share of the cores, all of them with the default single
+# worker. Workers beyond the core count only contend for the same cores.
+cores = os.cpu_count() or 1
+if workers > cores:
+    warnings.warn(f"WEB_CONCURRENCY={workers} exceeds the {cores} cores; "
+                  "each worker runs its simulations on a single core")
+cores_per_worker = max(1, cores // workers)
+os.environ.setdefault("NUMBA_NUM_THREADS", str(cores_per_worker))
+os.environ.setdefault("SIMULATION_WORKERS", str(cores_per_worker))
+
+# Likewise split the database's connections: every worker has a sync and an
+# async pool, and together they must stay under the server's
+# max_connections (100 by default on PostgreSQL, less a few reserved ones).
+# A third of each pool's share stays open; the rest is overflow.
+db_max_connections = int(os.getenv("DB_MAX_CONNECTIONS", "90"))
+db_pool_share = db_max_connections // (2 * workers)
+if db_pool_share < 1:
+    raise ValueError(f"WEB_CONCURRENCY={workers} needs at least {2 * workers} database "
+                     f"connections but DB_MAX_CONNECTIONS is {db_max_connections}; "
+                     "run fewer workers or raise the limit")
+db_pool_size = max(1, db_pool_share // 3)
+os.environ.setdefault("DB_POOL_SIZE", str(db_pool_size))
+os.environ.setdefault("DB_MAX_OVERFLOW", str(db_pool_share - db_pool_size))
+
+loglevel = os.getenv("LOG_LEVEL", "warning").lower()
+accesslog = None
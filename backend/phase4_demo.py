@@ -5,15 +5,20 @@ Demonstrates SHAP analysis, feature importance, and scenario analysis capabiliti
 
 import asyncio
 import json
+import os
+import sys
 import time
 from decimal import Decimal
 from typing import Dict, Any
 
-from src.bvsim.engine.advanced_analytics import AdvancedAnalyticsEngine
-from src.bvsim.schemas.analytics import (
+# Add src to Python path, importing the package as bvsim like the app does
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from bvsim.engine.advanced_analytics import AdvancedAnalyticsEngine
+from bvsim.schemas.analytics import (
     AdvancedAnalyticsRequest, AnalysisType, ScenarioAnalysisRequest
 )
-from src.bvsim.schemas.team_statistics import TeamStatisticsBase
+from bvsim.schemas.team_statistics import TeamStatisticsBase
 
 
 def create_sample_teams():
@@ -232,7 +237,7 @@ async def demo_team_profile(engine: AdvancedAnalyticsEngine, developing_team: Te
     print(f"Overall Rating: {profile.overall_rating}/100")
     
     print_subsection("Category Strengths")
-    from src.bvsim.schemas.analytics import FeatureCategory
+    from bvsim.schemas.analytics import FeatureCategory
     for category, strength in profile.category_strengths.items():
         category_name = category.value.replace('_', ' ').title()
         strength_level = "Strong" if float(strength) > 0.15 else "Moderate" if float(strength) > 0.08 else "Needs Work"
@@ -3,8 +3,9 @@ Advanced analytics API endpoints.
 Provides SHAP analysis, feature importance, and scenario testing capabilities.
 """
 
-from typing import Dict, Any, Optional
-from fastapi import APIRouter, HTTPException, BackgroundTasks, status
+from typing import TYPE_CHECKING, Callable, Dict, Any, Optional, Tuple
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, status
+from sqlalchemy import exists, select
 from decimal import Decimal
 import logging
 import asyncio
@@ -14,10 +15,16 @@ from datetime import datetime
 from ..schemas.analytics import (
     AdvancedAnalyticsRequest, AdvancedAnalyticsResponse,
     ScenarioAnalysisRequest, ScenarioAnalysisResponse,
-    AnalysisType
+    AnalysisType, AnalyticsOverview, FeatureCategory, FeatureImportance
 )
 from ..schemas.team_statistics import TeamStatisticsBase
-from ..engine.advanced_analytics import AdvancedAnalyticsEngine
+from ..engine.advanced_analytics import AdvancedAnalyticsEngine, interpret_feature_importance
+from ..core.cache import cached, invalidate
+from ..core.database import get_async_db
+from ..models.database import ImportanceAnalysis, Simulation, top_importances_query
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +34,13 @@ router = APIRouter(prefix="/analytics", tags=["Advanced Analytics"])
 _analysis_results: Dict[str, Dict[str, Any]] = {}
 
 
+def _analysis_cache_key(func: Callable[..., Any], namespace: str = "", *,
+                        request: Any = None, response: Any = None,
+                        args: Tuple[Any, ...] = (), kwargs: Dict[str, Any]) -> str:
+    """Cache key of an analysis status response: its analysis ID alone."""
+    return f"{namespace}:{kwargs['analysis_id']}:status"
+
+
 @router.post("/advanced-analysis", response_model=AdvancedAnalyticsResponse)
 async def run_advanced_analysis(request: AdvancedAnalyticsRequest):
     """
@@ -86,8 +100,13 @@ async def run_advanced_analysis_async(
 
 
 @router.get("/advanced-analysis/{analysis_id}")
+@cached(expire=5, namespace="analysis", key_builder=_analysis_cache_key)
 async def get_advanced_analysis_status(analysis_id: str):
-    """Get the status and results of a background advanced analytics analysis."""
+    """Get the status and results of a background advanced analytics analysis.
+    
+    Running analyses are polled, so their status is cached briefly; the
+    cache entry is dropped as soon as the analysis finishes.
+    """
     
     if analysis_id not in _analysis_results:
         raise HTTPException(
@@ -278,6 +297,7 @@ async def analyze_sensitivity(
 
 
 @router.get("/team-profile/{team_name}")
+@cached(expire=60, namespace="team-profile")
 async def get_team_analytics_profile(
     team_name: str,
     team_stats: TeamStatisticsBase,
@@ -316,6 +336,61 @@ async def get_team_analytics_profile(
         )
 
 
+@router.get("/overview/{simulation_id}", response_model=AnalyticsOverview)
+async def get_analytics_overview(simulation_id: int, db: "AsyncSession" = Depends(get_async_db)):
+    """Get the analytics overview of a simulation.
+    
+    The top factors are read from the simulation's stored importance
+    analyses, through the ``(simulation_id, method, rank)`` index.
+    """
+    
+    simulation = await db.get(Simulation, simulation_id)
+    if simulation is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Simulation {simulation_id} not found"
+        )
+    
+    rows = (await db.scalars(top_importances_query(simulation_id))).all()
+    
+    # Several methods rank the same statistic; keep each one's best entry
+    top_factors = []
+    seen = set()
+    for row in rows:
+        if row.statistic_name in seen:
+            continue
+        seen.add(row.statistic_name)
+        category = FeatureCategory(row.feature_category)
+        importance = float(row.importance_score)
+        # Rows were validated when the analysis stored them
+        top_factors.append(FeatureImportance.model_construct(
+            statistic_name=row.statistic_name,
+            feature_category=category,
+            importance_score=importance,
+            marginal_impact=float(row.marginal_impact),
+            rank=len(top_factors) + 1,
+            interpretation=interpret_feature_importance(row.statistic_name, importance, category)
+        ))
+        if len(top_factors) == 3:
+            break
+    
+    has_importance_analysis = bool(rows) or await db.scalar(
+        select(exists().where(ImportanceAnalysis.simulation_id == simulation_id))
+    )
+    
+    return AnalyticsOverview(
+        simulation_id=simulation_id,
+        simulation_status=simulation.status,
+        has_importance_analysis=has_importance_analysis,
+        # Sensitivity and comparison results are not persisted yet
+        has_sensitivity_analysis=False,
+        has_comparison_analysis=False,
+        top_3_most_important_factors=top_factors,
+        biggest_improvement_opportunity=top_factors[0] if top_factors else None,
+        last_analysis_update=max((row.created_at for row in rows), default=None)
+    )
+
+
 async def _run_background_analysis(analysis_id: str, request: AdvancedAnalyticsRequest):
     """Run advanced analytics analysis in the background."""
     try:
@@ -348,3 +423,6 @@ async def _run_background_analysis(analysis_id: str, request: AdvancedAnalyticsR
             "error": str(e),
             "failed_at": datetime.now().isoformat()
         }
+    
+    # Pollers see the finished analysis at once
+    await invalidate(f"analysis:{analysis_id}")
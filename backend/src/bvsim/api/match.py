@@ -6,6 +6,7 @@ Provides REST API for match-level simulations and tournament brackets.
 from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends
 from typing import Dict, Optional
 import asyncio
+import functools
 import uuid
 import logging
 from datetime import datetime
@@ -151,14 +152,19 @@ async def simulate_single_match(request: MatchSimulationRequest):
         single_match_request.num_simulations = 1
         single_match_request.include_rally_details = True
         
-        # Simulate single match
-        result = await match_simulator.simulate_match(
+        # Simulate single match off the event loop, on a simulator of its own
+        simulator = MatchSimulator()
+        if request.random_seed is not None:
+            simulator.set_random_seed(request.random_seed)
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(None, functools.partial(
+            simulator.simulate_match,
             request.team_a,
             request.team_b,
             request.match_format,
             request.momentum_effects,
             request.pressure_effects
-        )
+        ))
         
         logger.info(f"Single match simulated: {result.winner} wins")
         return result
@@ -9,7 +9,7 @@ import time
 import logging
 
 from ..engine.monte_carlo import (
-    MonteCarloEngine, SimulationBatch, SimulationResults, 
+    SimulationBatch, SimulationResults, get_default_monte_carlo_engine,
     MatchFormat, MatchResult, SetResult
 )
 from ..schemas.team_statistics import TeamStatisticsBase
@@ -51,6 +51,11 @@ class MonteCarloRequest(BaseModel):
         default=False, 
         description="Include individual match results (impacts performance)"
     )
+    antithetic: bool = Field(
+        default=False,
+        description="Simulate matches in antithetic pairs to narrow the confidence interval; "
+                    "ignored with detailed results or without Numba"
+    )
     
     # Context options
     momentum_enabled: bool = Field(default=True, description="Enable momentum effects")
@@ -126,6 +131,7 @@ class SimulationResultsResponse(BaseModel):
     confidence_interval_upper: Decimal
     margin_of_error: Decimal
     is_statistically_significant: bool
+    antithetic_paired: bool = False
     
     # Match statistics
     avg_sets_per_match: float
@@ -151,8 +157,8 @@ class SimulationStatus(BaseModel):
     error_message: Optional[str] = None
 
 
-# Global engine instance
-monte_carlo_engine = MonteCarloEngine()
+# Global engine instance, sharing its worker pools with the match simulator
+monte_carlo_engine = get_default_monte_carlo_engine()
 
 # In-memory storage for simulation status (in production, use Redis/database)
 simulation_status: Dict[str, SimulationStatus] = {}
@@ -238,19 +244,7 @@ def convert_simulation_results(
     
     return SimulationResultsResponse(
         simulation_id=simulation_id,
-        num_simulations=results.num_simulations,
-        team_a_win_probability=results.team_a_win_probability,
-        team_b_win_probability=results.team_b_win_probability,
-        team_a_win_count=results.team_a_win_count,
-        team_b_win_count=results.team_b_win_count,
-        confidence_interval_lower=results.confidence_interval_95[0],
-        confidence_interval_upper=results.confidence_interval_95[1],
-        margin_of_error=results.margin_of_error,
-        is_statistically_significant=results.is_statistically_significant,
-        avg_sets_per_match=results.avg_sets_per_match,
-        avg_rallies_per_match=results.avg_rallies_per_match,
-        set_distribution=results.set_distribution,
-        simulation_time_seconds=results.simulation_time_seconds,
+        **results.to_json_dict(),
         simulations_per_second=results.num_simulations / results.simulation_time_seconds,
         individual_matches=individual_matches
     )
@@ -272,6 +266,7 @@ async def run_monte_carlo_simulation(request: MonteCarloRequest):
             parallel_workers=request.parallel_workers,
             random_seed_base=request.random_seed,
             include_detailed_results=request.include_detailed_results,
+            antithetic=request.antithetic,
             momentum_enabled=request.momentum_enabled,
             pressure_enabled=request.pressure_enabled,
             fatigue_enabled=request.fatigue_enabled
@@ -405,8 +400,8 @@ async def run_performance_benchmark():
                 "simulation_count": count,
                 "time_seconds": elapsed_time,
                 "simulations_per_second": count / elapsed_time,
-                "team_a_win_rate": float(results.team_a_win_probability),
-                "margin_of_error": float(results.margin_of_error)
+                "team_a_win_rate": results.team_a_win_probability,
+                "margin_of_error": results.margin_of_error
             }
         
         return SuccessResponse(
@@ -439,6 +434,7 @@ async def _run_simulation_background(simulation_id: str, request: MonteCarloRequ
             parallel_workers=request.parallel_workers,
             random_seed_base=request.random_seed,
             include_detailed_results=request.include_detailed_results,
+            antithetic=request.antithetic,
             momentum_enabled=request.momentum_enabled,
             pressure_enabled=request.pressure_enabled,
             fatigue_enabled=request.fatigue_enabled
@@ -5,7 +5,8 @@ from typing import List, Optional
 from decimal import Decimal
 import logging
 
-from ..engine import RallySimulator, TeamSide, RallyContext, RallyState
+from ..engine import RALLY_STATE_NAMES, RallySimulator, TeamSide, RallyContext, RallyState, summarize_event_types
+from ..engine.rally_kernels import KernelRallySimulator, build_rally_tables
 from ..schemas.team_statistics import TeamStatisticsBase
 from ..schemas.common import SuccessResponse
 from pydantic import BaseModel, Field
@@ -95,8 +96,8 @@ async def simulate_rally(request: SimulateRallyRequest):
             team_a_score=request.team_a_score,
             team_b_score=request.team_b_score,
             set_number=request.set_number,
-            momentum=request.momentum,
-            pressure_level=request.pressure_level
+            momentum=float(request.momentum),
+            pressure_level=float(request.pressure_level)
         )
         
         # Simulate the rally
@@ -111,7 +112,7 @@ async def simulate_rally(request: SimulateRallyRequest):
         events = [
             RallyEventResponse(
                 sequence_number=event.sequence_number,
-                state=event.state.value,
+                state=RALLY_STATE_NAMES[event.state],
                 action_type=event.action_type.value,
                 performing_team=event.performing_team.value,
                 probability=event.probability,
@@ -124,7 +125,7 @@ async def simulate_rally(request: SimulateRallyRequest):
             winner=result.winner,
             point_outcome=result.point_outcome.value,
             rally_length=result.rally_length,
-            final_state=result.final_state.value if result.final_state else "unknown",
+            final_state=RALLY_STATE_NAMES[result.final_state] if result.final_state is not None else "unknown",
             total_probability=result.total_probability,
             team_a_actions=result.team_a_actions,
             team_b_actions=result.team_b_actions,
@@ -144,12 +145,15 @@ async def simulate_multiple_rallies(request: SimulateMultipleRalliesRequest):
     """Simulate multiple beach volleyball rallies for statistical analysis."""
     
     try:
+        # Walk all rallies as one batch on the pair's kernel tables
+        simulator = KernelRallySimulator(build_rally_tables(request.team_a_stats, request.team_b_stats))
+        
         # Set random seed if provided
         if request.random_seed is not None:
-            rally_simulator.set_random_seed(request.random_seed)
+            simulator.set_random_seed(request.random_seed)
         
         # Simulate multiple rallies
-        results = rally_simulator.simulate_multiple_rallies(
+        results = simulator.simulate_multiple_rallies(
             num_rallies=request.num_rallies,
             serving_team=request.serving_team,
             team_a_stats=request.team_a_stats,
@@ -162,11 +166,7 @@ async def simulate_multiple_rallies(request: SimulateMultipleRalliesRequest):
         avg_rally_length = sum(r.rally_length for r in results) / len(results) if results else 0
         
         # Event type distribution
-        all_events = [event for result in results for event in result.events]
-        event_types = {}
-        for event in all_events:
-            action = event.action_type.value
-            event_types[action] = event_types.get(action, 0) + 1
+        event_types = summarize_event_types(results)
         
         # Convert individual results to response format
         individual_results = []
@@ -174,7 +174,7 @@ async def simulate_multiple_rallies(request: SimulateMultipleRalliesRequest):
             events = [
                 RallyEventResponse(
                     sequence_number=event.sequence_number,
-                    state=event.state.value,
+                    state=RALLY_STATE_NAMES[event.state],
                     action_type=event.action_type.value,
                     performing_team=event.performing_team.value,
                     probability=event.probability,
@@ -187,7 +187,7 @@ async def simulate_multiple_rallies(request: SimulateMultipleRalliesRequest):
                 winner=result.winner,
                 point_outcome=result.point_outcome.value,
                 rally_length=result.rally_length,
-                final_state=result.final_state.value if result.final_state else "unknown",
+                final_state=RALLY_STATE_NAMES[result.final_state] if result.final_state is not None else "unknown",
                 total_probability=result.total_probability,
                 team_a_actions=result.team_a_actions,
                 team_b_actions=result.team_b_actions,
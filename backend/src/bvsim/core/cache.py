@@ -0,0 +1,70 @@
+"""Response caching for read-mostly GET endpoints."""
+
+import logging
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# fastapi-cache2 is optional; without it endpoints are served uncached
+try:
+    from fastapi_cache import FastAPICache
+    from fastapi_cache.backends.inmemory import InMemoryBackend
+    from fastapi_cache.decorator import cache as _cache
+    CACHE_AVAILABLE = True
+except ImportError:
+    CACHE_AVAILABLE = False
+
+# Prefix of every cache key, so the app can share a Redis instance
+CACHE_PREFIX = "bvsim"
+
+
+def cached(expire: int, namespace: str = "",
+           key_builder: Optional[Callable[..., str]] = None) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Cache a GET endpoint's response for ``expire`` seconds.
+    
+    Keys are built from the endpoint's own arguments only, never from the
+    request's headers or client.
+    """
+    if not CACHE_AVAILABLE:
+        return lambda endpoint: endpoint
+    return _cache(expire=expire, namespace=namespace, key_builder=key_builder)
+
+
+async def init_response_cache(redis_url: str) -> str:
+    """Back the response cache with Redis, or with process memory when Redis
+    is unreachable. Returns the backend in use."""
+    if not CACHE_AVAILABLE:
+        return "disabled"
+    
+    backend, backend_name = InMemoryBackend(), "memory"
+    try:
+        from redis import asyncio as aioredis
+        from fastapi_cache.backends.redis import RedisBackend
+        redis = aioredis.from_url(redis_url)
+        await redis.ping()
+        backend, backend_name = RedisBackend(redis), "redis"
+    except Exception as e:
+        logger.warning(f"Redis unavailable for response caching, using process memory: {e}")
+    
+    FastAPICache.reset()
+    FastAPICache.init(backend, prefix=CACHE_PREFIX)
+    return backend_name
+
+
+async def invalidate(namespace: str) -> None:
+    """Drop every cached response under ``namespace``.
+    
+    Backend errors are logged rather than raised, as on cache reads and writes.
+    """
+    if not CACHE_AVAILABLE:
+        return
+    try:
+        await FastAPICache.clear(namespace=namespace)
+    except Exception as e:
+        logger.warning(f"Could not invalidate cached responses under '{namespace}': {e}")
+
+
+# Cache in process memory until startup connects Redis, so cached endpoints
+# also work when the app runs without its lifespan
+if CACHE_AVAILABLE:
+    FastAPICache.init(InMemoryBackend(), prefix=CACHE_PREFIX)
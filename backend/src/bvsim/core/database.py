@@ -1,11 +1,20 @@
 """Database configuration and connection management."""
 
+import asyncio
 import os
-from typing import Optional, Generator
-from sqlalchemy import create_engine, text
+import time
+from typing import AsyncGenerator, Optional, Generator, Tuple
+from sqlalchemy import create_engine, make_url, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
+
+# The asyncio extension needs greenlet (the sqlalchemy[asyncio] extra)
+try:
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+    ASYNC_SQLALCHEMY_AVAILABLE = True
+except ImportError:
+    ASYNC_SQLALCHEMY_AVAILABLE = False
 
 # Load .env file if available
 try:
@@ -32,6 +41,14 @@ REDIS_URL = os.getenv(
     "redis://localhost:6379/0"
 )
 
+# Connection pool sizing per engine. Each process has a sync and an async
+# engine, so a process can hold twice pool size plus overflow; gunicorn_conf
+# derives these from the worker count, and the defaults fit one process
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+# Recycle connections before server-side idle timeouts drop them
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
 # Create SQLAlchemy engine
 if DATABASE_URL.startswith("sqlite"):
     # SQLite configuration for development/testing
@@ -45,15 +62,77 @@ else:
     # PostgreSQL configuration for production
     engine = create_engine(
         DATABASE_URL,
-        pool_size=20,
-        max_overflow=0,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
         pool_pre_ping=True,
+        pool_recycle=DB_POOL_RECYCLE,
         echo=False  # Set to True for SQL query logging
     )
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# asyncio driver for each database backend
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+}
+
+
+def get_async_database_url(url: str = DATABASE_URL) -> str:
+    """Get the database URL with its backend's asyncio driver."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+def _create_async_engine(pooled: bool = True) -> Optional["AsyncEngine"]:
+    """Create the asyncio engine, or None when the asyncio extension or the
+    database's async driver is not installed.
+    
+    An unpooled engine opens a fresh connection on each use.
+    """
+    if not ASYNC_SQLALCHEMY_AVAILABLE:
+        return None
+    try:
+        if DATABASE_URL.startswith("sqlite"):
+            return create_async_engine(
+                get_async_database_url(),
+                poolclass=StaticPool,
+                echo=False
+            )
+        if not pooled:
+            return create_async_engine(get_async_database_url(), poolclass=NullPool, echo=False)
+        return create_async_engine(
+            get_async_database_url(),
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_pre_ping=True,
+            pool_recycle=DB_POOL_RECYCLE,
+            echo=False
+        )
+    except (ImportError, KeyError):
+        return None
+
+
+# Create the asyncio engine used from async endpoints
+async_engine = _create_async_engine()
+
+# Health checks connect outside the pools, so they neither wait behind nor
+# take a connection from real traffic. SQLite has no pool to protect.
+if DATABASE_URL.startswith("sqlite"):
+    health_engine = engine
+    health_async_engine = async_engine
+else:
+    health_engine = create_engine(DATABASE_URL, poolclass=NullPool, echo=False)
+    health_async_engine = _create_async_engine(pooled=False)
+
+# Create AsyncSessionLocal class; objects stay usable after commit
+AsyncSessionLocal = (
+    async_sessionmaker(bind=async_engine, expire_on_commit=False)
+    if async_engine is not None else None
+)
+
 # Create Base class for models
 Base = declarative_base()
 
@@ -77,6 +156,19 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator["AsyncSession", None]:
+    """
+    Dependency that provides an async database session.
+    
+    Yields:
+        AsyncSession: SQLAlchemy async database session
+    """
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database sessions need sqlalchemy[asyncio] and an asyncio driver for DATABASE_URL")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def create_tables():
     """Create all database tables."""
     Base.metadata.create_all(bind=engine)
@@ -95,13 +187,47 @@ async def check_database_connection() -> bool:
         bool: True if connection is successful, False otherwise
     """
     try:
-        with engine.connect() as connection:
-            connection.execute(text("SELECT 1"))
+        if health_async_engine is not None:
+            async with health_async_engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+        else:
+            # Without an async driver, keep the blocking check off the event loop
+            await asyncio.to_thread(_check_sync_connection)
         return True
     except Exception:
         return False
 
 
+# Seconds a readiness result is reused, so frequent probes ping the database
+# at most once per interval
+READINESS_TTL_SECONDS = 2.0
+_last_readiness: Optional[Tuple[float, bool]] = None
+
+
+async def check_database_ready(ttl: float = READINESS_TTL_SECONDS) -> bool:
+    """:func:`check_database_connection`, reusing a result younger than ``ttl`` seconds."""
+    global _last_readiness
+    now = time.monotonic()
+    if _last_readiness is not None and now - _last_readiness[0] < ttl:
+        return _last_readiness[1]
+    connected = await check_database_connection()
+    _last_readiness = (time.monotonic(), connected)
+    return connected
+
+
+def _check_sync_connection() -> None:
+    with health_engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+def pool_status() -> dict:
+    """Describe the connection pools serving requests."""
+    status = {"sync": engine.pool.status()}
+    if async_engine is not None:
+        status["async"] = async_engine.pool.status()
+    return status
+
+
 # Database configuration for different environments
 class DatabaseConfig:
     """Database configuration class."""
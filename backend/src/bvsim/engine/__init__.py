@@ -2,16 +2,21 @@
 
 from .rally_states import (
     RallyState,
+    RALLY_STATE_NAMES,
     ActionType,
     TeamSide,
     StateTransition,
     RallyContext,
+    ContextSnapshot,
     is_terminal_state,
     is_continuation_state,
     get_valid_next_states,
     TERMINAL_STATES,
     CONTINUATION_STATES,
-    VALID_TRANSITIONS
+    VALID_TRANSITIONS,
+    TERMINAL_MASK,
+    CONTINUATION_MASK,
+    VALID_TRANSITION_MASK
 )
 
 from .probability_engine import (
@@ -23,7 +28,10 @@ from .rally_simulator import (
     RallySimulator,
     RallyEvent,
     RallyResult,
-    PointOutcome
+    PointOutcome,
+    ACTION_TYPE_NAMES,
+    ACTION_TYPE_CODES,
+    summarize_event_types
 )
 
 from .monte_carlo import (
@@ -33,22 +41,30 @@ from .monte_carlo import (
     MatchResult,
     SetResult,
     MatchFormat,
-    SetType
+    SetType,
+    confidence_interval_batch,
+    margin_of_error_batch,
+    get_default_monte_carlo_engine
 )
 
 __all__ = [
     # Rally states and context
     "RallyState",
+    "RALLY_STATE_NAMES",
     "ActionType", 
     "TeamSide",
     "StateTransition",
     "RallyContext",
+    "ContextSnapshot",
     "is_terminal_state",
     "is_continuation_state",
     "get_valid_next_states",
     "TERMINAL_STATES",
     "CONTINUATION_STATES",
     "VALID_TRANSITIONS",
+    "TERMINAL_MASK",
+    "CONTINUATION_MASK",
+    "VALID_TRANSITION_MASK",
     
     # Probability engine
     "ProbabilityEngine",
@@ -59,6 +75,9 @@ __all__ = [
     "RallyEvent",
     "RallyResult", 
     "PointOutcome",
+    "ACTION_TYPE_NAMES",
+    "ACTION_TYPE_CODES",
+    "summarize_event_types",
     
     # Monte Carlo simulation
     "MonteCarloEngine",
@@ -67,5 +86,8 @@ __all__ = [
     "MatchResult",
     "SetResult",
     "MatchFormat",
-    "SetType"
+    "SetType",
+    "confidence_interval_batch",
+    "margin_of_error_batch",
+    "get_default_monte_carlo_engine"
 ]
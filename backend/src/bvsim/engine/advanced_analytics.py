@@ -5,7 +5,6 @@ Implements feature importance, SHAP explanations, and impact assessments.
 
 import asyncio
 import numpy as np
-import pandas as pd
 from typing import Dict, List, Optional, Tuple, Any
 from decimal import Decimal
 import logging
@@ -13,26 +12,88 @@ import uuid
 import time
 from datetime import datetime
 
-# Analytics and ML imports
-from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
-from sklearn.linear_model import LogisticRegression
-from sklearn.model_selection import cross_val_score, train_test_split
-from sklearn.metrics import accuracy_score, roc_auc_score, classification_report
-from sklearn.preprocessing import StandardScaler
-import shap
+# pandas, scikit-learn and shap take seconds to import, so they are imported
+# by the methods that use them rather than when each API worker starts
 
 from ..schemas.analytics import (
     AdvancedAnalyticsRequest, AdvancedAnalyticsResponse, 
     TeamAnalyticsProfile, FeatureImportance, SHAPValue, 
     SHAPAnalysisResult, FeatureImpactAssessment,
     AnalysisType, FeatureCategory, ScenarioAnalysisRequest,
-    ScenarioAnalysisResponse, ScenarioResult
+    ScenarioAnalysisResponse, ScenarioResult, SensitivityDataPoint
 )
 from ..schemas.team_statistics import TeamStatisticsBase
 from ..engine.match_simulator import MatchSimulator
+from ..engine.monte_carlo import MatchFormat, SimulationBatch, get_default_monte_carlo_engine
 
 logger = logging.getLogger(__name__)
 
+# Matches behind each win rate of a sensitivity sweep. Every point of the
+# sweep replays the same seed, so the differences between points are not
+# buried in sampling noise.
+SENSITIVITY_SIMULATIONS = 2000
+SENSITIVITY_SEED = 1
+
+
+def _ratio(numerator: np.ndarray, denominator: Any) -> np.ndarray:
+    """Elementwise ``numerator / denominator``, zero wherever the denominator is."""
+    denominator = np.broadcast_to(np.asarray(denominator, dtype=np.float64), numerator.shape)
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator != 0)
+
+
+def sensitivity_data_points(baseline_value: float, baseline_win_probability: float,
+                            new_values: Any, new_win_probabilities: Any
+                            ) -> Tuple[List[SensitivityDataPoint], float, float]:
+    """Derive the data points of one statistic's sensitivity sweep.
+    
+    Every change is computed as a whole-array NumPy expression. Returns the
+    data points, the average marginal impact per unit change and the average
+    elasticity; unchanged values are left out of both averages.
+    """
+    new_values = np.asarray(new_values, dtype=np.float64)
+    new_win_probabilities = np.asarray(new_win_probabilities, dtype=np.float64)
+    
+    change_amounts = new_values - baseline_value
+    absolute_change = new_win_probabilities - baseline_win_probability
+    relative_change = _ratio(absolute_change, baseline_win_probability)
+    
+    moved = change_amounts != 0
+    marginal_impact = absolute_change[moved] / change_amounts[moved]
+    elasticity = _ratio(relative_change[moved], _ratio(change_amounts[moved], baseline_value))
+    
+    data_points = [
+        SensitivityDataPoint(
+            change_amount=change,
+            baseline_value=baseline_value,
+            new_value=value,
+            baseline_win_probability=baseline_win_probability,
+            new_win_probability=probability,
+            absolute_change=absolute,
+            relative_change=relative
+        )
+        for change, value, probability, absolute, relative in zip(
+            change_amounts.tolist(), new_values.tolist(), new_win_probabilities.tolist(),
+            absolute_change.tolist(), relative_change.tolist()
+        )
+    ]
+    average_marginal_impact = float(marginal_impact.mean()) if marginal_impact.size else 0.0
+    average_elasticity = float(elasticity.mean()) if elasticity.size else 0.0
+    return data_points, average_marginal_impact, average_elasticity
+
+
+def interpret_feature_importance(feature_name: str, importance: float, category: FeatureCategory) -> str:
+    """Generate human-readable interpretation of feature importance."""
+    clean_name = feature_name.replace('team_a_', '').replace('team_b_', '').replace('diff_', '')
+    
+    if importance > 0.1:
+        level = "highly important"
+    elif importance > 0.05:
+        level = "moderately important"
+    else:
+        level = "less important"
+    
+    return f"{clean_name.replace('_', ' ').title()} is {level} for match outcomes in the {category.value} category."
+
 
 class AdvancedAnalyticsEngine:
     """Advanced analytics engine for volleyball simulation analysis."""
@@ -93,7 +154,7 @@ class AdvancedAnalyticsEngine:
         if AnalysisType.SENSITIVITY_ANALYSIS in request.analysis_types:
             logger.info("Running sensitivity analysis...")
             results['sensitivity_analysis'] = await self._analyze_sensitivity(
-                request.team_a, request.team_b, request.sensitivity_ranges
+                request.team_a, request.team_b, request.sensitivity_ranges, request.random_seed
             )
         
         # Build team profiles
@@ -144,8 +205,9 @@ class AdvancedAnalyticsEngine:
             varied_team_b = self._add_statistical_noise(team_b) if team_b else self._generate_random_opponent()
             
             # Simulate match
-            match_result = await self.match_simulator.simulate_match(
-                varied_team_a, varied_team_b
+            match_result = self.match_simulator.simulate_match(
+                varied_team_a, varied_team_b,
+                include_rally_details=False
             )
             
             # Extract features and outcome
@@ -226,6 +288,8 @@ class AdvancedAnalyticsEngine:
     
     def _prepare_ml_data(self, training_data: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray, List[str]]:
         """Prepare data for machine learning."""
+        import pandas as pd
+        
         # Extract features and outcomes
         feature_dicts = [data['features'] for data in training_data]
         outcomes = [data['outcome'] for data in training_data]
@@ -244,6 +308,9 @@ class AdvancedAnalyticsEngine:
                                         feature_names: List[str], 
                                         model_type: str) -> List[FeatureImportance]:
         """Analyze feature importance using various methods."""
+        from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.preprocessing import StandardScaler
         
         # Select model based on type
         if model_type == "gradient_boosting":
@@ -266,37 +333,36 @@ class AdvancedAnalyticsEngine:
             # For logistic regression, use absolute coefficients
             importances = np.abs(model.coef_[0])
         
-        # Create feature importance objects
+        # Rank by importance first; the results are immutable once built
+        ranked = sorted(zip(feature_names, importances), key=lambda item: item[1], reverse=True)[:20]
+        
+        # Create feature importance objects for the top 20
         feature_importances = []
-        for i, (name, importance) in enumerate(zip(feature_names, importances)):
+        for i, (name, importance) in enumerate(ranked):
             # Determine category
             category = self._get_feature_category(name)
             
             # Calculate interpretation
-            interpretation = self._interpret_feature_importance(name, importance, category)
+            interpretation = interpret_feature_importance(name, importance, category)
             
             feature_importances.append(FeatureImportance(
                 statistic_name=name,
                 feature_category=category,
-                importance_score=Decimal(str(importance)),
-                marginal_impact=Decimal(str(importance * 0.1)),  # Simplified
+                importance_score=float(importance),
+                marginal_impact=float(importance * 0.1),  # Simplified
                 rank=i + 1,
                 interpretation=interpretation
             ))
         
-        # Sort by importance
-        feature_importances.sort(key=lambda x: x.importance_score, reverse=True)
-        
-        # Update ranks
-        for i, fi in enumerate(feature_importances):
-            fi.rank = i + 1
-        
-        return feature_importances[:20]  # Return top 20
+        return feature_importances
     
     async def _analyze_shap_values(self, X: np.ndarray, y: np.ndarray, 
                                  feature_names: List[str], 
                                  model_type: str) -> SHAPAnalysisResult:
         """Analyze SHAP values for feature explanations."""
+        import shap
+        from sklearn.ensemble import GradientBoostingClassifier
+        from sklearn.metrics import accuracy_score, roc_auc_score
         
         # Train model
         if model_type == "gradient_boosting":
@@ -365,38 +431,55 @@ class AdvancedAnalyticsEngine:
     
     async def _analyze_sensitivity(self, team_a: TeamStatisticsBase,
                                  team_b: Optional[TeamStatisticsBase],
-                                 sensitivity_ranges: Dict[str, List[Decimal]]) -> Dict[str, Any]:
+                                 sensitivity_ranges: Dict[str, List[Decimal]],
+                                 random_seed: Optional[int] = None) -> Dict[str, Any]:
         """Perform sensitivity analysis on key features."""
         # Simplified sensitivity analysis
         results = {}
+        seed = random_seed or SENSITIVITY_SEED
         
         base_team_b = team_b or self._generate_random_opponent()
+        baseline_win_rate = await self._estimate_win_rate(team_a, base_team_b, seed)
         
         # Test each feature if ranges provided
         for feature_name, test_values in sensitivity_ranges.items():
             if hasattr(team_a, feature_name):
-                sensitivity_results = []
+                new_values = np.asarray(test_values, dtype=np.float64)
+                win_rates = np.empty_like(new_values)
                 
-                for test_value in test_values:
+                for i, test_value in enumerate(test_values):
                     # Create modified team
                     modified_team = team_a.model_copy()
                     setattr(modified_team, feature_name, test_value)
-                    
-                    # Run quick simulation
-                    match_result = await self.match_simulator.simulate_match(
-                        modified_team, base_team_b
-                    )
-                    
-                    win_rate = 1.0 if match_result.winner == 'A' else 0.0
-                    sensitivity_results.append({
-                        'test_value': float(test_value),
-                        'win_rate': win_rate
-                    })
+                    win_rates[i] = await self._estimate_win_rate(modified_team, base_team_b, seed)
                 
-                results[feature_name] = sensitivity_results
+                data_points, _, _ = sensitivity_data_points(
+                    float(getattr(team_a, feature_name)), baseline_win_rate, new_values, win_rates
+                )
+                results[feature_name] = [
+                    {
+                        'test_value': point.new_value,
+                        'win_rate': point.new_win_probability,
+                        'absolute_change': point.absolute_change,
+                        'relative_change': point.relative_change
+                    }
+                    for point in data_points
+                ]
         
         return results
     
+    async def _estimate_win_rate(self, team_a: TeamStatisticsBase, team_b: TeamStatisticsBase,
+                                 seed: int) -> float:
+        """Win rate of team A over ``SENSITIVITY_SIMULATIONS`` seeded matches."""
+        results = await get_default_monte_carlo_engine().run_simulation_batch(SimulationBatch(
+            num_simulations=SENSITIVITY_SIMULATIONS,
+            team_a_stats=team_a,
+            team_b_stats=team_b,
+            match_format=MatchFormat.BEST_OF_3,
+            random_seed_base=seed
+        ))
+        return results.team_a_win_probability
+    
     def _build_team_profile(self, team: TeamStatisticsBase, 
                            analysis_results: Dict[str, Any], 
                            team_prefix: str) -> TeamAnalyticsProfile:
@@ -423,7 +506,7 @@ class AdvancedAnalyticsEngine:
         for category in FeatureCategory:
             category_features = [fi for fi in team_features if fi.feature_category == category]
             if category_features:
-                avg_importance = sum(float(fi.importance_score) for fi in category_features) / len(category_features)
+                avg_importance = sum(fi.importance_score for fi in category_features) / len(category_features)
                 category_strengths[category] = Decimal(str(avg_importance))
             else:
                 category_strengths[category] = Decimal('0.0')
@@ -437,9 +520,9 @@ class AdvancedAnalyticsEngine:
             feature_clean_name = fi.statistic_name.replace(f'{team_prefix}_', '').replace('diff_', '')
             top_improvement_areas.append(feature_clean_name)
             
-            if float(fi.importance_score) > 0.1:
+            if fi.importance_score > 0.1:
                 training_priorities[feature_clean_name] = "high"
-            elif float(fi.importance_score) > 0.05:
+            elif fi.importance_score > 0.05:
                 training_priorities[feature_clean_name] = "medium"
             else:
                 training_priorities[feature_clean_name] = "low"
@@ -467,19 +550,6 @@ class AdvancedAnalyticsEngine:
         
         return self.feature_categories.get(clean_name, FeatureCategory.SERVE)
     
-    def _interpret_feature_importance(self, feature_name: str, importance: float, category: FeatureCategory) -> str:
-        """Generate human-readable interpretation of feature importance."""
-        clean_name = feature_name.replace('team_a_', '').replace('team_b_', '').replace('diff_', '')
-        
-        if importance > 0.1:
-            level = "highly important"
-        elif importance > 0.05:
-            level = "moderately important"
-        else:
-            level = "less important"
-        
-        return f"{clean_name.replace('_', ' ').title()} is {level} for match outcomes in the {category.value} category."
-    
     def _calculate_margin_of_error(self, y: np.ndarray, confidence_level: Decimal) -> float:
         """Calculate margin of error for the analysis."""
         # Simplified margin of error calculation
@@ -508,7 +578,7 @@ class AdvancedAnalyticsEngine:
             for fi in results['feature_importance'][:10]:
                 if fi.statistic_name.startswith('diff_'):
                     feature_name = fi.statistic_name.replace('diff_', '')
-                    if float(fi.importance_score) > 0.05:
+                    if fi.importance_score > 0.05:
                         insights["closest_matchups"].append(feature_name)
         
         return insights
@@ -520,8 +590,9 @@ class AdvancedAnalyticsEngine:
         
         # Baseline simulation
         baseline_opponent = request.opponent_team or self._generate_random_opponent()
-        baseline_result = await self.match_simulator.simulate_match(
-            request.base_team, baseline_opponent
+        baseline_result = self.match_simulator.simulate_match(
+            request.base_team, baseline_opponent,
+            include_rally_details=False
         )
         baseline_win_rate = 1.0 if baseline_result.winner == 'A' else 0.0
         
@@ -540,8 +611,9 @@ class AdvancedAnalyticsEngine:
             # Run simulations for this scenario
             wins = 0
             for _ in range(request.num_simulations_per_scenario):
-                result = await self.match_simulator.simulate_match(
-                    modified_team, baseline_opponent
+                result = self.match_simulator.simulate_match(
+                    modified_team, baseline_opponent,
+                    include_rally_details=False
                 )
                 if result.winner == 'A':
                     wins += 1
@@ -4,27 +4,279 @@ Extends the rally simulation to full match scenarios with momentum and pressure
 """
 
 import asyncio
+import functools
+from array import array
+from collections import deque
+from dataclasses import dataclass, field
+import random
 import time
 import uuid
-import math
 from concurrent.futures import ProcessPoolExecutor
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, NamedTuple, Any, Deque, Union
 from decimal import Decimal
 from datetime import datetime
 import logging
 
+import numpy as np
+from scipy.stats import norm
+
 from ..schemas.match import (
     MatchFormat, MatchResult, SetResult, MatchSimulationRequest,
     MatchStatistics, MatchSimulationResponse, MomentumState,
-    PressureSituation, RallyContext, AdvancedRallyResult
+    PressureSituation, RECENT_RALLY_WINDOW
 )
 from ..schemas.team_statistics import TeamStatisticsBase
-from ..engine.rally_simulator import RallySimulator
-from ..engine.rally_states import TeamSide
-from ..engine.monte_carlo import MonteCarloEngine
+from ..engine.rally_simulator import RallySimulator, RallyResult, UniformStream
+from ..engine.rally_states import RALLY_STATE_NAMES, TeamSide
+from ..engine.monte_carlo import get_default_monte_carlo_engine
 
 logger = logging.getLogger(__name__)
 
+# Rally lengths are bounded by RallySimulator.max_state_transitions (100),
+# so one bin per length keeps the histogram exact
+RALLY_HISTOGRAM_BINS = 101
+
+# Number of fully detailed matches returned as samples
+SAMPLE_MATCH_COUNT = 5
+
+# Two-sided 95% normal quantile
+Z_95 = float(norm.ppf(0.975))
+
+# Decimal constants used on per-rally paths, built once
+_DECIMAL_ZERO = Decimal('0.0')
+_DECIMAL_HALF = Decimal('0.5')
+
+
+class RallyOut(NamedTuple):
+    """Flat record of one rally kept for detailed matches."""
+    winner: str
+    rally_length: int
+    total_contacts: int
+    point_outcome: str
+    final_state: Optional[str]
+    events: Optional[List[Dict[str, Any]]]
+
+
+@dataclass
+class _MatchStatsAccumulator:
+    """Running match statistics, updated as each match completes.
+    
+    Memory is O(bins) regardless of how many matches are simulated, and
+    accumulators from separate workers merge by addition.
+    """
+    total_matches: int = 0
+    team_a_wins: int = 0
+    total_sets: int = 0
+    straight_set_wins_a: int = 0
+    straight_set_wins_b: int = 0
+    three_set_matches: int = 0
+    rally_length_histogram: np.ndarray = field(
+        default_factory=lambda: np.zeros(RALLY_HISTOGRAM_BINS, dtype=np.int64)
+    )
+    
+    def add(self, result: MatchResult, rally_lengths: array) -> None:
+        """Fold one finished match into the running totals."""
+        n_sets = len(result.sets)
+        a_won = result.winner == 'A'
+        
+        self.total_matches += 1
+        self.team_a_wins += a_won
+        self.total_sets += n_sets
+        if n_sets == 2:
+            if a_won:
+                self.straight_set_wins_a += 1
+            else:
+                self.straight_set_wins_b += 1
+        elif n_sets == 3:
+            self.three_set_matches += 1
+        
+        if rally_lengths:
+            counts = np.bincount(np.frombuffer(rally_lengths, dtype=np.intc),
+                                 minlength=RALLY_HISTOGRAM_BINS)
+            self._add_histogram(counts)
+    
+    def merge(self, other: '_MatchStatsAccumulator') -> None:
+        """Add another accumulator's totals into this one."""
+        self.total_matches += other.total_matches
+        self.team_a_wins += other.team_a_wins
+        self.total_sets += other.total_sets
+        self.straight_set_wins_a += other.straight_set_wins_a
+        self.straight_set_wins_b += other.straight_set_wins_b
+        self.three_set_matches += other.three_set_matches
+        self._add_histogram(other.rally_length_histogram)
+    
+    def _add_histogram(self, counts: np.ndarray) -> None:
+        if len(counts) > len(self.rally_length_histogram):
+            counts = counts.copy()
+            counts[:len(self.rally_length_histogram)] += self.rally_length_histogram
+            self.rally_length_histogram = counts
+        else:
+            self.rally_length_histogram[:len(counts)] += counts
+
+
+@functools.cache
+def get_default_rally_simulator() -> RallySimulator:
+    """Process-wide rally simulator shared by all match simulators."""
+    return RallySimulator()
+
+
+def _simulate_match_request(request: MatchSimulationRequest
+                            ) -> Tuple[List[MatchResult], _MatchStatsAccumulator]:
+    """Executor job: simulate a whole request on a simulator of its own.
+    
+    Concurrent requests never share a uniform stream or team cache, so a
+    seeded request gives the same result however many others overlap it.
+    """
+    simulator = MatchSimulator()
+    if request.random_seed is not None:
+        simulator.set_random_seed(request.random_seed)
+    return simulator._simulate_match_batch(
+        request.team_a,
+        request.team_b,
+        request.match_format,
+        request.momentum_effects,
+        request.pressure_effects,
+        request.num_simulations,
+        SAMPLE_MATCH_COUNT if request.include_rally_details else 0
+    )
+
+
+def _simulate_match_chunk(team_a: TeamStatisticsBase,
+                          team_b: TeamStatisticsBase,
+                          match_format: MatchFormat,
+                          enable_momentum: bool,
+                          enable_pressure: bool,
+                          num_matches: int,
+                          start_index: int,
+                          population: int,
+                          sample_count: int,
+                          seed: int) -> Tuple[List[MatchResult], _MatchStatsAccumulator]:
+    """Process pool worker: simulate a chunk of matches with its own simulator."""
+    simulator = MatchSimulator()
+    simulator.set_random_seed(seed)
+    return simulator._simulate_match_batch(
+        team_a, team_b, match_format, enable_momentum, enable_pressure,
+        num_matches, sample_count, population, start_index
+    )
+
+
+def wilson_interval(successes: Union[int, np.ndarray], trials: Union[int, np.ndarray],
+                    z: float = Z_95) -> Tuple[np.ndarray, np.ndarray]:
+    """Wilson score interval for a binomial proportion.
+    
+    Stays inside [0, 1] and keeps a sensible width when the observed
+    proportion is at or near 0 or 1, where the normal approximation
+    collapses. Works elementwise on NumPy arrays as well as scalars.
+    """
+    successes = np.asarray(successes, dtype=float)
+    trials = np.asarray(trials, dtype=float)
+    p_hat = successes / trials
+    z2 = z * z
+    denominator = 1.0 + z2 / trials
+    center = (p_hat + z2 / (2.0 * trials)) / denominator
+    half_width = z * np.sqrt(p_hat * (1.0 - p_hat) / trials + z2 / (4.0 * trials * trials)) / denominator
+    return center - half_width, center + half_width
+
+
+def _pressure_terms(set_number: int, team_a_score: int, team_b_score: int,
+                    serving_team: str) -> Tuple[float, bool, bool, int, bool]:
+    """Branchless pressure arithmetic for a score line.
+    
+    Returns (pressure_level, is_set_point, is_match_point, score_diff,
+    serving_team_behind). Bools are combined with & and | and folded into the
+    level by multiplication, so there is no if cascade on the score.
+    """
+    is_set_point = ((team_a_score >= 20) & (team_a_score >= team_b_score + 1)) | \
+                   ((team_b_score >= 20) & (team_b_score >= team_a_score + 1))
+    is_match_point = is_set_point & ((set_number == 1) | (set_number == 3))
+    score_diff = abs(team_a_score - team_b_score)
+    serving_team_behind = ((serving_team == 'A') & (team_a_score < team_b_score)) | \
+                          ((serving_team == 'B') & (team_b_score < team_a_score))
+    
+    # A match point is always a set point, so the difference is the
+    # "set point only" indicator
+    pressure_level = (0.5 * is_match_point + 0.3 * (is_set_point - is_match_point)
+                      + 0.2 * (score_diff <= 2) + 0.1 * ((score_diff > 2) & (score_diff <= 5))
+                      + 0.2 * serving_team_behind)
+    
+    return (min(1.0, pressure_level), is_set_point, is_match_point,
+            score_diff, serving_team_behind)
+
+
+@dataclass(slots=True)
+class _MomentumStateMut:
+    """Mutable, unvalidated counterpart of MomentumState for the set loop."""
+    team_a_momentum: float = 0.0
+    team_b_momentum: float = 0.0
+    consecutive_points_a: int = 0
+    consecutive_points_b: int = 0
+    recent_rally_outcomes: Deque[str] = field(
+        default_factory=lambda: deque(maxlen=RECENT_RALLY_WINDOW)
+    )
+    recent_wins_a: int = 0
+    recent_wins_b: int = 0
+
+
+@dataclass(slots=True)
+class _PressureSituationFast:
+    """Slotted counterpart of PressureSituation used inside the rally loop."""
+    is_set_point: bool
+    is_match_point: bool
+    score_differential: int
+    serving_team_behind: bool
+    pressure_level: float
+
+
+@dataclass(slots=True)
+class _RallyContextFast:
+    """Slotted counterpart of RallyContext used inside the rally loop."""
+    set_number: int
+    team_a_score: int
+    team_b_score: int
+    serving_team: str
+    momentum: Optional[_MomentumStateMut] = None
+    pressure: Optional[_PressureSituationFast] = None
+    rally_number: int = 1
+    include_events: bool = True
+
+
+# Effect-adjusted team copies keyed by serve delta rounded to 3 places
+EffectTable = Dict[float, TeamStatisticsBase]
+
+
+@functools.lru_cache(maxsize=8)
+def reachable_serve_deltas(momentum_boost_factor: float,
+                           pressure_effect_factor: float) -> Tuple[float, ...]:
+    """Every serve delta the set loop can produce, rounded to 3 places.
+    
+    Momentum is a function of the current streak (capped at 5) and the wins
+    in the last RECENT_RALLY_WINDOW rallies. Pressure depends only on the
+    set/match-point flags, the score-gap bucket and whether the server
+    trails. Both are finite, so their sums are too (~160 values).
+    """
+    momentum_values = {
+        MomentumEngine._momentum_value(consecutive, wins, total)
+        for consecutive in range(6)
+        for total in range(RECENT_RALLY_WINDOW + 1)
+        for wins in range(total + 1)
+    }
+    
+    pressure_values = set()
+    for is_match_point, is_set_point in ((True, True), (False, True), (False, False)):
+        for gap_level in (0.2, 0.1, 0.0):
+            for serving_team_behind in (False, True):
+                pressure_level = min(1.0, 0.5 * is_match_point
+                                     + 0.3 * (is_set_point - is_match_point)
+                                     + gap_level + 0.2 * serving_team_behind)
+                penalty = pressure_level * pressure_effect_factor
+                pressure_values.add(-penalty if serving_team_behind else penalty * 0.5)
+    
+    return tuple(sorted({
+        round(momentum * momentum_boost_factor + pressure, 3)
+        for momentum in momentum_values
+        for pressure in pressure_values
+    }))
+
 
 class MomentumEngine:
     """Handles momentum effects during match simulation."""
@@ -33,12 +285,13 @@ class MomentumEngine:
         self.enable_momentum = enable_momentum
         self.momentum_decay_rate = 0.1  # Momentum decays over time
         self.momentum_boost_factor = 0.15  # How much momentum affects probability
+        self._momentum_boost_factor_dec = Decimal(str(self.momentum_boost_factor))
     
     def calculate_momentum_effect(self, momentum_state: MomentumState, 
                                 serving_team: str) -> Decimal:
         """Calculate momentum effect on serve probability."""
         if not self.enable_momentum:
-            return Decimal('0.0')
+            return _DECIMAL_ZERO
         
         if serving_team == 'A':
             momentum = momentum_state.team_a_momentum
@@ -46,7 +299,13 @@ class MomentumEngine:
             momentum = momentum_state.team_b_momentum
         
         # Apply momentum boost factor
-        return momentum * Decimal(str(self.momentum_boost_factor))
+        return momentum * self._momentum_boost_factor_dec
+    
+    def momentum_effect_value(self, momentum: float) -> float:
+        """Float form of calculate_momentum_effect for a team's momentum."""
+        if not self.enable_momentum:
+            return 0.0
+        return momentum * self.momentum_boost_factor
     
     def update_momentum(self, momentum_state: MomentumState, 
                        rally_winner: str, serving_team: str) -> MomentumState:
@@ -54,26 +313,12 @@ class MomentumEngine:
         if not self.enable_momentum:
             return momentum_state
         
-        new_state = MomentumState(
-            team_a_momentum=momentum_state.team_a_momentum,
-            team_b_momentum=momentum_state.team_b_momentum,
-            consecutive_points_a=momentum_state.consecutive_points_a,
-            consecutive_points_b=momentum_state.consecutive_points_b,
-            recent_rally_outcomes=momentum_state.recent_rally_outcomes.copy()
-        )
-        
-        # Update consecutive points
-        if rally_winner == 'A':
-            new_state.consecutive_points_a += 1
-            new_state.consecutive_points_b = 0
-        else:
-            new_state.consecutive_points_b += 1
-            new_state.consecutive_points_a = 0
-        
-        # Update recent outcomes (keep last 5)
-        new_state.recent_rally_outcomes.append(rally_winner)
-        if len(new_state.recent_rally_outcomes) > 5:
-            new_state.recent_rally_outcomes.pop(0)
+        # The outcome ring buffer is copied too; the caller's state is left as is
+        new_state = momentum_state.model_copy(update={
+            'recent_rally_outcomes': deque(momentum_state.recent_rally_outcomes,
+                                           maxlen=RECENT_RALLY_WINDOW)
+        })
+        self._record_rally(new_state, rally_winner)
         
         # Calculate momentum values
         new_state.team_a_momentum = self._calculate_team_momentum('A', new_state)
@@ -81,16 +326,59 @@ class MomentumEngine:
         
         return new_state
     
+    def advance(self, state: _MomentumStateMut, rally_winner: str) -> None:
+        """Update a mutable momentum state in place after a rally."""
+        if not self.enable_momentum:
+            return
+        
+        self._record_rally(state, rally_winner)
+        recent_total = len(state.recent_rally_outcomes)
+        state.team_a_momentum = self._momentum_value(
+            state.consecutive_points_a, state.recent_wins_a, recent_total
+        )
+        state.team_b_momentum = self._momentum_value(
+            state.consecutive_points_b, state.recent_wins_b, recent_total
+        )
+    
+    @staticmethod
+    def _record_rally(state: Union[MomentumState, _MomentumStateMut],
+                      rally_winner: str) -> None:
+        """Update streaks, recent outcomes and win counters for one rally."""
+        # Update consecutive points
+        if rally_winner == 'A':
+            state.consecutive_points_a += 1
+            state.consecutive_points_b = 0
+        else:
+            state.consecutive_points_b += 1
+            state.consecutive_points_a = 0
+        
+        # Update recent outcomes (keep last 5), adjusting the win counters
+        # for the evicted and the appended outcome
+        outcomes = state.recent_rally_outcomes
+        if len(outcomes) == outcomes.maxlen:
+            evicted = outcomes[0]
+            if evicted == 'A':
+                state.recent_wins_a -= 1
+            elif evicted == 'B':
+                state.recent_wins_b -= 1
+        outcomes.append(rally_winner)
+        if rally_winner == 'A':
+            state.recent_wins_a += 1
+        elif rally_winner == 'B':
+            state.recent_wins_b += 1
+    
     def _calculate_team_momentum(self, team: str, state: MomentumState) -> Decimal:
         """Calculate momentum value for a team based on recent performance."""
         consecutive = (state.consecutive_points_a if team == 'A' 
                       else state.consecutive_points_b)
-        
-        # Count wins in recent rallies
-        recent_wins = sum(1 for outcome in state.recent_rally_outcomes 
-                         if outcome == team)
-        recent_total = len(state.recent_rally_outcomes)
-        
+        recent_wins = state.recent_wins_a if team == 'A' else state.recent_wins_b
+        return Decimal(str(self._momentum_value(
+            consecutive, recent_wins, len(state.recent_rally_outcomes)
+        )))
+    
+    @staticmethod
+    def _momentum_value(consecutive: int, recent_wins: int, recent_total: int) -> float:
+        """Momentum in [-1, 1] from the current streak and recent win share."""
         # Calculate base momentum from consecutive points
         consecutive_momentum = min(consecutive * 0.2, 1.0)
         
@@ -102,7 +390,7 @@ class MomentumEngine:
         
         # Combine and apply decay
         total_momentum = (consecutive_momentum + recent_momentum) / 2
-        return Decimal(str(max(-1.0, min(1.0, total_momentum))))
+        return max(-1.0, min(1.0, total_momentum))
 
 
 class PressureEngine:
@@ -111,97 +399,117 @@ class PressureEngine:
     def __init__(self, enable_pressure: bool = True):
         self.enable_pressure = enable_pressure
         self.pressure_effect_factor = 0.1  # How much pressure affects performance
+        self._pressure_effect_factor_dec = Decimal(str(self.pressure_effect_factor))
     
     def analyze_pressure_situation(self, set_number: int, team_a_score: int, 
                                  team_b_score: int, serving_team: str) -> PressureSituation:
         """Analyze the current pressure situation."""
-        # Determine if it's set point or match point
-        is_set_point = (team_a_score >= 20 and team_a_score >= team_b_score + 1) or \
-                      (team_b_score >= 20 and team_b_score >= team_a_score + 1)
-        
-        is_match_point = is_set_point and ((set_number == 1) or 
-                                          (set_number == 3))
-        
-        score_diff = abs(team_a_score - team_b_score)
-        serving_team_behind = ((serving_team == 'A' and team_a_score < team_b_score) or
-                              (serving_team == 'B' and team_b_score < team_a_score))
-        
-        # Calculate pressure level (0.0 to 1.0)
-        pressure_level = 0.0
-        if is_match_point:
-            pressure_level += 0.5
-        elif is_set_point:
-            pressure_level += 0.3
-        
-        # Add pressure based on score closeness
-        if score_diff <= 2:
-            pressure_level += 0.2
-        elif score_diff <= 5:
-            pressure_level += 0.1
-        
-        # Add pressure for being behind while serving
-        if serving_team_behind:
-            pressure_level += 0.2
+        (pressure_level, is_set_point, is_match_point,
+         score_diff, serving_team_behind) = _pressure_terms(
+            set_number, team_a_score, team_b_score, serving_team
+        )
         
         return PressureSituation(
             is_set_point=is_set_point,
             is_match_point=is_match_point,
             score_differential=score_diff,
             serving_team_behind=serving_team_behind,
-            pressure_level=Decimal(str(min(1.0, pressure_level)))
+            pressure_level=Decimal(str(pressure_level))
         )
     
+    def pressure_effect_value(self, pressure_level: float,
+                              serving_team_behind: bool) -> float:
+        """Float form of calculate_pressure_effect."""
+        if not self.enable_pressure:
+            return 0.0
+        pressure_penalty = pressure_level * self.pressure_effect_factor
+        return -pressure_penalty if serving_team_behind else pressure_penalty * 0.5
+    
     def calculate_pressure_effect(self, pressure: PressureSituation, 
                                 serving_team: str) -> Decimal:
         """Calculate pressure effect on performance."""
         if not self.enable_pressure:
-            return Decimal('0.0')
+            return _DECIMAL_ZERO
         
         # Pressure generally hurts the team under pressure
-        pressure_penalty = pressure.pressure_level * Decimal(str(self.pressure_effect_factor))
+        pressure_penalty = pressure.pressure_level * self._pressure_effect_factor_dec
         
         # If serving team is behind, they feel more pressure
         if pressure.serving_team_behind:
             return -pressure_penalty
         else:
             # If serving team is ahead, they feel less pressure
-            return pressure_penalty * Decimal('0.5')
+            return pressure_penalty * _DECIMAL_HALF
 
 
 class MatchSimulator:
     """Simulates complete beach volleyball matches with advanced features."""
     
+    _TEAM_CACHE_LIMIT = 256
+    
     def __init__(self):
-        self.rally_simulator = RallySimulator()
-        self.monte_carlo_engine = MonteCarloEngine()
+        # The rally and Monte Carlo engines are stateless between calls, so
+        # every simulator reuses the process-wide instances. The effect
+        # engines stay enabled; each match says which effects apply.
+        self.rally_simulator = get_default_rally_simulator()
+        self.monte_carlo_engine = get_default_monte_carlo_engine()
         self.momentum_engine = MomentumEngine()
         self.pressure_engine = PressureEngine()
+        # Effect-adjusted team copies keyed by (id(team), stats_version,
+        # serve delta). The source team is kept in the value and checked on
+        # lookup, so a recycled id never matches another team's entry.
+        self._team_cache: Dict[Tuple[int, int, float],
+                               Tuple[TeamStatisticsBase, TeamStatisticsBase]] = {}
+        # Bulk uniform buffer shared by every rally this simulator plays;
+        # leftover draws carry over into the next match
+        self._uniforms = UniformStream()
     
-    async def simulate_match(self, team_a: TeamStatisticsBase, 
-                           team_b: TeamStatisticsBase,
-                           match_format: MatchFormat = MatchFormat.BEST_OF_THREE,
-                           enable_momentum: bool = True,
-                           enable_pressure: bool = True) -> MatchResult:
-        """Simulate a single match between two teams."""
-        
-        self.momentum_engine.enable_momentum = enable_momentum
-        self.pressure_engine.enable_pressure = enable_pressure
+    def set_random_seed(self, seed: int) -> None:
+        """Seed all randomness used by this simulator.
         
+        Every rally draws from this simulator's own uniform stream, so the
+        shared rally simulator is left alone.
+        """
+        self._uniforms = UniformStream(seed)
+    
+    def simulate_match(self, team_a: TeamStatisticsBase, 
+                       team_b: TeamStatisticsBase,
+                       match_format: MatchFormat = MatchFormat.BEST_OF_THREE,
+                       enable_momentum: bool = True,
+                       enable_pressure: bool = True,
+                       include_rally_details: bool = True,
+                       include_events: bool = True) -> MatchResult:
+        """Simulate a single match between two teams."""
+        return self._play_match(
+            team_a, team_b, match_format, enable_momentum, enable_pressure,
+            include_rally_details, include_events
+        )[0]
+    
+    def _play_match(self, team_a: TeamStatisticsBase,
+                    team_b: TeamStatisticsBase,
+                    match_format: MatchFormat,
+                    enable_momentum: bool,
+                    enable_pressure: bool,
+                    include_rally_details: bool,
+                    include_events: bool = True,
+                    effect_tables: Optional[Tuple[EffectTable, EffectTable]] = None
+                    ) -> Tuple[MatchResult, array]:
+        """Simulate a match, also returning the length of every rally played."""
         match_id = str(uuid.uuid4())
         sets: List[SetResult] = []
         sets_won_a = 0
         sets_won_b = 0
         set_number = 1
-        
-        # Initialize momentum state
-        momentum_state = MomentumState()
+        rally_lengths = array('i')
         
         while True:
             # Simulate the set
-            set_result = await self._simulate_set(
-                team_a, team_b, set_number, momentum_state
+            set_result, set_rally_lengths = self._simulate_set(
+                team_a, team_b, set_number, include_rally_details, include_events,
+                effect_tables, enable_momentum, enable_pressure
             )
             sets.append(set_result)
+            rally_lengths.extend(set_rally_lengths)
             
             # Update set wins
             if set_result.winner == 'A':
@@ -235,52 +543,93 @@ class MatchSimulator:
             winner=winner,
             sets=sets,
             match_date=datetime.now()
-        )
+        ), rally_lengths
     
-    async def _simulate_set(self, team_a: TeamStatisticsBase, 
-                          team_b: TeamStatisticsBase, set_number: int,
-                          momentum_state: MomentumState) -> SetResult:
-        """Simulate a single set."""
+    def _simulate_set(self, team_a: TeamStatisticsBase, 
+                      team_b: TeamStatisticsBase, set_number: int,
+                      include_rally_details: bool = True,
+                      include_events: bool = True,
+                      effect_tables: Optional[Tuple[EffectTable, EffectTable]] = None,
+                      enable_momentum: bool = True,
+                      enable_pressure: bool = True
+                      ) -> Tuple[SetResult, array]:
+        """Simulate a single set, returning it with the length of each rally."""
         team_a_score = 0
         team_b_score = 0
         serving_team = 'A'  # Team A serves first
         rally_number = 1
-        rally_results = []
+        rally_results = [] if include_rally_details else None
+        rally_lengths = array('i')
+        momentum_state = _MomentumStateMut()
+        effects_enabled = enable_momentum or enable_pressure
         
         while True:
-            # Create rally context
-            context = RallyContext(
-                set_number=set_number,
-                team_a_score=team_a_score,
-                team_b_score=team_b_score,
-                serving_team=serving_team,
-                momentum=momentum_state,
-                rally_number=rally_number
-            )
-            
-            # Analyze pressure situation
-            pressure_situation = self.pressure_engine.analyze_pressure_situation(
-                set_number, team_a_score, team_b_score, serving_team
-            )
-            context.pressure = pressure_situation
-            
-            # Simulate rally with context effects
-            rally_result = await self._simulate_rally_with_effects(
-                team_a, team_b, context
-            )
+            if include_rally_details and effects_enabled:
+                # Create rally context
+                context = _RallyContextFast(
+                    set_number=set_number,
+                    team_a_score=team_a_score,
+                    team_b_score=team_b_score,
+                    serving_team=serving_team,
+                    momentum=momentum_state if enable_momentum else None,
+                    rally_number=rally_number,
+                    include_events=include_events
+                )
+                
+                # Analyze pressure situation
+                if enable_pressure:
+                    context.pressure = _PressureSituationFast(*_pressure_terms(
+                        set_number, team_a_score, team_b_score, serving_team
+                    ))
+                
+                # Simulate rally with context effects
+                rally_out = self._simulate_rally_with_effects(team_a, team_b, context)
+                rally_results.append(rally_out)
+                
+                rally_length = rally_out.rally_length
+                rally_winner = 'A' if rally_out.winner == TeamSide.TEAM_A.value else 'B'
+            else:
+                # Fast path: only the serve deltas are needed, no context models
+                if effects_enabled:
+                    delta_a, delta_b = self._compute_effects(
+                        set_number, team_a_score, team_b_score, serving_team, momentum_state,
+                        enable_momentum, enable_pressure
+                    )
+                    if effect_tables is not None:
+                        rally_team_a = effect_tables[0].get(round(delta_a, 3))
+                        rally_team_b = effect_tables[1].get(round(delta_b, 3))
+                    else:
+                        rally_team_a = rally_team_b = None
+                    if rally_team_a is None:
+                        rally_team_a = self._apply_effects_to_team(team_a, delta_a)
+                    if rally_team_b is None:
+                        rally_team_b = self._apply_effects_to_team(team_b, delta_b)
+                else:
+                    rally_team_a, rally_team_b = team_a, team_b
+                
+                rally_result = self.rally_simulator.simulate_rally(
+                    serving_team=TeamSide.TEAM_A if serving_team == 'A' else TeamSide.TEAM_B,
+                    team_a_stats=rally_team_a,
+                    team_b_stats=rally_team_b,
+                    uniforms=self._uniforms
+                )
+                if include_rally_details:
+                    rally_results.append(self._to_rally_out(rally_result, include_events))
+                
+                rally_length = rally_result.rally_length
+                rally_winner = 'A' if rally_result.winner == TeamSide.TEAM_A else 'B'
             
-            rally_results.append(rally_result)
+            rally_lengths.append(rally_length)
             
             # Update score
-            if rally_result.basic_result['winner'] == 'A':
+            if rally_winner == 'A':
                 team_a_score += 1
             else:
                 team_b_score += 1
             
             # Update momentum
-            momentum_state = self.momentum_engine.update_momentum(
-                momentum_state, rally_result.basic_result['winner'], serving_team
-            )
+            if enable_momentum:
+                self.momentum_engine.advance(momentum_state, rally_winner)
             
             # Check for set completion (21 points, win by 2)
             if (team_a_score >= 21 and team_a_score >= team_b_score + 2) or \
@@ -289,7 +638,7 @@ class MatchSimulator:
                 break
             
             # Change server if rally lost
-            if rally_result.basic_result['winner'] != serving_team:
+            if rally_winner != serving_team:
                 serving_team = 'B' if serving_team == 'A' else 'A'
             
             rally_number += 1
@@ -299,93 +648,125 @@ class MatchSimulator:
             team_a_score=team_a_score,
             team_b_score=team_b_score,
             winner=set_winner,
-            total_rallies=len(rally_results),
-            rally_results=[r.basic_result for r in rally_results]
-        )
+            total_rallies=len(rally_lengths),
+            rally_results=([r._asdict() for r in rally_results]
+                           if include_rally_details else None)
+        ), rally_lengths
+    
+    def _compute_effects(self, set_number: int, team_a_score: int, team_b_score: int,
+                         serving_team: str, momentum_state: _MomentumStateMut,
+                         enable_momentum: bool = True, enable_pressure: bool = True) -> Tuple[float, float]:
+        """Fused momentum and pressure kernel.
+        
+        Returns the serve deltas for team A and team B (only the serving team
+        is affected). Same arithmetic as the momentum and pressure engines, but
+        in plain floats and without building a PressureSituation.
+        """
+        delta = 0.0
+        
+        if enable_momentum:
+            delta += self.momentum_engine.momentum_effect_value(
+                momentum_state.team_a_momentum if serving_team == 'A'
+                else momentum_state.team_b_momentum
+            )
+        
+        if enable_pressure:
+            pressure_level, _, _, _, serving_team_behind = _pressure_terms(
+                set_number, team_a_score, team_b_score, serving_team
+            )
+            delta += self.pressure_engine.pressure_effect_value(
+                pressure_level, serving_team_behind
+            )
+        
+        return (delta, 0.0) if serving_team == 'A' else (0.0, delta)
     
-    async def _simulate_rally_with_effects(self, team_a: TeamStatisticsBase,
-                                         team_b: TeamStatisticsBase,
-                                         context: RallyContext) -> AdvancedRallyResult:
+    def _simulate_rally_with_effects(self, team_a: TeamStatisticsBase,
+                                     team_b: TeamStatisticsBase,
+                                     context: _RallyContextFast) -> RallyOut:
         """Simulate a rally with momentum and pressure effects."""
         
         # Calculate effects
-        momentum_effect = Decimal('0.0')
-        pressure_effect = Decimal('0.0')
+        serve_delta = 0.0
         
-        if context.momentum:
-            momentum_effect = self.momentum_engine.calculate_momentum_effect(
-                context.momentum, context.serving_team
+        if context.momentum is not None:
+            serve_delta += self.momentum_engine.momentum_effect_value(
+                context.momentum.team_a_momentum if context.serving_team == 'A'
+                else context.momentum.team_b_momentum
             )
         
-        if context.pressure:
-            pressure_effect = self.pressure_engine.calculate_pressure_effect(
-                context.pressure, context.serving_team
+        if context.pressure is not None:
+            serve_delta += self.pressure_engine.pressure_effect_value(
+                context.pressure.pressure_level, context.pressure.serving_team_behind
             )
         
-        # Apply effects to team statistics (simplified)
+        # Apply effects to the serving team's statistics (simplified)
         modified_team_a = self._apply_effects_to_team(
-            team_a, momentum_effect if context.serving_team == 'A' else Decimal('0.0'),
-            pressure_effect if context.serving_team == 'A' else Decimal('0.0')
+            team_a, serve_delta if context.serving_team == 'A' else 0.0
         )
         modified_team_b = self._apply_effects_to_team(
-            team_b, momentum_effect if context.serving_team == 'B' else Decimal('0.0'),
-            pressure_effect if context.serving_team == 'B' else Decimal('0.0')
+            team_b, serve_delta if context.serving_team == 'B' else 0.0
         )
         
         # Simulate the rally
         rally_result = self.rally_simulator.simulate_rally(
             serving_team=TeamSide.TEAM_A if context.serving_team == 'A' else TeamSide.TEAM_B,
             team_a_stats=modified_team_a,
-            team_b_stats=modified_team_b
+            team_b_stats=modified_team_b,
+            uniforms=self._uniforms
         )
         
-        # Convert RallyResult to dictionary format for compatibility
-        basic_result = {
-            'winner': rally_result.winner.value,
-            'rally_length': rally_result.rally_length,
-            'total_contacts': rally_result.team_a_actions + rally_result.team_b_actions,
-            'point_outcome': rally_result.point_outcome.value,
-            'final_state': rally_result.final_state.value if rally_result.final_state else None,
-            'events': [
+        return self._to_rally_out(rally_result, context.include_events)
+    
+    @staticmethod
+    def _to_rally_out(rally_result: RallyResult, include_events: bool) -> RallyOut:
+        """Flatten a RallyResult into the stored RallyOut record."""
+        return RallyOut(
+            winner=rally_result.winner.value,
+            rally_length=rally_result.rally_length,
+            total_contacts=rally_result.team_a_actions + rally_result.team_b_actions,
+            point_outcome=rally_result.point_outcome.value,
+            final_state=RALLY_STATE_NAMES[rally_result.final_state] if rally_result.final_state is not None else None,
+            events=[
                 {
                     'sequence': event.sequence_number,
-                    'state': event.state.value,
+                    'state': RALLY_STATE_NAMES[event.state],
                     'action': event.action_type.value,
                     'team': event.performing_team.value,
                     'probability': float(event.probability)
                 }
                 for event in rally_result.events
-            ]
-        }
-        
-        # Create analytics
-        rally_analytics = {
-            'rally_length': rally_result.rally_length,
-            'total_contacts': rally_result.team_a_actions + rally_result.team_b_actions,
-            'serving_team': context.serving_team,
-            'momentum_applied': float(momentum_effect),
-            'pressure_applied': float(pressure_effect),
-            'team_a_actions': rally_result.team_a_actions,
-            'team_b_actions': rally_result.team_b_actions
-        }
-        
-        return AdvancedRallyResult(
-            basic_result=basic_result,
-            context=context,
-            rally_analytics=rally_analytics,
-            momentum_change=momentum_effect,
-            pressure_effect=pressure_effect
+            ] if include_events else None
         )
     
     def _apply_effects_to_team(self, team: TeamStatisticsBase, 
-                             momentum_effect: Decimal, 
-                             pressure_effect: Decimal) -> TeamStatisticsBase:
-        """Apply momentum and pressure effects to team statistics."""
+                               serve_delta: float) -> TeamStatisticsBase:
+        """Apply the combined momentum and pressure delta to team statistics."""
+        if serve_delta == 0.0:
+            return team
+        
+        # Effects take a small set of discrete values, so the adjusted copy
+        # is built once per level instead of once per rally
+        key = (id(team), team.stats_version, round(serve_delta, 3))
+        cached = self._team_cache.get(key)
+        if cached is not None and cached[0] is team:
+            return cached[1]
+        
+        modified_team = self._adjust_team(team, serve_delta)
+        
+        # Callers that vary teams per match would otherwise grow this forever
+        if len(self._team_cache) >= self._TEAM_CACHE_LIMIT:
+            self._team_cache.clear()
+        self._team_cache[key] = (team, modified_team)
+        
+        return modified_team
+    
+    @staticmethod
+    def _adjust_team(team: TeamStatisticsBase, serve_delta: float) -> TeamStatisticsBase:
+        """Build a copy of the team with the serve delta applied."""
         # This is a simplified implementation
         # In a full implementation, you'd modify specific stats based on the effects
         
-        total_effect = momentum_effect + pressure_effect
-        effect_multiplier = 1.0 + float(total_effect)
+        effect_multiplier = 1.0 + serve_delta
         
         # Apply effect to key performance metrics (simplified)
         modified_team = team.model_copy()
@@ -393,12 +774,26 @@ class MatchSimulator:
         # Modify service stats
         if hasattr(modified_team, 'service_ace_percentage'):
             modified_team.service_ace_percentage = max(
-                Decimal('0.0'),
+                _DECIMAL_ZERO,
                 modified_team.service_ace_percentage * Decimal(str(effect_multiplier))
             )
         
         return modified_team
     
+    def _build_effect_tables(self, team_a: TeamStatisticsBase,
+                             team_b: TeamStatisticsBase,
+                             enable_momentum: bool = True,
+                             enable_pressure: bool = True) -> Tuple[EffectTable, EffectTable]:
+        """Precompute effect-adjusted copies of both teams for every reachable delta."""
+        deltas = reachable_serve_deltas(
+            self.momentum_engine.momentum_boost_factor if enable_momentum else 0.0,
+            self.pressure_engine.pressure_effect_factor if enable_pressure else 0.0
+        )
+        return tuple(
+            {delta: team if delta == 0.0 else self._adjust_team(team, delta) for delta in deltas}
+            for team in (team_a, team_b)
+        )
+    
     async def run_match_simulation(self, request: MatchSimulationRequest) -> MatchSimulationResponse:
         """Run Monte Carlo simulation of matches."""
         start_time = time.time()
@@ -406,15 +801,20 @@ class MatchSimulator:
         
         # Run simulations
         if request.num_simulations >= 1000:
-            results = await self._run_parallel_match_simulation(request)
+            samples, accumulator = await self._run_parallel_match_simulation(request)
         else:
-            results = await self._run_sequential_match_simulation(request)
+            # Keep the CPU-bound loop off the event loop thread, on a
+            # simulator of the request's own
+            loop = asyncio.get_running_loop()
+            samples, accumulator = await loop.run_in_executor(
+                None, _simulate_match_request, request
+            )
         
         # Calculate statistics
-        statistics = self._calculate_match_statistics(results)
+        statistics = self._calculate_match_statistics(accumulator)
         
         # Get sample matches
-        sample_matches = results[:min(5, len(results))] if request.include_rally_details else None
+        sample_matches = samples if request.include_rally_details else None
         
         simulation_time = time.time() - start_time
         
@@ -427,69 +827,130 @@ class MatchSimulator:
             created_at=datetime.now()
         )
     
-    async def _run_sequential_match_simulation(self, request: MatchSimulationRequest) -> List[MatchResult]:
-        """Run match simulations sequentially."""
-        results = []
-        
-        for i in range(request.num_simulations):
-            result = await self.simulate_match(
+    async def _run_parallel_match_simulation(
+        self, request: MatchSimulationRequest
+    ) -> Tuple[List[MatchResult], _MatchStatsAccumulator]:
+        """Run match simulations in parallel across worker processes."""
+        # Large batches run on the shared Monte Carlo engine's process pool
+        engine = get_default_monte_carlo_engine()
+        num_chunks = min(engine.max_workers, request.num_simulations)
+        base_size, remainder = divmod(request.num_simulations, num_chunks)
+        
+        # Every worker gets a distinct seed so chunks never replay the same
+        # random stream (forked workers would otherwise share parent state)
+        seed_base = (request.random_seed if request.random_seed is not None
+                     else random.randrange(2**31))
+        
+        sample_count = SAMPLE_MATCH_COUNT if request.include_rally_details else 0
+        
+        loop = asyncio.get_running_loop()
+        pool = engine.process_pool()
+        futures = [
+            loop.run_in_executor(
+                pool,
+                _simulate_match_chunk,
                 request.team_a,
                 request.team_b,
                 request.match_format,
                 request.momentum_effects,
-                request.pressure_effects
+                request.pressure_effects,
+                base_size + (1 if i < remainder else 0),
+                # Global index of the chunk's first match, so the chunks
+                # together pick the same samples as one sequential run
+                i * base_size + min(i, remainder),
+                request.num_simulations,
+                sample_count,
+                seed_base + i
             )
-            results.append(result)
-        
-        return results
+            for i in range(num_chunks)
+        ]
+        chunks = await asyncio.gather(*futures)
+        
+        samples = [sample for chunk_samples, _ in chunks for sample in chunk_samples]
+        accumulator = _MatchStatsAccumulator()
+        for _, chunk_accumulator in chunks:
+            accumulator.merge(chunk_accumulator)
+        return samples, accumulator
     
-    async def _run_parallel_match_simulation(self, request: MatchSimulationRequest) -> List[MatchResult]:
-        """Run match simulations in parallel."""
-        # For now, use sequential simulation
-        # In production, this would use ProcessPoolExecutor
-        return await self._run_sequential_match_simulation(request)
+    def _simulate_match_batch(self, team_a: TeamStatisticsBase,
+                             team_b: TeamStatisticsBase,
+                             match_format: MatchFormat,
+                             enable_momentum: bool,
+                             enable_pressure: bool,
+                             num_matches: int,
+                             sample_count: int = 0,
+                             population: Optional[int] = None,
+                             start_index: int = 0
+                             ) -> Tuple[List[MatchResult], _MatchStatsAccumulator]:
+        """Simulate a batch of identical matches, streaming their statistics.
+        
+        About ``sample_count`` matches, spread evenly over a run of
+        ``population`` matches, keep full rally details and are returned.
+        Every other match is folded into the accumulator and dropped.
+        ``start_index`` places this batch within a larger run.
+        """
+        population = population or num_matches
+        samples = []
+        accumulator = _MatchStatsAccumulator()
+        
+        # Integer error accumulator: keep a match each time the running
+        # total of sample_count crosses another multiple of population,
+        # i.e. with rate sample_count / population and no float drift
+        sample_credit = (start_index * sample_count) % population
+        
+        # Teams are fixed for the whole batch, so every effect-adjusted copy
+        # is built up front and the rally loop only does dict lookups
+        effect_tables = None
+        if enable_momentum or enable_pressure:
+            effect_tables = self._build_effect_tables(team_a, team_b, enable_momentum, enable_pressure)
+        
+        for _ in range(num_matches):
+            sample_credit += sample_count
+            keep = sample_credit >= population
+            if keep:
+                sample_credit -= population
+            
+            result, rally_lengths = self._play_match(
+                team_a, team_b, match_format, enable_momentum, enable_pressure,
+                include_rally_details=keep, effect_tables=effect_tables
+            )
+            accumulator.add(result, rally_lengths)
+            if keep:
+                samples.append(result)
+        
+        return samples, accumulator
     
-    def _calculate_match_statistics(self, results: List[MatchResult]) -> MatchStatistics:
-        """Calculate comprehensive statistics from match results."""
-        total_matches = len(results)
-        team_a_wins = sum(1 for r in results if r.winner == 'A')
+    def _calculate_match_statistics(self, stats: _MatchStatsAccumulator) -> MatchStatistics:
+        """Calculate comprehensive statistics from the streamed totals."""
+        total_matches = stats.total_matches
+        team_a_wins = stats.team_a_wins
         team_b_wins = total_matches - team_a_wins
         
         # Calculate probabilities and confidence intervals
         team_a_prob = Decimal(str(team_a_wins / total_matches))
         team_b_prob = Decimal(str(team_b_wins / total_matches))
         
-        # Calculate 95% confidence interval using normal approximation
-        z_score = 1.96  # 95% confidence
-        margin_of_error = Decimal(str(
-            z_score * math.sqrt(float(team_a_prob * (1 - team_a_prob)) / total_matches)
-        ))
-        
-        ci_lower = max(Decimal('0.0'), team_a_prob - margin_of_error)
-        ci_upper = min(Decimal('1.0'), team_a_prob + margin_of_error)
+        # 95% Wilson score interval
+        lower, upper = wilson_interval(team_a_wins, total_matches)
+        ci_lower = Decimal(str(max(0.0, float(lower))))
+        ci_upper = Decimal(str(min(1.0, float(upper))))
+        margin_of_error = (ci_upper - ci_lower) / 2
         
         # Set-level statistics
-        total_sets = sum(len(r.sets) for r in results)
+        total_sets = stats.total_sets
         avg_sets_per_match = Decimal(str(total_sets / total_matches))
         
-        straight_set_wins_a = sum(1 for r in results 
-                                 if r.winner == 'A' and len(r.sets) == 2)
-        straight_set_wins_b = sum(1 for r in results 
-                                 if r.winner == 'B' and len(r.sets) == 2)
-        three_set_matches = sum(1 for r in results if len(r.sets) == 3)
-        
-        # Rally-level statistics
-        all_rallies = []
-        for result in results:
-            for set_result in result.sets:
-                all_rallies.extend(set_result.rally_results or [])
-        
-        if all_rallies:
-            avg_rallies_per_set = Decimal(str(len(all_rallies) / total_sets))
-            rally_lengths = [r.get('rally_length', 0) for r in all_rallies]
-            avg_rally_length = Decimal(str(sum(rally_lengths) / len(rally_lengths)))
-            longest_rally = max(rally_lengths) if rally_lengths else 0
-            shortest_rally = min(rally_lengths) if rally_lengths else 0
+        # Rally-level statistics from the length histogram
+        histogram = stats.rally_length_histogram
+        total_rally_count = int(histogram.sum())
+        
+        if total_rally_count:
+            observed = np.flatnonzero(histogram)
+            rally_sum = int(np.dot(histogram, np.arange(len(histogram))))
+            avg_rallies_per_set = Decimal(str(total_rally_count / total_sets))
+            avg_rally_length = Decimal(str(rally_sum / total_rally_count))
+            longest_rally = int(observed[-1])
+            shortest_rally = int(observed[0])
         else:
             avg_rallies_per_set = Decimal('0.0')
             avg_rally_length = Decimal('0.0')
@@ -507,9 +968,9 @@ class MatchSimulator:
             margin_of_error=margin_of_error,
             is_statistically_significant=margin_of_error < Decimal('0.1'),
             avg_sets_per_match=avg_sets_per_match,
-            straight_set_wins_a=straight_set_wins_a,
-            straight_set_wins_b=straight_set_wins_b,
-            three_set_matches=three_set_matches,
+            straight_set_wins_a=stats.straight_set_wins_a,
+            straight_set_wins_b=stats.straight_set_wins_b,
+            three_set_matches=stats.three_set_matches,
             avg_rallies_per_set=avg_rallies_per_set,
             avg_rally_length=avg_rally_length,
             longest_rally_contacts=longest_rally,
@@ -1,22 +1,51 @@
 """Monte Carlo simulation engine for beach volleyball match analysis."""
 
 import asyncio
+import functools
 import logging
+import os
 import time
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import List, Dict, Optional, Tuple, Any
-import statistics
+from typing import List, Dict, Optional, Sequence, Tuple, Union, Any
+import math
 import multiprocessing as mp
 from enum import Enum
 
+from scipy.stats import t as student_t
+
 from ..engine import RallySimulator, RallyResult, TeamSide, RallyContext, RallyState
+import numpy as np
+
+from .rally_kernels import (
+    NUMBA_AVAILABLE, DrawStream, KernelRallySimulator, RallyTables, SetKernel, build_rally_tables,
+    draw_stream, seed_kernels, simulate_set, simulate_matches_batch, specialized_set_kernel, warm_kernels
+)
 from ..schemas.team_statistics import TeamStatisticsBase
 
 
 logger = logging.getLogger(__name__)
 
+# Uniforms pre-drawn per antithetic pair, as (rallies, draws per rally); a
+# best-of-3 match rarely exceeds 150 rallies of 16 transitions, and any draws
+# beyond the grid are independent.
+ANTITHETIC_DRAWS = (192, 16)
+
+# Batches at least this large compile a set kernel specialised to the two
+# teams (about 1.5s, cached per team pair); smaller batches reuse one if cached.
+SPECIALIZE_MIN_SIMULATIONS = 50_000
+
+# Per-match fields aggregated by ``_calculate_statistics``; workers return
+# these rows instead of ``MatchResult`` objects unless detailed results are kept
+MATCH_SUMMARY_DTYPE = np.dtype([
+    ("a_won", np.bool_), ("sets_a", np.int8), ("sets_b", np.int8), ("rallies", np.int64)
+])
+
+
+# Shared by every set that does not keep its rally objects
+EMPTY_RALLIES: Tuple[RallyResult, ...] = ()
+
 
 class MatchFormat(str, Enum):
     """Beach volleyball match formats."""
@@ -33,7 +62,7 @@ class SetType(str, Enum):
     DECIDING = "deciding"  # Third set (to 15, win by 2)
 
 
-@dataclass
+@dataclass(slots=True)
 class SetResult:
     """Result of a single set."""
     
@@ -44,7 +73,7 @@ class SetResult:
     team_b_score: int
     rally_count: int
     duration_minutes: Optional[float] = None
-    rallies: List[RallyResult] = field(default_factory=list)
+    rallies: Sequence[RallyResult] = EMPTY_RALLIES
     
     @property
     def score_difference(self) -> int:
@@ -57,7 +86,7 @@ class SetResult:
         return self.score_difference <= 3
 
 
-@dataclass
+@dataclass(slots=True)
 class MatchResult:
     """Result of a complete match."""
     
@@ -83,7 +112,7 @@ class MatchResult:
         self.total_rallies = sum(s.rally_count for s in self.sets)
 
 
-@dataclass
+@dataclass(slots=True)
 class SimulationBatch:
     """Configuration for a batch of simulations."""
     
@@ -96,6 +125,7 @@ class SimulationBatch:
     parallel_workers: Optional[int] = None
     random_seed_base: Optional[int] = None
     include_detailed_results: bool = False
+    antithetic: bool = False  # pair each match with one replayed on 1 - U
     
     # Context parameters
     momentum_enabled: bool = True
@@ -103,7 +133,7 @@ class SimulationBatch:
     fatigue_enabled: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class SimulationResults:
     """Aggregated results from Monte Carlo simulations."""
     
@@ -112,9 +142,9 @@ class SimulationResults:
     team_b_win_count: int
     
     # Win probabilities with confidence intervals
-    team_a_win_probability: Decimal
-    team_b_win_probability: Decimal
-    confidence_interval_95: Tuple[Decimal, Decimal]
+    team_a_win_probability: float
+    team_b_win_probability: float
+    confidence_interval_95: Tuple[float, float]
     
     # Set statistics
     avg_sets_per_match: float
@@ -129,102 +159,340 @@ class SimulationResults:
     individual_matches: List[MatchResult] = field(default_factory=list)
     
     # Statistical significance
-    margin_of_error: Decimal = Decimal("0.0")
+    margin_of_error: float = 0.0
     is_statistically_significant: bool = False
+    antithetic_paired: bool = False  # interval taken over antithetic pair means
+    
+    def to_json_dict(self, quantize: str = "0.0001") -> Dict[str, Any]:
+        """Summary fields for serialization, with probabilities as quantized ``Decimal``.
+        
+        The engine works in floats; exact decimals are only produced here, at
+        the API boundary. Individual matches are left to the caller.
+        """
+        step = Decimal(quantize)
+        
+        def to_decimal(value: float) -> Decimal:
+            return Decimal(repr(value)).quantize(step)
+        
+        return {
+            "num_simulations": self.num_simulations,
+            "team_a_win_probability": to_decimal(self.team_a_win_probability),
+            "team_b_win_probability": to_decimal(self.team_b_win_probability),
+            "team_a_win_count": self.team_a_win_count,
+            "team_b_win_count": self.team_b_win_count,
+            "confidence_interval_lower": to_decimal(self.confidence_interval_95[0]),
+            "confidence_interval_upper": to_decimal(self.confidence_interval_95[1]),
+            "margin_of_error": to_decimal(self.margin_of_error),
+            "is_statistically_significant": self.is_statistically_significant,
+            "antithetic_paired": self.antithetic_paired,
+            "avg_sets_per_match": self.avg_sets_per_match,
+            "avg_rallies_per_match": self.avg_rallies_per_match,
+            "set_distribution": self.set_distribution,
+            "simulation_time_seconds": self.simulation_time_seconds,
+        }
+
+
+# Whether the per-match simulation runs in kernels that release the GIL.
+# When it does, worker threads are cheaper than processes: no pickling of the
+# batch on the way in and no pickling of match results on the way out.
+GIL_FREE_KERNELS = NUMBA_AVAILABLE
+
+# Worker pool size, if set. Each gunicorn worker has pools of its own, so
+# gunicorn_conf divides the cores between them
+SIMULATION_WORKERS = int(os.getenv("SIMULATION_WORKERS", "0")) or None
+
+# Two-sided 95% normal quantile
+Z_95 = 1.959963984540054
+
+
+def confidence_interval_batch(probabilities: np.ndarray, sample_sizes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """95% normal-approximation intervals for many win probabilities at once.
+    
+    ``probabilities`` and ``sample_sizes`` broadcast against each other;
+    returns ``(lower, upper)`` clipped to [0, 1].
+    """
+    p = np.asarray(probabilities, dtype=np.float64)
+    margin = Z_95 * np.sqrt(p * (1.0 - p) / np.asarray(sample_sizes, dtype=np.float64))
+    return np.clip(p - margin, 0.0, 1.0), np.clip(p + margin, 0.0, 1.0)
+
+
+def margin_of_error_batch(sample_sizes: np.ndarray) -> np.ndarray:
+    """Worst-case (p = 0.5) 95% margin of error for each sample size."""
+    return Z_95 * np.sqrt(0.25 / np.asarray(sample_sizes, dtype=np.float64))
+
+
+def _worker_context() -> mp.context.BaseContext:
+    """Start context of the worker processes.
+    
+    Workers are started from a clean server process, or spawned, instead of
+    forked from this one: its event loop, executor and Numba threads may
+    hold locks at the moment of the fork, which the child could never
+    release. The forkserver imports this module once, up front.
+    """
+    if "forkserver" in mp.get_all_start_methods():
+        context = mp.get_context("forkserver")
+        context.set_forkserver_preload([__name__])
+        return context
+    return mp.get_context("spawn")
+
+
+def _init_worker(tables: Optional[RallyTables]) -> None:
+    """Worker process initializer: load the compiled kernels up front."""
+    if tables is not None and NUMBA_AVAILABLE:
+        warm_kernels(tables)
 
 
 class MonteCarloEngine:
     """High-performance Monte Carlo simulation engine for beach volleyball."""
     
-    def __init__(self, max_workers: Optional[int] = None):
-        """Initialize the Monte Carlo engine."""
-        self.max_workers = max_workers or min(8, mp.cpu_count())
+    def __init__(self, max_workers: Optional[int] = None, use_threads: Optional[bool] = None):
+        """Initialize the Monte Carlo engine.
+        
+        ``use_threads`` selects a thread pool instead of a process pool; it
+        defaults to ``GIL_FREE_KERNELS`` since pure-Python workers hold the GIL.
+        """
+        self.max_workers = max_workers or SIMULATION_WORKERS or min(8, mp.cpu_count())
+        self.use_threads = GIL_FREE_KERNELS if use_threads is None else use_threads
         self.rally_simulator = RallySimulator()
         self.logger = logging.getLogger(__name__)
         
+        # Worker pools, created on first use and reused across batches
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        
         # Performance tracking
         self._simulation_count = 0
         self._total_simulation_time = 0.0
     
+    def _get_pool(self, use_kernels: bool = False, tables: Optional[RallyTables] = None) -> Executor:
+        """Return the persistent worker pool, creating it on first use.
+        
+        Threads are only used for kernel batches; the pure-Python path holds
+        the GIL and needs processes to run in parallel. New worker processes
+        warm the kernels on ``tables``, when given.
+        """
+        if use_kernels and self.use_threads:
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(max_workers=self.max_workers)
+            return self._thread_pool
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=_worker_context(),
+                initializer=_init_worker, initargs=(tables,)
+            )
+        return self._pool
+    
+    def process_pool(self) -> Executor:
+        """Return the persistent process pool, for work that holds the GIL."""
+        return self._get_pool()
+    
+    async def aclose(self) -> None:
+        """Shut down the worker pools."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=False)
+            self._thread_pool = None
+    
     async def run_simulation_batch(self, batch: SimulationBatch) -> SimulationResults:
         """Run a batch of Monte Carlo simulations."""
         
         start_time = time.time()
         self.logger.info(f"Starting Monte Carlo simulation: {batch.num_simulations} matches")
         
-        # Prepare simulation tasks
-        chunk_size = max(1, batch.num_simulations // self.max_workers)
-        tasks = []
+        # Detailed results need per-rally objects; with Numba the compiled
+        # rally kernel still samples them, otherwise the Python simulator does
+        tables = None
+        if not batch.include_detailed_results or NUMBA_AVAILABLE:
+            tables = build_rally_tables(batch.team_a_stats, batch.team_b_stats)
+        
+        # Specialised kernels live in this process, so only thread workers can use them
+        specialize = (
+            tables is not None and not batch.include_detailed_results
+            and NUMBA_AVAILABLE and self.use_threads and (
+                batch.num_simulations >= SPECIALIZE_MIN_SIMULATIONS
+                or specialized_set_kernel(tables, compile_if_missing=False) is not None
+            )
+        )
         
-        for i in range(0, batch.num_simulations, chunk_size):
-            end_idx = min(i + chunk_size, batch.num_simulations)
-            task_count = end_idx - i
-            seed = (batch.random_seed_base + i) if batch.random_seed_base else None
+        # Prepare one balanced chunk per worker
+        paired = self._pairs_antithetic(batch)
+        tasks = []
+        offset = 0
+        for task_count in self._chunk_sizes(batch.num_simulations, paired):
+            seed = (batch.random_seed_base + offset) if batch.random_seed_base else None
             
             tasks.append(self._simulate_matches_chunk(
-                task_count, batch, seed
+                task_count, batch, seed, tables, specialize
             ))
+            offset += task_count
         
         # Execute simulations in parallel
         chunk_results = await asyncio.gather(*tasks)
         
         # Aggregate results
         all_matches = []
-        for chunk in chunk_results:
-            all_matches.extend(chunk)
+        if batch.include_detailed_results:
+            for chunk in chunk_results:
+                all_matches.extend(chunk)
+            summary = self._summarize_matches(all_matches)
+        else:
+            summary = np.concatenate(chunk_results)
         
         # Calculate statistics
-        results = self._calculate_statistics(all_matches, batch, time.time() - start_time)
+        results = self._calculate_statistics(
+            summary, batch, time.time() - start_time, all_matches, paired
+        )
         
         self.logger.info(f"Simulation completed: A={results.team_a_win_probability:.1%}, "
                         f"B={results.team_b_win_probability:.1%}")
         
         return results
     
+    @staticmethod
+    def _pairs_antithetic(batch: SimulationBatch) -> bool:
+        """Whether the batch's matches are simulated in antithetic pairs.
+        
+        Only the set kernels replay a stream of uniforms as ``1 - U``; the
+        detailed and vectorized paths play independent matches, so their
+        ``antithetic`` flag has no effect.
+        """
+        return batch.antithetic and NUMBA_AVAILABLE and not batch.include_detailed_results
+    
+    def _chunk_sizes(self, num_simulations: int, antithetic: bool = False) -> List[int]:
+        """Split a batch into at most ``max_workers`` chunks differing by one unit.
+        
+        Antithetic batches are split in whole pairs so a pair never straddles
+        two chunks; an odd trailing match joins the last chunk.
+        """
+        unit = 2 if antithetic else 1
+        q, r = divmod(num_simulations // unit, self.max_workers)
+        sizes = [unit * (q + (1 if i < r else 0)) for i in range(self.max_workers)]
+        sizes = [size for size in sizes if size > 0] or [0]
+        sizes[-1] += num_simulations % unit
+        return sizes
+    
     async def _simulate_matches_chunk(
         self, 
         count: int, 
         batch: SimulationBatch, 
-        seed_base: Optional[int]
-    ) -> List[MatchResult]:
-        """Simulate a chunk of matches in a separate process."""
-        
-        loop = asyncio.get_event_loop()
-        
-        with ProcessPoolExecutor(max_workers=1) as executor:
-            future = executor.submit(
-                self._run_matches_sync, 
-                count, batch, seed_base
-            )
-            return await loop.run_in_executor(None, future.result)
+        seed_base: Optional[int],
+        tables: Optional[RallyTables] = None,
+        specialize: bool = False
+    ) -> Union[List[MatchResult], np.ndarray]:
+        """Simulate a chunk of matches on the worker pool."""
+        
+        # Building detailed rally objects holds the GIL, so those chunks
+        # need processes even when the kernels sample the rallies
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_pool(use_kernels=tables is not None and not batch.include_detailed_results,
+                           tables=tables),
+            MonteCarloEngine._run_matches_sync,
+            count, batch, seed_base, tables, specialize
+        )
     
     @staticmethod
     def _run_matches_sync(
         count: int, 
         batch: SimulationBatch, 
-        seed_base: Optional[int]
-    ) -> List[MatchResult]:
-        """Synchronous match simulation for use in process pool."""
-        
-        simulator = RallySimulator()
+        seed_base: Optional[int],
+        tables: Optional[RallyTables] = None,
+        specialize: bool = False
+    ) -> Union[List[MatchResult], np.ndarray]:
+        """Synchronous match simulation for use in the worker pool.
+        
+        Returns the ``MatchResult`` objects when the batch keeps detailed
+        results, and otherwise only a ``MATCH_SUMMARY_DTYPE`` row per match,
+        which crosses the process boundary as a single buffer.
+        """
+        
+        detailed = batch.include_detailed_results
+        if tables is not None and not NUMBA_AVAILABLE:
+            return MonteCarloEngine._run_matches_vectorized(count, batch, seed_base, tables)
+        
+        # Detailed rallies are walked by the kernel one at a time; summaries
+        # run whole sets in it
+        set_kernel = None
+        if tables is not None and not detailed:
+            if specialize:
+                set_kernel = specialized_set_kernel(tables)
+            if set_kernel is None:
+                set_kernel = functools.partial(simulate_set, tables)
+        
+        if tables is not None and detailed:
+            simulator = KernelRallySimulator(tables)
+        else:
+            simulator = RallySimulator()
         matches = []
+        summary = None if detailed else np.empty(count, dtype=MATCH_SUMMARY_DTYPE)
+        
+        # Antithetic pairs replay one stream of uniforms as U and 1 - U
+        antithetic = batch.antithetic and set_kernel is not None
+        pair_rng = np.random.default_rng(seed_base) if antithetic else None
+        uniforms = None
+        
+        # Seed once per chunk; every match then continues the same stream
+        # instead of re-initialising generator state per match
+        if seed_base and set_kernel is not None:
+            seed_kernels(seed_base)
+        elif seed_base:
+            simulator.set_random_seed(seed_base)
         
         for i in range(count):
-            if seed_base:
-                simulator.set_random_seed(seed_base + i)
+            draws = None
+            if antithetic:
+                if i % 2 == 0:
+                    uniforms = pair_rng.random(ANTITHETIC_DRAWS)
+                    draws = draw_stream(uniforms)
+                else:
+                    draws = draw_stream(1.0 - uniforms)
             
             match = MonteCarloEngine._simulate_single_match(
-                simulator, batch, f"match_{seed_base or 0}_{i}"
+                simulator, batch, f"match_{seed_base or 0}_{i}", set_kernel, draws
             )
-            matches.append(match)
+            if detailed:
+                matches.append(match)
+            else:
+                summary[i] = (match.winner == TeamSide.TEAM_A, match.team_a_sets_won,
+                              match.team_b_sets_won, match.total_rallies)
+        
+        return matches if detailed else summary
+    
+    @staticmethod
+    def _run_matches_vectorized(
+        count: int,
+        batch: SimulationBatch,
+        seed_base: Optional[int],
+        tables: RallyTables
+    ) -> np.ndarray:
+        """Simulate the whole chunk at once with NumPy when Numba is missing."""
+        
+        sets_to_win = MonteCarloEngine._sets_to_win(batch.match_format)
+        set_scores, set_rallies, sets_played = simulate_matches_batch(
+            tables, count, sets_to_win,
+            momentum_enabled=batch.momentum_enabled,
+            pressure_enabled=batch.pressure_enabled,
+            rng=np.random.default_rng(seed_base)
+        )
         
-        return matches
+        # Unplayed set slots are 0-0 and never count as a set won by team A
+        sets_a = (set_scores[:, :, 0] > set_scores[:, :, 1]).sum(axis=1)
+        summary = np.empty(count, dtype=MATCH_SUMMARY_DTYPE)
+        summary["a_won"] = sets_a >= sets_to_win
+        summary["sets_a"] = sets_a
+        summary["sets_b"] = sets_played - sets_a
+        summary["rallies"] = set_rallies.sum(axis=1)
+        return summary
     
     @staticmethod
     def _simulate_single_match(
         simulator: RallySimulator,
         batch: SimulationBatch,
-        match_id: str
+        match_id: str,
+        set_kernel: Optional[SetKernel] = None,
+        draws: Optional[DrawStream] = None
     ) -> MatchResult:
         """Simulate a single complete match."""
         
@@ -234,30 +502,39 @@ class MonteCarloEngine:
             winner=TeamSide.TEAM_A  # Will be updated
         )
         
+        sets_to_win = MonteCarloEngine._sets_to_win(batch.match_format)
+        sets_won_a = 0
+        sets_won_b = 0
         set_number = 1
         serving_team = TeamSide.TEAM_A
         
-        while not MonteCarloEngine._is_match_complete(match_result, batch.match_format):
-            # Determine set type
+        while True:
+            # Only a best-of-3 tied at one set apiece plays a deciding set
             set_type = SetType.DECIDING if (
-                batch.match_format == MatchFormat.BEST_OF_3 and 
-                len(match_result.sets) == 2 and
-                match_result.team_a_sets_won == 1 and 
-                match_result.team_b_sets_won == 1
+                sets_to_win == 2 and sets_won_a == 1 and sets_won_b == 1
             ) else SetType.REGULAR
             
             # Simulate the set
             set_result = MonteCarloEngine._simulate_single_set(
-                simulator, batch, set_number, set_type, serving_team
+                simulator, batch, set_number, set_type, serving_team, set_kernel, draws
             )
             
             match_result.sets.append(set_result)
-            match_result.update_stats()
+            
+            if set_result.winner == TeamSide.TEAM_A:
+                sets_won_a += 1
+            else:
+                sets_won_b += 1
+            
+            if sets_won_a >= sets_to_win or sets_won_b >= sets_to_win:
+                break
             
             # Alternate serving for next set
             serving_team = TeamSide.TEAM_B if serving_team == TeamSide.TEAM_A else TeamSide.TEAM_A
             set_number += 1
         
+        match_result.update_stats()
+        
         # Determine match winner
         match_result.winner = (
             TeamSide.TEAM_A if match_result.team_a_sets_won > match_result.team_b_sets_won
@@ -272,17 +549,41 @@ class MonteCarloEngine:
         batch: SimulationBatch,
         set_number: int,
         set_type: SetType,
-        serving_team: TeamSide
+        serving_team: TeamSide,
+        set_kernel: Optional[SetKernel] = None,
+        draws: Optional[DrawStream] = None
     ) -> SetResult:
-        """Simulate a single set."""
+        """Simulate a single set.
+        
+        With ``set_kernel`` the whole set runs in the compiled kernel and
+        only the final score and rally count come back.
+        """
         
         # Set winning conditions
         target_score = 15 if set_type == SetType.DECIDING else 21
         min_lead = 2
         
+        if set_kernel is not None:
+            team_a_score, team_b_score, rally_count = set_kernel(
+                target_score, min_lead, serving_team,
+                batch.momentum_enabled, batch.pressure_enabled, draws
+            )
+            return SetResult(
+                set_number=set_number,
+                set_type=set_type,
+                winner=TeamSide.TEAM_A if team_a_score > team_b_score else TeamSide.TEAM_B,
+                team_a_score=team_a_score,
+                team_b_score=team_b_score,
+                rally_count=rally_count
+            )
+        
         team_a_score = 0
         team_b_score = 0
-        rallies = []
+        rally_count = 0
+        rallies = [] if batch.include_detailed_results else EMPTY_RALLIES
+        # Momentum window: +1/-1 per rally won by team A/B, as a ring buffer
+        last3 = [0, 0, 0]
+        pressure = 0.0
         current_server = serving_team
         
         while True:
@@ -298,18 +599,18 @@ class MonteCarloEngine:
             
             # Add pressure and momentum if enabled
             if batch.pressure_enabled:
-                context.pressure_level = MonteCarloEngine._calculate_pressure(
-                    team_a_score, team_b_score, target_score
-                )
+                context.pressure_level = pressure
             
-            if batch.momentum_enabled and rallies:
-                context.momentum = MonteCarloEngine._calculate_momentum(rallies[-3:])
+            if batch.momentum_enabled and rally_count:
+                context.momentum = MonteCarloEngine._calculate_momentum(last3, rally_count)
             
             # Simulate rally
             rally_result = simulator.simulate_rally(
                 current_server, batch.team_a_stats, batch.team_b_stats, context
             )
             
+            last3[rally_count % 3] = 1 if rally_result.winner == TeamSide.TEAM_A else -1
+            rally_count += 1
             if batch.include_detailed_results:
                 rallies.append(rally_result)
             
@@ -319,12 +620,19 @@ class MonteCarloEngine:
             else:
                 team_b_score += 1
             
-            # Check for set completion
-            if MonteCarloEngine._is_set_complete(
-                team_a_score, team_b_score, target_score, min_lead
-            ):
+            # Set completion and the next rally's pressure share the leading score
+            high = team_a_score if team_a_score > team_b_score else team_b_score
+            lead = team_a_score - team_b_score
+            if lead < 0:
+                lead = -lead
+            if high >= target_score and lead >= min_lead:
                 break
             
+            # Pressure rises linearly over the last 20% of the target score,
+            # i.e. (high / target - 0.8) * 5 kept in integers until the divide
+            excess = 5 * high - 4 * target_score
+            pressure = 0.0 if excess < 0 else (1.0 if excess >= target_score else excess / target_score)
+            
             # Determine next server (winner serves in beach volleyball)
             current_server = rally_result.winner
         
@@ -337,106 +645,102 @@ class MonteCarloEngine:
             winner=set_winner,
             team_a_score=team_a_score,
             team_b_score=team_b_score,
-            rally_count=len(rallies),
-            rallies=rallies if batch.include_detailed_results else []
+            rally_count=rally_count,
+            rallies=rallies
         )
     
     @staticmethod
-    def _is_set_complete(
-        team_a_score: int, 
-        team_b_score: int, 
-        target_score: int, 
-        min_lead: int
-    ) -> bool:
-        """Check if a set is complete."""
+    def _sets_to_win(match_format: MatchFormat) -> int:
+        """Number of sets a team needs to win a match in this format."""
         
-        max_score = max(team_a_score, team_b_score)
-        lead = abs(team_a_score - team_b_score)
-        
-        return max_score >= target_score and lead >= min_lead
+        return 1 if match_format == MatchFormat.BEST_OF_1 else 2
     
     @staticmethod
-    def _is_match_complete(match_result: MatchResult, format: MatchFormat) -> bool:
-        """Check if a match is complete."""
+    def _calculate_momentum(last3: Sequence[int], rally_count: int) -> float:
+        """Calculate momentum from the +1/-1 outcomes of the last three rallies.
         
-        if format == MatchFormat.BEST_OF_1:
-            return len(match_result.sets) >= 1
+        Slots not yet filled in the set are 0, so they drop out of the sum.
+        """
         
-        elif format == MatchFormat.BEST_OF_3:
-            return match_result.team_a_sets_won >= 2 or match_result.team_b_sets_won >= 2
+        if not rally_count:
+            return 0.0
         
-        return False
-    
-    @staticmethod
-    def _calculate_pressure(
-        team_a_score: int, 
-        team_b_score: int, 
-        target_score: int
-    ) -> Decimal:
-        """Calculate pressure level based on score situation."""
-        
-        max_score = max(team_a_score, team_b_score)
-        score_ratio = max_score / target_score
-        
-        # Pressure increases as we get closer to the target score
-        if score_ratio >= 0.8:  # Above 80% of target
-            return Decimal(str(min(1.0, (score_ratio - 0.8) * 5)))
-        else:
-            return Decimal("0.0")
+        # Calculate momentum (-1 to 1)
+        return max(-1.0, min(1.0, sum(last3) / min(rally_count, 3)))
     
     @staticmethod
-    def _calculate_momentum(recent_rallies: List[RallyResult]) -> Decimal:
-        """Calculate momentum based on recent rally results."""
-        
-        if not recent_rallies:
-            return Decimal("0.0")
+    def _summarize_matches(matches: List[MatchResult]) -> np.ndarray:
+        """One pass over match objects into ``MATCH_SUMMARY_DTYPE`` rows."""
         
-        # Count wins for each team in recent rallies
-        team_a_wins = sum(1 for r in recent_rallies if r.winner == TeamSide.TEAM_A)
-        team_b_wins = len(recent_rallies) - team_a_wins
-        
-        # Calculate momentum (-1 to 1)
-        momentum = (team_a_wins - team_b_wins) / len(recent_rallies)
-        return Decimal(str(max(-1.0, min(1.0, momentum))))
+        return np.fromiter(
+            ((m.winner == TeamSide.TEAM_A, m.team_a_sets_won, m.team_b_sets_won, m.total_rallies)
+             for m in matches),
+            dtype=MATCH_SUMMARY_DTYPE, count=len(matches)
+        )
     
     def _calculate_statistics(
         self, 
-        matches: List[MatchResult], 
+        summary: np.ndarray, 
         batch: SimulationBatch,
-        simulation_time: float
+        simulation_time: float,
+        matches: Optional[List[MatchResult]] = None,
+        paired: bool = False
     ) -> SimulationResults:
-        """Calculate aggregated statistics from simulation results."""
+        """Calculate aggregated statistics from per-match summary rows.
         
-        if not matches:
+        ``paired`` says consecutive rows are antithetic pairs, which switches
+        the interval to a paired-t one over the pair means.
+        """
+        
+        num_matches = len(summary)
+        if not num_matches:
             raise ValueError("No simulation results to analyze")
         
         # Basic win counts
-        team_a_wins = sum(1 for m in matches if m.winner == TeamSide.TEAM_A)
-        team_b_wins = len(matches) - team_a_wins
+        team_a_wins = int(summary["a_won"].sum())
+        team_b_wins = num_matches - team_a_wins
         
         # Win probabilities
-        team_a_prob = Decimal(str(team_a_wins / len(matches)))
-        team_b_prob = Decimal(str(team_b_wins / len(matches)))
+        team_a_prob = team_a_wins / num_matches
+        team_b_prob = team_b_wins / num_matches
+        
+        # Antithetic pairs are averaged first; the pair means are independent
+        pair_means = None
+        if paired and num_matches >= 4:
+            wins = summary["a_won"].astype(np.float64)
+            num_pairs = len(wins) // 2
+            pair_means = (wins[0:2 * num_pairs:2] + wins[1:2 * num_pairs:2]) / 2
         
         # Confidence interval (95%)
-        confidence_interval = self._calculate_confidence_interval(team_a_prob, len(matches))
+        confidence_interval = self._calculate_confidence_interval(
+            team_a_prob, num_matches, pair_means
+        )
         
-        # Set distribution
-        set_distribution = {}
-        for match in matches:
-            sets_key = f"{match.team_a_sets_won}-{match.team_b_sets_won}"
-            set_distribution[sets_key] = set_distribution.get(sets_key, 0) + 1
+        # Set distribution: a best-of-(2s - 1) match has at most (s + 1)^2
+        # score lines, so count them in a small fixed array instead of sorting
+        sides = MonteCarloEngine._sets_to_win(batch.match_format) + 1
+        counts = np.bincount(
+            summary["sets_a"].astype(np.intp) * sides + summary["sets_b"],
+            minlength=sides * sides
+        )
+        set_distribution = {
+            f"{line // sides}-{line % sides}": int(counts[line])
+            for line in np.flatnonzero(counts)
+        }
         
         # Performance metrics
-        avg_sets = statistics.mean(len(m.sets) for m in matches)
-        avg_rallies = statistics.mean(m.total_rallies for m in matches)
+        avg_sets = float((summary["sets_a"].sum() + summary["sets_b"].sum()) / num_matches)
+        avg_rallies = float(summary["rallies"].sum() / num_matches)
         
         # Statistical significance
-        margin_of_error = self._calculate_margin_of_error(len(matches))
-        is_significant = margin_of_error < Decimal("0.05")  # 5% margin
+        if pair_means is not None:
+            margin_of_error = self._calculate_paired_margin(pair_means)
+        else:
+            margin_of_error = self._calculate_margin_of_error(num_matches)
+        is_significant = margin_of_error < 0.05  # 5% margin
         
         return SimulationResults(
-            num_simulations=len(matches),
+            num_simulations=num_matches,
             team_a_win_count=team_a_wins,
             team_b_win_count=team_b_wins,
             team_a_win_probability=team_a_prob,
@@ -447,42 +751,38 @@ class MonteCarloEngine:
             avg_match_duration=0.0,  # TODO: Calculate from actual timing
             avg_rallies_per_match=avg_rallies,
             simulation_time_seconds=simulation_time,
-            individual_matches=matches if batch.include_detailed_results else [],
+            individual_matches=(matches or []) if batch.include_detailed_results else [],
             margin_of_error=margin_of_error,
-            is_statistically_significant=is_significant
+            is_statistically_significant=is_significant,
+            antithetic_paired=pair_means is not None
         )
     
     def _calculate_confidence_interval(
         self, 
-        probability: Decimal, 
-        sample_size: int
-    ) -> Tuple[Decimal, Decimal]:
+        probability: float, 
+        sample_size: int,
+        pair_means: Optional[np.ndarray] = None
+    ) -> Tuple[float, float]:
         """Calculate 95% confidence interval for win probability."""
         
-        import math
-        
-        p = float(probability)
-        n = sample_size
-        
-        # Standard error
-        se = math.sqrt(p * (1 - p) / n)
+        if pair_means is not None:
+            margin = self._calculate_paired_margin(pair_means)
+            return (max(0.0, probability - margin), min(1.0, probability + margin))
         
-        # 95% confidence interval (z = 1.96)
-        margin = 1.96 * se
-        
-        lower = max(0.0, p - margin)
-        upper = min(1.0, p + margin)
+        lower, upper = confidence_interval_batch(probability, sample_size)
+        return (float(lower), float(upper))
+    
+    def _calculate_paired_margin(self, pair_means: np.ndarray) -> float:
+        """95% half-width from antithetic pair means, on n_pairs - 1 degrees of freedom."""
         
-        return (Decimal(str(lower)), Decimal(str(upper)))
+        num_pairs = len(pair_means)
+        se = float(np.std(pair_means, ddof=1)) / math.sqrt(num_pairs)
+        return float(student_t.ppf(0.975, num_pairs - 1)) * se
     
-    def _calculate_margin_of_error(self, sample_size: int) -> Decimal:
+    def _calculate_margin_of_error(self, sample_size: int) -> float:
         """Calculate margin of error for the given sample size."""
         
-        import math
-        
-        # For 95% confidence level with p=0.5 (worst case)
-        margin = 1.96 * math.sqrt(0.25 / sample_size)
-        return Decimal(str(margin))
+        return float(margin_of_error_batch(sample_size))
     
     def get_performance_stats(self) -> Dict[str, Any]:
         """Get performance statistics for the engine."""
@@ -499,3 +799,9 @@ class MonteCarloEngine:
             "max_workers": self.max_workers,
             "simulations_per_second": 1 / avg_time if avg_time > 0 else 0
         }
+
+
+@functools.cache
+def get_default_monte_carlo_engine() -> MonteCarloEngine:
+    """Process-wide Monte Carlo engine, whose pools every caller shares."""
+    return MonteCarloEngine()
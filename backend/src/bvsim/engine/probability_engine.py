@@ -1,7 +1,9 @@
 """Probability calculation engine for rally state transitions."""
 
-from typing import Dict, List, Optional, Tuple
-from decimal import Decimal, ROUND_HALF_UP
+from bisect import bisect_right
+from itertools import accumulate
+from types import MappingProxyType
+from typing import Callable, Dict, FrozenSet, List, Mapping, Optional, Tuple
 import logging
 from dataclasses import dataclass, field
 import numpy as np
@@ -15,14 +17,164 @@ from ..schemas.team_statistics import TeamStatisticsBase
 
 logger = logging.getLogger(__name__)
 
+# Momentum, pressure and fatigue adjustment factors
+MOMENTUM_FACTOR = 0.15  # Max 15% adjustment
+PRESSURE_FACTOR = 0.10  # Max 10% adjustment
+FATIGUE_FACTOR = 0.20   # Max 20% adjustment
 
-@dataclass
+# Outcomes that positive momentum boosts and pressure or fatigue dampen
+POSITIVE_OUTCOMES = frozenset({
+    RallyState.SERVE_ACE, RallyState.ATTACK_KILL, RallyState.BLOCK_KILL,
+    RallyState.RECEPTION_PERFECT, RallyState.SET_PERFECT, RallyState.DIG_PERFECT
+})
+
+# Next states each state may move to, hashed once at import
+VALID_NEXT_STATES: Dict[RallyState, FrozenSet[RallyState]] = {
+    state: frozenset(get_valid_next_states(state)) for state in RallyState
+}
+
+# Dense index of every rally state, and the positive outcomes as a mask over it,
+# for probability vectors laid out in ``RallyState`` declaration order. The
+# index equals each state's integer code; the mapping is kept for callers
+# that want it spelled out.
+STATE_INDEX: Dict[RallyState, int] = {state: int(state) for state in RallyState}
+POSITIVE_MASK = np.array([state in POSITIVE_OUTCOMES for state in RallyState], dtype=np.bool_)
+
+
+def apply_adjustment(weights: np.ndarray, positive: np.ndarray, adjustment) -> np.ndarray:
+    """Array form of ``ProbabilityEngine._apply_contextual_adjustments``.
+    
+    Scales positive outcomes by ``1 + adjustment`` and the rest by
+    ``1 - adjustment / 2`` in one elementwise operation. ``positive`` is the
+    outcome mask for ``weights`` (e.g. ``POSITIVE_MASK`` for a full state
+    vector) and ``adjustment`` broadcasts against both, so a batch of rallies
+    can be adjusted at once. Returns a new array in the dtype of ``weights``.
+    """
+    return weights * np.where(positive, 1.0 + adjustment, 1.0 - adjustment * 0.5)
+
+
+def _normalized(probabilities: Dict[RallyState, float], total=None) -> Dict[RallyState, float]:
+    """Scale a distribution to sum to one, dividing by ``total`` if given.
+    
+    The sum runs in insertion order.
+    """
+    if total is None:
+        total = sum(probabilities.values())
+    return {state: prob / total for state, prob in probabilities.items()}
+
+
+# Fixed distributions, shared read-only so no call rebuilds them
+# After a controlled block, ball goes to opposing team for transition
+BLOCK_CONTROLLED_PROBABILITIES: Mapping[RallyState, float] = MappingProxyType({
+    RallyState.TRANSITION_SET: 0.8,
+    RallyState.TRANSITION_ATTACK: 0.2
+})
+
+# After block touch, ball deflects back to attacking team for digging
+BLOCK_TOUCH_PROBABILITIES: Mapping[RallyState, float] = MappingProxyType({
+    RallyState.DIG_POOR: 0.6,
+    RallyState.DIG_GOOD: 0.25,
+    RallyState.DIG_ERROR: 0.15
+})
+
+# What the digging team can do next, by dig quality
+AFTER_DIG_PROBABILITIES: Dict[RallyState, Mapping[RallyState, float]] = {
+    RallyState.DIG_PERFECT: MappingProxyType({RallyState.TRANSITION_SET: 1.0}),
+    RallyState.DIG_GOOD: MappingProxyType({
+        RallyState.TRANSITION_SET: 0.75,
+        RallyState.TRANSITION_ATTACK: 0.25
+    }),
+    RallyState.DIG_POOR: MappingProxyType({
+        RallyState.TRANSITION_ATTACK: 0.85,
+        RallyState.ATTACK_ERROR: 0.15
+    })
+}
+
+
+# Base-probability calculations by state, called as
+# ``(engine, team_stats, opponent_stats, current_state)``
+def _serve(engine, team_stats, opponent_stats, current_state):
+    return engine._calculate_serve_probabilities(team_stats)
+
+
+def _reception(engine, team_stats, opponent_stats, current_state):
+    return engine._calculate_reception_probabilities(opponent_stats)
+
+
+def _set(engine, team_stats, opponent_stats, current_state):
+    return engine._calculate_set_probabilities(team_stats, current_state)
+
+
+def _attack(engine, team_stats, opponent_stats, current_state):
+    return engine._calculate_attack_probabilities(team_stats, opponent_stats, current_state)
+
+
+def _dig(engine, team_stats, opponent_stats, current_state):
+    return engine._calculate_dig_probabilities(opponent_stats)
+
+
+def _block_outcome(engine, team_stats, opponent_stats, current_state):
+    return engine._calculate_block_outcome_probabilities(opponent_stats)
+
+
+def _after_dig(engine, team_stats, opponent_stats, current_state):
+    return engine._calculate_transition_probabilities_from_dig(team_stats, current_state)
+
+
+def _transition_attack(engine, team_stats, opponent_stats, current_state):
+    return engine._calculate_transition_attack_probabilities(team_stats, opponent_stats)
+
+
+def _constant(probabilities: Mapping[RallyState, float]) -> Callable:
+    return lambda engine, team_stats, opponent_stats, current_state: probabilities
+
+
+# Calculation for each non-terminal state; one dict lookup replaces walking
+# an if/elif chain on every step
+BASE_DISPATCH: Dict[RallyState, Callable] = {
+    RallyState.SERVE_READY: _serve,
+    RallyState.SERVE_IN_PLAY: _reception,
+    RallyState.RECEPTION_PERFECT: _set,
+    RallyState.RECEPTION_GOOD: _set,
+    RallyState.RECEPTION_POOR: _set,
+    RallyState.SET_PERFECT: _attack,
+    RallyState.SET_GOOD: _attack,
+    RallyState.SET_POOR: _attack,
+    RallyState.ATTACK_IN_PLAY: _dig,
+    RallyState.ATTACK_BLOCKED: _block_outcome,
+    RallyState.BLOCK_CONTROLLED: _constant(BLOCK_CONTROLLED_PROBABILITIES),
+    RallyState.BLOCK_TOUCH: _constant(BLOCK_TOUCH_PROBABILITIES),
+    RallyState.DIG_PERFECT: _after_dig,
+    RallyState.DIG_GOOD: _after_dig,
+    RallyState.DIG_POOR: _after_dig,
+    RallyState.TRANSITION_SET: _transition_attack,
+    RallyState.TRANSITION_ATTACK: _transition_attack
+}
+
+
+@dataclass(slots=True)
 class TransitionProbabilities:
-    """Container for state transition probabilities."""
+    """Container for state transition probabilities.
     
-    transitions: Dict[RallyState, Decimal] = field(default_factory=dict)
-    base_probabilities: Dict[RallyState, Decimal] = field(default_factory=dict)
-    adjusted_probabilities: Dict[RallyState, Decimal] = field(default_factory=dict)
+    ``transitions`` holds only the valid next states. ``to_array`` gives them
+    in the dense ``STATE_INDEX`` layout. The
+    states and cumulative weights that ``sample`` bisects are built once on
+    construction and by ``normalize``; call ``normalize`` after editing
+    ``transitions`` in place.
+    """
+    
+    transitions: Dict[RallyState, float] = field(default_factory=dict)
+    base_probabilities: Mapping[RallyState, float] = field(default_factory=dict)
+    adjusted_probabilities: Mapping[RallyState, float] = field(default_factory=dict)
+    _states: Tuple[RallyState, ...] = field(default=(), init=False, repr=False, compare=False)
+    _cumulative: List[float] = field(default_factory=list, init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        self._index_transitions()
+    
+    def _index_transitions(self) -> None:
+        self._states = tuple(self.transitions)
+        self._cumulative = list(accumulate(self.transitions.values()))
     
     def normalize(self) -> None:
         """Normalize probabilities to sum to 1.0."""
@@ -30,26 +182,45 @@ class TransitionProbabilities:
         if total > 0:
             for state in self.transitions:
                 self.transitions[state] = self.transitions[state] / total
+        self._index_transitions()
+    
+    def to_array(self) -> np.ndarray:
+        """Return the transitions as a float64 vector in ``STATE_INDEX`` order."""
+        probabilities = np.zeros(len(STATE_INDEX), dtype=np.float64)
+        for state, prob in self.transitions.items():
+            probabilities[STATE_INDEX[state]] = prob
+        return probabilities
     
-    def get_probability(self, state: RallyState) -> Decimal:
+    def sample(self, uniform: float) -> RallyState:
+        """Pick a next state by inverse CDF from one uniform in ``[0, 1)``.
+        
+        Bisects the cumulative weights exactly as ``random.choices`` does, so
+        a given draw selects the same state.
+        """
+        states = self._states
+        if len(states) == 1:
+            return states[0]
+        cumulative = self._cumulative
+        return states[bisect_right(cumulative, uniform * cumulative[-1], 0, len(states) - 1)]
+    
+    def get_probability(self, state: RallyState) -> float:
         """Get the probability for a specific state transition."""
-        return self.transitions.get(state, Decimal("0.0"))
+        return self.transitions.get(state, 0.0)
 
 
 class ProbabilityEngine:
     """Engine for calculating state transition probabilities based on team statistics."""
     
+    # Cached base distributions kept before the cache is reset
+    BASE_CACHE_LIMIT = 512
+    
     def __init__(self):
         """Initialize the probability engine."""
         self.logger = logging.getLogger(__name__)
         
-        # Base probability matrices for different skill levels
-        self._base_probabilities = self._initialize_base_probabilities()
-        
-        # Momentum and pressure adjustment factors
-        self.momentum_factor = Decimal("0.15")  # Max 15% adjustment
-        self.pressure_factor = Decimal("0.10")  # Max 10% adjustment
-        self.fatigue_factor = Decimal("0.20")   # Max 20% adjustment
+        # Base distributions depend only on the state and the two teams'
+        # statistics, so they are computed once per (state, team, opponent)
+        self._base_cache: Dict[tuple, tuple] = {}
     
     def calculate_transition_probabilities(
         self,
@@ -60,13 +231,13 @@ class ProbabilityEngine:
     ) -> TransitionProbabilities:
         """Calculate transition probabilities from current state."""
         
-        valid_states = get_valid_next_states(current_state)
+        valid_states = VALID_NEXT_STATES[current_state]
         if not valid_states:
-            self.logger.warning(f"No valid transitions from state: {current_state}")
+            self.logger.warning(f"No valid transitions from state: {current_state.name}")
             return TransitionProbabilities()
         
         # Get base probabilities for this state
-        base_probs = self._get_base_probabilities(current_state, team_stats, opponent_stats)
+        base_probs = self._cached_base_probabilities(current_state, team_stats, opponent_stats)
         
         # Apply contextual adjustments
         adjusted_probs = self._apply_contextual_adjustments(
@@ -88,59 +259,121 @@ class ProbabilityEngine:
         
         return result
     
+    def sample_next_state(
+        self,
+        current_state: RallyState,
+        context: RallyContext,
+        team_stats: TeamStatisticsBase,
+        opponent_stats: TeamStatisticsBase,
+        uniform: float
+    ) -> Tuple[Optional[RallyState], float]:
+        """Draw the next state from one uniform in ``[0, 1)``.
+        
+        Fuses ``calculate_transition_probabilities`` with an inverse-CDF draw:
+        base, adjusted and normalized probabilities are never built as dicts.
+        Picks the same state as ``random.choices`` over the normalized
+        transitions for the same uniform. Returns the state with its
+        normalized probability, or ``(None, 0.0)`` if there is nothing to draw.
+        """
+        if not VALID_NEXT_STATES[current_state]:
+            return None, 0.0
+        outcomes = self._cached_outcomes(current_state, team_stats, opponent_stats)
+        
+        total_adjustment = self._total_adjustment(context)
+        positive_scale = 1.0 + total_adjustment
+        negative_scale = 1.0 - total_adjustment * 0.5
+        
+        total = 0.0
+        for state, prob, positive in outcomes:
+            total += prob * (positive_scale if positive else negative_scale)
+        if total <= 0:
+            return None, 0.0
+        
+        # Unnormalized cumulative walk; a handful of entries per state is
+        # cheaper in plain Python than through np.cumsum/np.searchsorted
+        threshold = uniform * total
+        cumulative = 0.0
+        chosen, weight = None, 0.0
+        for state, prob, positive in outcomes:
+            weight = prob * (positive_scale if positive else negative_scale)
+            cumulative += weight
+            chosen = state
+            if threshold < cumulative:
+                break
+        return chosen, weight / total
+    
+    def _cached_base_probabilities(
+        self,
+        current_state: RallyState,
+        team_stats: TeamStatisticsBase,
+        opponent_stats: TeamStatisticsBase
+    ) -> Mapping[RallyState, float]:
+        """Memoized ``_get_base_probabilities``, returned as a read-only mapping."""
+        return self._cache_entry(current_state, team_stats, opponent_stats)[2]
+    
+    def _cached_outcomes(
+        self,
+        current_state: RallyState,
+        team_stats: TeamStatisticsBase,
+        opponent_stats: TeamStatisticsBase
+    ) -> Tuple[Tuple[RallyState, float, bool], ...]:
+        """Memoized valid ``(next_state, base_probability, is_positive)`` triples.
+        
+        The base distribution filtered to ``VALID_NEXT_STATES``, with each
+        outcome's membership in ``POSITIVE_OUTCOMES`` resolved once.
+        """
+        return self._cache_entry(current_state, team_stats, opponent_stats)[3]
+    
+    def _cache_entry(
+        self,
+        current_state: RallyState,
+        team_stats: TeamStatisticsBase,
+        opponent_stats: TeamStatisticsBase
+    ) -> tuple:
+        """Look up or build the cached base distribution for a state and team pair.
+        
+        Keyed on the identity and ``stats_version`` of both teams; entries
+        hold the stats objects so an id cannot be reused while cached.
+        """
+        key = (current_state, id(team_stats), team_stats.stats_version,
+               id(opponent_stats), opponent_stats.stats_version)
+        entry = self._base_cache.get(key)
+        if entry is not None and entry[0] is team_stats and entry[1] is opponent_stats:
+            return entry
+        
+        base_probs = MappingProxyType(
+            self._get_base_probabilities(current_state, team_stats, opponent_stats)
+        )
+        valid_states = VALID_NEXT_STATES[current_state]
+        outcomes = tuple(
+            (state, prob, state in POSITIVE_OUTCOMES)
+            for state, prob in base_probs.items() if state in valid_states
+        )
+        if len(self._base_cache) >= self.BASE_CACHE_LIMIT:
+            self._base_cache.clear()
+        entry = (team_stats, opponent_stats, base_probs, outcomes)
+        self._base_cache[key] = entry
+        return entry
+    
     def _get_base_probabilities(
         self,
         current_state: RallyState,
         team_stats: TeamStatisticsBase,
         opponent_stats: TeamStatisticsBase
-    ) -> Dict[RallyState, Decimal]:
+    ) -> Mapping[RallyState, float]:
         """Get base probabilities before contextual adjustments."""
-        
-        if current_state == RallyState.SERVE_READY:
-            return self._calculate_serve_probabilities(team_stats)
-        
-        elif current_state == RallyState.SERVE_IN_PLAY:
-            return self._calculate_reception_probabilities(opponent_stats)
-        
-        elif current_state in [RallyState.RECEPTION_PERFECT, RallyState.RECEPTION_GOOD, RallyState.RECEPTION_POOR]:
-            return self._calculate_set_probabilities(team_stats, current_state)
-        
-        elif current_state in [RallyState.SET_PERFECT, RallyState.SET_GOOD, RallyState.SET_POOR]:
-            return self._calculate_attack_probabilities(team_stats, opponent_stats, current_state)
-        
-        elif current_state == RallyState.ATTACK_IN_PLAY:
-            return self._calculate_dig_probabilities(opponent_stats)
-        
-        elif current_state == RallyState.ATTACK_BLOCKED:
-            return self._calculate_block_outcome_probabilities(opponent_stats)
-        
-        elif current_state == RallyState.BLOCK_CONTROLLED:
-            # After a controlled block, ball goes to opposing team for transition
-            return {RallyState.TRANSITION_SET: Decimal("0.8"), 
-                   RallyState.TRANSITION_ATTACK: Decimal("0.2")}
-        
-        elif current_state == RallyState.BLOCK_TOUCH:
-            # After block touch, ball deflects back to attacking team for digging
-            return {RallyState.DIG_POOR: Decimal("0.6"),
-                   RallyState.DIG_GOOD: Decimal("0.25"),
-                   RallyState.DIG_ERROR: Decimal("0.15")}
-        
-        elif current_state in [RallyState.DIG_PERFECT, RallyState.DIG_GOOD, RallyState.DIG_POOR]:
-            return self._calculate_transition_probabilities_from_dig(team_stats, current_state)
-        
-        elif current_state in [RallyState.TRANSITION_SET, RallyState.TRANSITION_ATTACK]:
-            return self._calculate_transition_attack_probabilities(team_stats, opponent_stats)
-        
-        else:
-            self.logger.warning(f"No probability calculation for state: {current_state}")
+        calculate = BASE_DISPATCH.get(current_state)
+        if calculate is None:
+            self.logger.warning(f"No probability calculation for state: {current_state.name}")
             return {}
+        return calculate(self, team_stats, opponent_stats, current_state)
     
-    def _calculate_serve_probabilities(self, team_stats: TeamStatisticsBase) -> Dict[RallyState, Decimal]:
+    def _calculate_serve_probabilities(self, team_stats: TeamStatisticsBase) -> Dict[RallyState, float]:
         """Calculate serve outcome probabilities."""
         # Convert percentages to decimals
-        ace_prob = team_stats.service_ace_percentage / Decimal("100")
-        error_prob = team_stats.service_error_percentage / Decimal("100")
-        in_play_prob = Decimal("1.0") - ace_prob - error_prob
+        ace_prob = float(team_stats.service_ace_percentage) / 100.0
+        error_prob = float(team_stats.service_error_percentage) / 100.0
+        in_play_prob = 1.0 - ace_prob - error_prob
         
         return {
             RallyState.SERVE_ACE: ace_prob,
@@ -148,253 +381,225 @@ class ProbabilityEngine:
             RallyState.SERVE_IN_PLAY: in_play_prob
         }
     
-    def _calculate_reception_probabilities(self, team_stats: TeamStatisticsBase) -> Dict[RallyState, Decimal]:
+    def _calculate_reception_probabilities(self, team_stats: TeamStatisticsBase) -> Dict[RallyState, float]:
         """Calculate reception outcome probabilities."""
         # Use the actual percentage distributions from the schema
-        perfect_prob = team_stats.perfect_pass_percentage / Decimal("100")
-        good_prob = team_stats.good_pass_percentage / Decimal("100")
-        poor_prob = team_stats.poor_pass_percentage / Decimal("100")
-        error_prob = team_stats.reception_error_percentage / Decimal("100")
+        perfect_prob = float(team_stats.perfect_pass_percentage) / 100.0
+        good_prob = float(team_stats.good_pass_percentage) / 100.0
+        poor_prob = float(team_stats.poor_pass_percentage) / 100.0
+        error_prob = float(team_stats.reception_error_percentage) / 100.0
         
         # Normalize to ensure sum = 1.0
         total = perfect_prob + good_prob + poor_prob + error_prob
         if total > 0:
-            return {
-                RallyState.RECEPTION_PERFECT: perfect_prob / total,
-                RallyState.RECEPTION_GOOD: good_prob / total,
-                RallyState.RECEPTION_POOR: poor_prob / total,
-                RallyState.RECEPTION_ERROR: error_prob / total
-            }
+            return _normalized({
+                RallyState.RECEPTION_PERFECT: perfect_prob,
+                RallyState.RECEPTION_GOOD: good_prob,
+                RallyState.RECEPTION_POOR: poor_prob,
+                RallyState.RECEPTION_ERROR: error_prob
+            }, total)
         else:
             # Fallback if all zeros
             return {
-                RallyState.RECEPTION_PERFECT: Decimal("0.4"),
-                RallyState.RECEPTION_GOOD: Decimal("0.4"),
-                RallyState.RECEPTION_POOR: Decimal("0.15"),
-                RallyState.RECEPTION_ERROR: Decimal("0.05")
+                RallyState.RECEPTION_PERFECT: 0.4,
+                RallyState.RECEPTION_GOOD: 0.4,
+                RallyState.RECEPTION_POOR: 0.15,
+                RallyState.RECEPTION_ERROR: 0.05
             }
     
     def _calculate_set_probabilities(
         self, 
         team_stats: TeamStatisticsBase, 
         reception_state: RallyState
-    ) -> Dict[RallyState, Decimal]:
+    ) -> Dict[RallyState, float]:
         """Calculate setting outcome probabilities based on reception quality."""
         # Use assist percentage and ball handling error as base
-        assist_skill = team_stats.assist_percentage / Decimal("100")
-        error_rate = team_stats.ball_handling_error_percentage / Decimal("100")
+        assist_skill = float(team_stats.assist_percentage) / 100.0
+        error_rate = float(team_stats.ball_handling_error_percentage) / 100.0
         
         # Adjust setting quality based on reception quality
         if reception_state == RallyState.RECEPTION_PERFECT:
-            skill_modifier = Decimal("1.0")
+            skill_modifier = 1.0
         elif reception_state == RallyState.RECEPTION_GOOD:
-            skill_modifier = Decimal("0.85")
+            skill_modifier = 0.85
         else:  # RECEPTION_POOR
-            skill_modifier = Decimal("0.60")
+            skill_modifier = 0.60
         
         effective_skill = assist_skill * skill_modifier
         
-        perfect_prob = effective_skill * Decimal("0.40")
-        good_prob = effective_skill * Decimal("0.45") + (Decimal("1.0") - effective_skill) * Decimal("0.30")
-        poor_prob = (Decimal("1.0") - effective_skill) * Decimal("0.60")
+        perfect_prob = effective_skill * 0.40
+        good_prob = effective_skill * 0.45 + (1.0 - effective_skill) * 0.30
+        poor_prob = (1.0 - effective_skill) * 0.60
         error_prob = error_rate * skill_modifier
         
-        total = perfect_prob + good_prob + poor_prob + error_prob
-        
-        return {
-            RallyState.SET_PERFECT: perfect_prob / total,
-            RallyState.SET_GOOD: good_prob / total,
-            RallyState.SET_POOR: poor_prob / total,
-            RallyState.SET_ERROR: error_prob / total
-        }
+        return _normalized({
+            RallyState.SET_PERFECT: perfect_prob,
+            RallyState.SET_GOOD: good_prob,
+            RallyState.SET_POOR: poor_prob,
+            RallyState.SET_ERROR: error_prob
+        })
     
     def _calculate_attack_probabilities(
         self,
         team_stats: TeamStatisticsBase,
         opponent_stats: TeamStatisticsBase,
         set_state: RallyState
-    ) -> Dict[RallyState, Decimal]:
+    ) -> Dict[RallyState, float]:
         """Calculate attack outcome probabilities."""
         # Use hitting efficiency and kill percentage
-        attack_skill = team_stats.hitting_efficiency  # -1 to 1 range
-        kill_rate = team_stats.attack_kill_percentage / Decimal("100")
-        error_rate = team_stats.attack_error_percentage / Decimal("100")
+        attack_skill = float(team_stats.hitting_efficiency)  # -1 to 1 range
+        kill_rate = float(team_stats.attack_kill_percentage) / 100.0
+        error_rate = float(team_stats.attack_error_percentage) / 100.0
         
         # Opponent blocking
-        block_kill_rate = opponent_stats.block_kill_percentage / Decimal("100")
+        block_kill_rate = float(opponent_stats.block_kill_percentage) / 100.0
         
         # Adjust attack effectiveness based on set quality
         if set_state == RallyState.SET_PERFECT:
-            attack_modifier = Decimal("1.0")
+            attack_modifier = 1.0
         elif set_state == RallyState.SET_GOOD:
-            attack_modifier = Decimal("0.85")
+            attack_modifier = 0.85
         else:  # SET_POOR
-            attack_modifier = Decimal("0.65")
+            attack_modifier = 0.65
         
         effective_kill_rate = kill_rate * attack_modifier
         effective_error_rate = error_rate / attack_modifier  # Errors increase with poor sets
         
         # Consider opponent's blocking ability
-        blocked_prob = block_kill_rate * Decimal("0.3")  # Some attacks get blocked
-        kill_prob = effective_kill_rate * (Decimal("1.0") - blocked_prob)
+        blocked_prob = block_kill_rate * 0.3  # Some attacks get blocked
+        kill_prob = effective_kill_rate * (1.0 - blocked_prob)
         error_prob = effective_error_rate
-        in_play_prob = Decimal("1.0") - kill_prob - blocked_prob - error_prob
+        in_play_prob = 1.0 - kill_prob - blocked_prob - error_prob
         
         # Ensure probabilities are non-negative
-        in_play_prob = max(in_play_prob, Decimal("0.1"))
-        total = kill_prob + blocked_prob + in_play_prob + error_prob
-        
-        return {
-            RallyState.ATTACK_KILL: kill_prob / total,
-            RallyState.ATTACK_BLOCKED: blocked_prob / total,
-            RallyState.ATTACK_IN_PLAY: in_play_prob / total,
-            RallyState.ATTACK_ERROR: error_prob / total
-        }
+        in_play_prob = in_play_prob if in_play_prob > 0.1 else 0.1
+        return _normalized({
+            RallyState.ATTACK_KILL: kill_prob,
+            RallyState.ATTACK_BLOCKED: blocked_prob,
+            RallyState.ATTACK_IN_PLAY: in_play_prob,
+            RallyState.ATTACK_ERROR: error_prob
+        })
     
-    def _calculate_dig_probabilities(self, team_stats: TeamStatisticsBase) -> Dict[RallyState, Decimal]:
+    def _calculate_dig_probabilities(self, team_stats: TeamStatisticsBase) -> Dict[RallyState, float]:
         """Calculate dig outcome probabilities."""
-        dig_skill = team_stats.dig_percentage / Decimal("100")  # Convert percentage to decimal
-        
-        perfect_prob = dig_skill * Decimal("0.20")
-        good_prob = dig_skill * Decimal("0.50")
-        poor_prob = dig_skill * Decimal("0.25") + (Decimal("1.0") - dig_skill) * Decimal("0.40")
-        error_prob = (Decimal("1.0") - dig_skill) * Decimal("0.60")
-        
-        total = perfect_prob + good_prob + poor_prob + error_prob
-        
-        return {
-            RallyState.DIG_PERFECT: perfect_prob / total,
-            RallyState.DIG_GOOD: good_prob / total,
-            RallyState.DIG_POOR: poor_prob / total,
-            RallyState.DIG_ERROR: error_prob / total
-        }
+        dig_skill = float(team_stats.dig_percentage) / 100.0  # Convert percentage to decimal
+        
+        perfect_prob = dig_skill * 0.20
+        good_prob = dig_skill * 0.50
+        poor_prob = dig_skill * 0.25 + (1.0 - dig_skill) * 0.40
+        error_prob = (1.0 - dig_skill) * 0.60
+        
+        return _normalized({
+            RallyState.DIG_PERFECT: perfect_prob,
+            RallyState.DIG_GOOD: good_prob,
+            RallyState.DIG_POOR: poor_prob,
+            RallyState.DIG_ERROR: error_prob
+        })
     
-    def _calculate_block_outcome_probabilities(self, team_stats: TeamStatisticsBase) -> Dict[RallyState, Decimal]:
+    def _calculate_block_outcome_probabilities(self, team_stats: TeamStatisticsBase) -> Dict[RallyState, float]:
         """Calculate block outcome probabilities when attack is blocked."""
         # Use the blocking statistics from the schema
-        kill_rate = team_stats.block_kill_percentage / Decimal("100")
-        controlled_rate = team_stats.controlled_block_percentage / Decimal("100")
-        error_rate = team_stats.blocking_error_percentage / Decimal("100")
+        kill_rate = float(team_stats.block_kill_percentage) / 100.0
+        controlled_rate = float(team_stats.controlled_block_percentage) / 100.0
+        error_rate = float(team_stats.blocking_error_percentage) / 100.0
         
         # Touch rate is what's left (blocks that deflect but don't control)
-        touch_rate = Decimal("1.0") - kill_rate - controlled_rate - error_rate
-        touch_rate = max(touch_rate, Decimal("0.0"))  # Ensure non-negative
-        
-        total = kill_rate + controlled_rate + touch_rate + error_rate
-        
-        return {
-            RallyState.BLOCK_KILL: kill_rate / total,
-            RallyState.BLOCK_CONTROLLED: controlled_rate / total,
-            RallyState.BLOCK_TOUCH: touch_rate / total,
-            RallyState.BLOCK_ERROR: error_rate / total
-        }
+        touch_rate = 1.0 - kill_rate - controlled_rate - error_rate
+        touch_rate = touch_rate if touch_rate > 0.0 else 0.0  # Ensure non-negative
+        
+        return _normalized({
+            RallyState.BLOCK_KILL: kill_rate,
+            RallyState.BLOCK_CONTROLLED: controlled_rate,
+            RallyState.BLOCK_TOUCH: touch_rate,
+            RallyState.BLOCK_ERROR: error_rate
+        })
     
     def _calculate_transition_probabilities_from_dig(
         self,
         team_stats: TeamStatisticsBase,
         dig_state: RallyState
-    ) -> Dict[RallyState, Decimal]:
-        """Calculate transition probabilities after a dig."""
+    ) -> Mapping[RallyState, float]:
+        """Calculate transition probabilities after a dig.
         
-        if dig_state == RallyState.DIG_PERFECT:
-            return {RallyState.TRANSITION_SET: Decimal("1.0")}
-        elif dig_state == RallyState.DIG_GOOD:
-            return {
-                RallyState.TRANSITION_SET: Decimal("0.75"),
-                RallyState.TRANSITION_ATTACK: Decimal("0.25")
-            }
-        else:  # DIG_POOR
-            return {
-                RallyState.TRANSITION_ATTACK: Decimal("0.85"),
-                RallyState.ATTACK_ERROR: Decimal("0.15")
-            }
+        Returns a shared read-only mapping; copy it before modifying.
+        """
+        return AFTER_DIG_PROBABILITIES.get(dig_state, AFTER_DIG_PROBABILITIES[RallyState.DIG_POOR])
     
     def _calculate_transition_attack_probabilities(
         self,
         team_stats: TeamStatisticsBase,
         opponent_stats: TeamStatisticsBase
-    ) -> Dict[RallyState, Decimal]:
-        """Calculate attack probabilities from transition situations."""
-        # Transition attacks are generally less effective
-        base_attack_probs = self._calculate_attack_probabilities(
-            team_stats, opponent_stats, RallyState.SET_POOR
-        )
+    ) -> Dict[RallyState, float]:
+        """Calculate attack probabilities from transition situations.
+        
+        Transition attacks follow the ``SET_POOR`` attack formula, with the
+        kill probability then reduced and the error and block rates raised.
+        Both steps run in one pass; the operation order matches the two-step
+        form so results are unchanged.
+        """
+        kill_rate = float(team_stats.attack_kill_percentage) / 100.0
+        error_rate = float(team_stats.attack_error_percentage) / 100.0
+        block_kill_rate = float(opponent_stats.block_kill_percentage) / 100.0
+        
+        # SET_POOR attack outcomes before normalization
+        blocked = block_kill_rate * 0.3
+        kill = kill_rate * 0.65 * (1.0 - blocked)
+        error = error_rate / 0.65
+        in_play = 1.0 - kill - blocked - error
+        in_play = in_play if in_play > 0.1 else 0.1
+        total = kill + blocked + in_play + error
         
         # Reduce kill probability and increase error/block rates
-        kill_prob = base_attack_probs[RallyState.ATTACK_KILL] * Decimal("0.7")
-        error_prob = base_attack_probs[RallyState.ATTACK_ERROR] * Decimal("1.3")
-        blocked_prob = base_attack_probs[RallyState.ATTACK_BLOCKED] * Decimal("1.2")
-        in_play_prob = Decimal("1.0") - kill_prob - error_prob - blocked_prob
+        kill_prob = kill / total * 0.7
+        error_prob = error / total * 1.3
+        blocked_prob = blocked / total * 1.2
+        in_play_prob = 1.0 - kill_prob - error_prob - blocked_prob
         
         return {
             RallyState.ATTACK_KILL: kill_prob,
             RallyState.ATTACK_ERROR: error_prob,
             RallyState.ATTACK_BLOCKED: blocked_prob,
-            RallyState.ATTACK_IN_PLAY: max(in_play_prob, Decimal("0.1"))
+            RallyState.ATTACK_IN_PLAY: in_play_prob if in_play_prob > 0.1 else 0.1
         }
     
     def _apply_contextual_adjustments(
         self,
-        base_probs: Dict[RallyState, Decimal],
+        base_probs: Mapping[RallyState, float],
         context: RallyContext,
         team_stats: TeamStatisticsBase,
         opponent_stats: TeamStatisticsBase
-    ) -> Dict[RallyState, Decimal]:
-        """Apply momentum, pressure, and fatigue adjustments to base probabilities."""
-        
-        adjusted_probs = base_probs.copy()
-        
-        # Apply momentum effects
-        momentum_adjustment = self._calculate_momentum_adjustment(context)
-        
-        # Apply pressure effects  
-        pressure_adjustment = self._calculate_pressure_adjustment(context)
-        
-        # Apply fatigue effects
-        fatigue_adjustment = self._calculate_fatigue_adjustment(context)
-        
-        # Combine all adjustments
-        total_adjustment = momentum_adjustment + pressure_adjustment + fatigue_adjustment
-        
-        # Apply adjustments to positive outcome probabilities
-        positive_states = {RallyState.SERVE_ACE, RallyState.ATTACK_KILL, RallyState.BLOCK_KILL,
-                          RallyState.RECEPTION_PERFECT, RallyState.SET_PERFECT, RallyState.DIG_PERFECT}
-        
-        for state, prob in adjusted_probs.items():
-            if state in positive_states:
-                # Positive outcomes benefit from positive adjustments
-                adjusted_probs[state] = prob * (Decimal("1.0") + total_adjustment)
-            else:
-                # Negative outcomes are inversely affected
-                adjusted_probs[state] = prob * (Decimal("1.0") - total_adjustment * Decimal("0.5"))
-        
-        return adjusted_probs
-    
-    def _calculate_momentum_adjustment(self, context: RallyContext) -> Decimal:
-        """Calculate momentum-based probability adjustment."""
-        return context.momentum * self.momentum_factor
-    
-    def _calculate_pressure_adjustment(self, context: RallyContext) -> Decimal:
-        """Calculate pressure-based probability adjustment."""
-        pressure_penalty = context.pressure_level * self.pressure_factor
-        return -pressure_penalty  # Pressure hurts performance
-    
-    def _calculate_fatigue_adjustment(self, context: RallyContext) -> Decimal:
-        """Calculate fatigue-based probability adjustment."""
-        serving_team = context.get_serving_team()
-        
-        if serving_team == TeamSide.TEAM_A:
-            fatigue_penalty = context.fatigue_team_a * self.fatigue_factor
-        else:
-            fatigue_penalty = context.fatigue_team_b * self.fatigue_factor
-            
-        return -fatigue_penalty  # Fatigue hurts performance
-    
-    def _initialize_base_probabilities(self) -> Dict[str, Dict[RallyState, Decimal]]:
-        """Initialize base probability matrices for different scenarios."""
-        # This could be loaded from configuration or database
+    ) -> Mapping[RallyState, float]:
+        """Apply momentum, pressure, and fatigue adjustments to base probabilities.
+        
+        Returns ``base_probs`` itself when nothing adjusts them, otherwise a
+        new dict; callers must not modify the result in place.
+        """
+        
+        total_adjustment = self._total_adjustment(context)
+        if not total_adjustment:
+            return base_probs
+        positive_scale = 1.0 + total_adjustment
+        negative_scale = 1.0 - total_adjustment * 0.5
+        
+        # Positive outcomes benefit from positive adjustments and negative
+        # outcomes are inversely affected. A handful of entries per call is
+        # cheaper as one dict comprehension than as a NumPy round trip;
+        # batches use ``apply_adjustment`` instead.
         return {
-            "default": {},
-            "high_skill": {},
-            "low_skill": {}
+            state: prob * (positive_scale if state in POSITIVE_OUTCOMES else negative_scale)
+            for state, prob in base_probs.items()
         }
+    
+    def _total_adjustment(self, context: RallyContext) -> float:
+        """Combined momentum, pressure, and fatigue adjustment for a context.
+        
+        Momentum helps; pressure and the serving team's fatigue hurt
+        performance. All three terms are inlined since each is one multiply.
+        """
+        if context.serving_team == TeamSide.TEAM_A:
+            fatigue = context.fatigue_team_a
+        else:
+            fatigue = context.fatigue_team_b
+        return (context.momentum * MOMENTUM_FACTOR
+                - context.pressure_level * PRESSURE_FACTOR
+                - fatigue * FATIGUE_FACTOR)
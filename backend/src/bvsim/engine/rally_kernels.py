@@ -0,0 +1,1074 @@
+"""Compiled rally and set kernels for high-volume Monte Carlo simulation.
+
+The kernels replay the Markov chain of ``RallySimulator`` on flat NumPy
+tables instead of dataclasses and per-event Python objects.  Every table is
+derived from the Python implementation itself (``ProbabilityEngine`` base
+probabilities, ``RallySimulator`` acting-team and momentum rules), so the two
+paths model the same rally; the kernels simply skip the per-event objects.
+
+Numba is a declared dependency but its import stays guarded.  Without it a
+warning is logged once and the compiled kernels still run as plain Python, so the Monte Carlo engine only selects them when ``NUMBA_AVAILABLE``
+is true and otherwise uses ``simulate_matches_batch``, which advances a whole
+batch of matches at once with NumPy array operations.  Independent rallies
+get the same treatment from ``simulate_rallies_batch``, or are spread across
+cores by ``simulate_rallies_parallel`` when Numba is present.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple
+import functools
+import logging
+import threading
+
+import numpy as np
+
+from .rally_states import (
+    RALLY_STATE_NAMES, RallyState, RallyContext, TeamSide, TERMINAL_STATES, get_valid_next_states, is_terminal_state
+)
+from .rally_simulator import MOMENTUM_DELTA, RallySimulator, RallyEvent, RallyResult, PointOutcome, UniformStream
+from .probability_engine import (
+    ProbabilityEngine, MOMENTUM_FACTOR, POSITIVE_MASK, PRESSURE_FACTOR, STATE_INDEX, VALID_NEXT_STATES,
+    apply_adjustment
+)
+from ..schemas.team_statistics import TeamStatisticsBase
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numba
+    from numba import njit, prange, set_num_threads
+    NUMBA_AVAILABLE = True
+    # Parallel kernels run from request handler threads, and once TBB has been
+    # started off the main thread it can hang interpreter exit; prefer OpenMP.
+    numba.config.THREADING_LAYER_PRIORITY = ["omp", "tbb", "workqueue"]
+except ImportError:  # pragma: no cover - depends on the environment
+    NUMBA_AVAILABLE = False
+    logger.warning("numba is not installed; Monte Carlo simulation falls back to the "
+                   "vectorized NumPy and pure Python paths, which are much slower")
+    prange = range
+    set_num_threads = None
+
+    def njit(*args: Any, **kwargs: Any) -> Any:
+        """Fallback decorator that leaves the function as plain Python."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+# Integer codes used inside the kernels
+STATES: Tuple[RallyState, ...] = tuple(RallyState)
+STATE_CODES = {state: code for code, state in enumerate(STATES)}
+TEAMS: Tuple[TeamSide, TeamSide] = (TeamSide.TEAM_A, TeamSide.TEAM_B)
+TEAM_CODES = {team: code for code, team in enumerate(TEAMS)}
+
+MAX_NEXT_STATES = max(len(get_valid_next_states(state)) for state in STATES)
+SERVE_READY = STATE_CODES[RallyState.SERVE_READY]
+
+# Point outcome kinds, indexed by the state the rally ended in
+OUTCOME_NONE = 0        # not a terminal state: serving team keeps the point
+OUTCOME_SERVER_WINS = 1
+OUTCOME_ACTOR_WINS = 2
+OUTCOME_ACTOR_LOSES = 3
+
+
+class RallyTables(NamedTuple):
+    """Flat lookup tables consumed by the rally kernels."""
+
+    next_states: np.ndarray      # [serving, state, k] -> next state code, -1 padded
+    base_weights: np.ndarray     # [serving, state, k] -> unnormalised probability
+    positive: np.ndarray         # [state] -> outcome boosted by momentum
+    terminal: np.ndarray         # [state] -> ends the rally
+    outcome_kind: np.ndarray     # [state] -> OUTCOME_* code
+    actor_static: np.ndarray     # [state, serving] -> acting team
+    actor_dynamic: np.ndarray    # [state, last_state, last_team, serving] -> acting team
+    momentum_delta: np.ndarray   # [state] -> momentum change for the acting team
+    momentum_factor: float
+    pressure_factor: float
+    max_transitions: int
+
+
+@functools.lru_cache(maxsize=1)
+def _static_tables() -> Tuple[np.ndarray, ...]:
+    """Build the tables that do not depend on team statistics."""
+    simulator = RallySimulator()
+    num_states = len(STATES)
+
+    positive = np.zeros(num_states, dtype=np.bool_)
+    terminal = np.zeros(num_states, dtype=np.bool_)
+    outcome_kind = np.zeros(num_states, dtype=np.int8)
+    actor_static = np.zeros((num_states, 2), dtype=np.int8)
+    actor_dynamic = np.zeros((num_states, num_states, 2, 2), dtype=np.int8)
+
+    contexts = [
+        RallyContext(current_state=RallyState.SERVE_READY, serving_team=team,
+                     rally_length=0, team_a_score=0, team_b_score=0, set_number=1)
+        for team in TEAMS
+    ]
+
+    for code, state in enumerate(STATES):
+        positive[code] = POSITIVE_MASK[STATE_INDEX[state]]
+        terminal[code] = is_terminal_state(state)
+        if state == RallyState.SERVE_ACE:
+            outcome_kind[code] = OUTCOME_SERVER_WINS
+        elif state in (RallyState.ATTACK_KILL, RallyState.BLOCK_KILL):
+            outcome_kind[code] = OUTCOME_ACTOR_WINS
+        elif "error" in RALLY_STATE_NAMES[state]:
+            outcome_kind[code] = OUTCOME_ACTOR_LOSES
+
+        for serving, context in enumerate(contexts):
+            actor_static[code, serving] = TEAM_CODES[simulator._get_acting_team(state, context)]
+            for last_code, last_state in enumerate(STATES):
+                for last_team, team in enumerate(TEAMS):
+                    actor_dynamic[code, last_code, last_team, serving] = TEAM_CODES[
+                        simulator._get_acting_team(state, context, last_state, team)
+                    ]
+
+    return positive, terminal, outcome_kind, actor_static, actor_dynamic, MOMENTUM_DELTA.copy()
+
+
+@njit(cache=True)
+def _point_value_after(value: np.ndarray, next_states: np.ndarray, terminal: np.ndarray,
+                       outcome_kind: np.ndarray, actor_static: np.ndarray, actor_dynamic: np.ndarray,
+                       serving: int, state: int, last_team: int, next_state: int) -> float:
+    """Team A's chance of winning the point once ``state`` moves to ``next_state``."""
+    if last_team == 2:
+        actor = actor_static[next_state, serving]
+    else:
+        actor = actor_dynamic[next_state, state, last_team, serving]
+    if not terminal[next_state]:
+        return value[serving, next_state, actor]
+    kind = outcome_kind[next_state]
+    if kind == OUTCOME_ACTOR_WINS:
+        winner = actor
+    elif kind == OUTCOME_ACTOR_LOSES:
+        winner = 1 - actor
+    else:
+        winner = serving
+    return 1.0 if winner == 0 else 0.0
+
+
+@njit(cache=True)
+def _team_a_point_values(next_states: np.ndarray, base_weights: np.ndarray, terminal: np.ndarray,
+                         outcome_kind: np.ndarray, actor_static: np.ndarray,
+                         actor_dynamic: np.ndarray, iterations: int) -> np.ndarray:
+    """Value iteration for team A's point-win chance over the unadjusted chain.
+
+    Returns ``value[serving, state, last_team]``; ``last_team`` 2 means
+    nobody has acted yet.
+    """
+    num_states = next_states.shape[1]
+    value = np.zeros((2, num_states, 3))
+    for _ in range(iterations):
+        updated = value.copy()
+        for serving in range(2):
+            for state in range(num_states):
+                total = 0.0
+                count = 0
+                while count < next_states.shape[2] and next_states[serving, state, count] >= 0:
+                    total += base_weights[serving, state, count]
+                    count += 1
+                if count == 0 or total <= 0.0:
+                    continue
+                for last_team in range(3):
+                    expected = 0.0
+                    for k in range(count):
+                        expected += base_weights[serving, state, k] * _point_value_after(
+                            value, next_states, terminal, outcome_kind, actor_static, actor_dynamic,
+                            serving, state, last_team, next_states[serving, state, k]
+                        )
+                    updated[serving, state, last_team] = expected / total
+        value = updated
+    return value
+
+
+def _order_for_team_a(next_states: np.ndarray, base_weights: np.ndarray, terminal: np.ndarray,
+                      outcome_kind: np.ndarray, actor_static: np.ndarray,
+                      actor_dynamic: np.ndarray, iterations: int = 50) -> None:
+    """Sort each row's candidates from best to worst for team A, in place.
+
+    The order does not change the distribution, but it makes the inverse-CDF
+    draw monotone: low uniforms favour team A and high ones team B, so a
+    stream ``U`` and its antithetic ``1 - U`` pull rallies in opposite ways.
+    Candidates are ranked by team A's chance of winning the point afterwards,
+    found by value iteration over the unadjusted chain.
+    """
+    num_states = next_states.shape[1]
+    value = _team_a_point_values(next_states, base_weights, terminal, outcome_kind,
+                                 actor_static, actor_dynamic, iterations)
+
+    counts = (next_states >= 0).sum(axis=2)
+    for serving in range(2):
+        for state in range(num_states):
+            count = counts[serving, state]
+            if count < 2:
+                continue
+            # The team that typically acted into this state
+            last_team = 2 if state == SERVE_READY else actor_static[state, serving]
+            keys = [-_point_value_after(value, next_states, terminal, outcome_kind, actor_static,
+                                        actor_dynamic, serving, state, last_team,
+                                        next_states[serving, state, k])
+                    for k in range(count)]
+            order = np.argsort(keys, kind="stable")
+            next_states[serving, state, :count] = next_states[serving, state, order]
+            base_weights[serving, state, :count] = base_weights[serving, state, order]
+
+
+# Tables built with the default probability engine, keyed on both teams'
+# statistics vectors, so repeated batches for a pair skip the rebuild.
+RALLY_TABLE_CACHE_LIMIT = 64
+_rally_tables: "OrderedDict[tuple, RallyTables]" = OrderedDict()
+_rally_tables_lock = threading.Lock()
+
+
+def build_rally_tables(team_a_stats: TeamStatisticsBase,
+                       team_b_stats: TeamStatisticsBase,
+                       probability_engine: Optional[ProbabilityEngine] = None,
+                       max_transitions: int = 100) -> RallyTables:
+    """Convert two teams' statistics into kernel tables.
+
+    Build these once per batch; the result is immutable and can be shared
+    between threads or pickled to worker processes. Each team's statistics
+    are read once, through ``to_array``, and tables for the default
+    probability engine are cached per pair of statistics vectors.
+    """
+    if probability_engine is not None:
+        return _build_rally_tables(team_a_stats, team_b_stats, probability_engine, max_transitions)
+
+    key = (team_a_stats.to_array().tobytes(), team_b_stats.to_array().tobytes(), max_transitions)
+    with _rally_tables_lock:
+        tables = _rally_tables.get(key)
+        if tables is not None:
+            _rally_tables.move_to_end(key)
+            return tables
+
+    tables = _build_rally_tables(team_a_stats, team_b_stats, ProbabilityEngine(), max_transitions)
+    with _rally_tables_lock:
+        _rally_tables[key] = tables
+        if len(_rally_tables) > RALLY_TABLE_CACHE_LIMIT:
+            _rally_tables.popitem(last=False)
+    return tables
+
+
+def _build_rally_tables(team_a_stats: TeamStatisticsBase,
+                        team_b_stats: TeamStatisticsBase,
+                        probability_engine: ProbabilityEngine,
+                        max_transitions: int) -> RallyTables:
+    positive, terminal, outcome_kind, actor_static, actor_dynamic, momentum_delta = _static_tables()
+    num_states = len(STATES)
+    stats = (team_a_stats, team_b_stats)
+
+    next_states = np.full((2, num_states, MAX_NEXT_STATES), -1, dtype=np.int8)
+    base_weights = np.zeros((2, num_states, MAX_NEXT_STATES), dtype=np.float64)
+
+    for serving in range(2):
+        for code, state in enumerate(STATES):
+            valid_states = VALID_NEXT_STATES[state]
+            if not valid_states:
+                continue
+            acting = actor_static[code, serving]
+            base_probs = probability_engine._get_base_probabilities(
+                state, stats[acting], stats[1 - acting]
+            )
+            # Same filtering as ProbabilityEngine.calculate_transition_probabilities
+            k = 0
+            for next_state, probability in base_probs.items():
+                if next_state in valid_states:
+                    next_states[serving, code, k] = STATE_CODES[next_state]
+                    base_weights[serving, code, k] = float(probability)
+                    k += 1
+
+    _order_for_team_a(next_states, base_weights, terminal, outcome_kind, actor_static, actor_dynamic)
+
+    return RallyTables(
+        next_states=next_states,
+        base_weights=base_weights,
+        positive=positive,
+        terminal=terminal,
+        outcome_kind=outcome_kind,
+        actor_static=actor_static,
+        actor_dynamic=actor_dynamic,
+        momentum_delta=momentum_delta,
+        momentum_factor=MOMENTUM_FACTOR,
+        pressure_factor=PRESSURE_FACTOR,
+        max_transitions=max_transitions
+    )
+
+
+class DrawStream(NamedTuple):
+    """Pre-generated uniforms for the kernels, one row per rally of a match.
+
+    Rally ``r`` takes its transitions' draws from ``values[r]``, so two
+    matches fed related streams stay aligned rally by rally even when their
+    rallies differ in length. Draws outside the grid come from the kernels'
+    own generator. ``cursor`` is a one-element array holding the current
+    rally row, so the position survives across sets.
+    """
+
+    values: np.ndarray
+    cursor: np.ndarray
+
+
+def draw_stream(values: Optional[np.ndarray] = None) -> DrawStream:
+    """Wrap a ``(rallies, draws_per_rally)`` grid (or nothing, for purely random draws)."""
+    if values is None:
+        values = np.empty((0, 0), dtype=np.float64)
+    return DrawStream(np.ascontiguousarray(values, dtype=np.float64), np.zeros(1, dtype=np.int64))
+
+
+@njit(nogil=True, cache=True)
+def seed_kernels(seed: int) -> None:
+    """Seed the random generator used by the kernels on the calling thread."""
+    np.random.seed(seed)
+
+
+@njit(nogil=True, cache=True)
+def _next_uniform(values: np.ndarray, row: int, column: int) -> float:
+    if row < values.shape[0] and column < values.shape[1]:
+        return values[row, column]
+    return np.random.random()
+
+
+@njit(nogil=True, cache=True, inline="always")
+def _simulate_rally_core(next_states: np.ndarray, base_weights: np.ndarray, positive: np.ndarray,
+                         terminal: np.ndarray, outcome_kind: np.ndarray, actor_static: np.ndarray,
+                         actor_dynamic: np.ndarray, momentum_delta: np.ndarray,
+                         momentum_factor: float, pressure_factor: float, max_transitions: int,
+                         serving: int, momentum: float, pressure: float,
+                         values: np.ndarray, cursor: np.ndarray, trace_states: np.ndarray,
+                         trace_teams: np.ndarray, trace_probs: np.ndarray) -> Tuple[int, int]:
+    """Play one rally; returns ``(winner, rally_length)`` as team and length codes.
+
+    Transition ``i`` is recorded into ``trace_states[i]``, ``trace_teams[i]``
+    and ``trace_probs[i]`` (next state, acting team, normalised probability)
+    while it fits; pass empty arrays to skip the trace.
+    """
+    state = SERVE_READY
+    last_team = -1
+    length = 0
+    weights = np.empty(next_states.shape[2], dtype=np.float64)
+
+    while not terminal[state] and length < max_transitions:
+        adjustment = momentum * momentum_factor - pressure * pressure_factor
+        total = 0.0
+        count = 0
+        for k in range(next_states.shape[2]):
+            next_state = next_states[serving, state, k]
+            if next_state < 0:
+                break
+            if positive[next_state]:
+                weight = base_weights[serving, state, k] * (1.0 + adjustment)
+            else:
+                weight = base_weights[serving, state, k] * (1.0 - adjustment * 0.5)
+            weights[k] = weight
+            total += weight
+            count += 1
+        if count == 0 or total <= 0.0:
+            break
+
+        # Inverse-CDF selection
+        threshold = _next_uniform(values, cursor[0], length) * total
+        chosen_k = count - 1
+        cumulative = 0.0
+        for k in range(count):
+            cumulative += weights[k]
+            if threshold < cumulative:
+                chosen_k = k
+                break
+        chosen = next_states[serving, state, chosen_k]
+
+        if last_team < 0:
+            actor = actor_static[chosen, serving]
+        else:
+            actor = actor_dynamic[chosen, state, last_team, serving]
+
+        # Momentum is tracked from team A's perspective
+        if actor == 0:
+            momentum += momentum_delta[chosen]
+        else:
+            momentum -= momentum_delta[chosen]
+        momentum = min(1.0, max(-1.0, momentum))
+
+        if length < trace_states.shape[0]:
+            trace_states[length] = chosen
+            trace_teams[length] = actor
+            trace_probs[length] = weights[chosen_k] / total
+
+        length += 1
+        if length > 10:
+            pressure = min(1.0, 0.1 * (length - 10))
+
+        last_team = actor
+        state = chosen
+
+    kind = outcome_kind[state]
+    if kind == OUTCOME_ACTOR_WINS and last_team >= 0:
+        return last_team, length
+    if kind == OUTCOME_ACTOR_LOSES and last_team >= 0:
+        return 1 - last_team, length
+    return serving, length
+
+
+@njit(nogil=True, cache=True, inline="always")
+def _simulate_set_core(next_states: np.ndarray, base_weights: np.ndarray, positive: np.ndarray,
+                       terminal: np.ndarray, outcome_kind: np.ndarray, actor_static: np.ndarray,
+                       actor_dynamic: np.ndarray, momentum_delta: np.ndarray,
+                       momentum_factor: float, pressure_factor: float, max_transitions: int,
+                       target: int, min_lead: int, server: int,
+                       momentum_enabled: bool, pressure_enabled: bool,
+                       values: np.ndarray, cursor: np.ndarray) -> Tuple[int, int, int]:
+    """Play one set; returns ``(score_a, score_b, rallies)``."""
+    score_a = 0
+    score_b = 0
+    rallies = 0
+    # Winners of the last three rallies, as a ring buffer
+    recent = np.zeros(3, dtype=np.int64)
+    # Sets only need each rally's winner
+    no_codes = np.empty(0, dtype=np.int64)
+    no_probs = np.empty(0, dtype=np.float64)
+
+    while True:
+        pressure = 0.0
+        if pressure_enabled:
+            score_ratio = max(score_a, score_b) / target
+            if score_ratio >= 0.8:
+                pressure = min(1.0, (score_ratio - 0.8) * 5.0)
+
+        momentum = 0.0
+        if momentum_enabled and rallies > 0:
+            window = min(rallies, 3)
+            wins_a = 0
+            for i in range(window):
+                if recent[i] == 0:
+                    wins_a += 1
+            momentum = (2 * wins_a - window) / window
+
+        winner, _ = _simulate_rally_core(
+            next_states, base_weights, positive, terminal, outcome_kind,
+            actor_static, actor_dynamic, momentum_delta,
+            momentum_factor, pressure_factor, max_transitions,
+            server, momentum, pressure, values, cursor,
+            no_codes, no_codes, no_probs
+        )
+        cursor[0] += 1
+        recent[rallies % 3] = winner
+        rallies += 1
+
+        if winner == 0:
+            score_a += 1
+        else:
+            score_b += 1
+
+        if max(score_a, score_b) >= target and abs(score_a - score_b) >= min_lead:
+            return score_a, score_b, rallies
+
+        # Winner serves next
+        server = winner
+
+
+def simulate_set(tables: RallyTables, target: int, min_lead: int, server: TeamSide,
+                 momentum_enabled: bool = True,
+                 pressure_enabled: bool = True,
+                 draws: Optional[DrawStream] = None) -> Tuple[int, int, int]:
+    """Play one set with the compiled kernel; returns ``(score_a, score_b, rallies)``.
+
+    Pass the same ``draws`` to every set of a match to replay a fixed stream
+    of uniforms, e.g. for antithetic pairs.
+    """
+    draws = draws if draws is not None else draw_stream()
+    return _simulate_set_core(
+        *tables, target, min_lead, TEAM_CODES[server], momentum_enabled, pressure_enabled,
+        draws.values, draws.cursor
+    )
+
+
+@njit(nogil=True, cache=True)
+def _trace_rally_core(next_states: np.ndarray, base_weights: np.ndarray, positive: np.ndarray,
+                      terminal: np.ndarray, outcome_kind: np.ndarray, actor_static: np.ndarray,
+                      actor_dynamic: np.ndarray, momentum_delta: np.ndarray,
+                      momentum_factor: float, pressure_factor: float, max_transitions: int,
+                      serving: int, momentum: float, pressure: float, trace_states: np.ndarray,
+                      trace_teams: np.ndarray, trace_probs: np.ndarray) -> Tuple[int, int]:
+    """Play one rally with the kernels' own draws, recording every transition."""
+    values = np.empty((0, 0), dtype=np.float64)
+    cursor = np.zeros(1, dtype=np.int64)
+    return _simulate_rally_core(
+        next_states, base_weights, positive, terminal, outcome_kind,
+        actor_static, actor_dynamic, momentum_delta,
+        momentum_factor, pressure_factor, max_transitions,
+        serving, momentum, pressure, values, cursor,
+        trace_states, trace_teams, trace_probs
+    )
+
+
+class RallyBatch(NamedTuple):
+    """Outcome of ``simulate_rallies_batch``, one row per rally.
+
+    The trace arrays are ``None`` unless events were requested; otherwise
+    row ``i`` holds rally ``i``'s transitions (next state, acting team,
+    normalised probability) in its first ``lengths[i]`` columns.
+    """
+
+    servers: np.ndarray                 # (N,) serving team codes
+    winners: np.ndarray                 # (N,) winning team codes
+    lengths: np.ndarray                 # (N,) transitions per rally
+    trace_states: Optional[np.ndarray]  # (N, max_transitions) state codes, -1 padded
+    trace_teams: Optional[np.ndarray]   # (N, max_transitions) team codes
+    trace_probs: Optional[np.ndarray]   # (N, max_transitions)
+
+
+def simulate_rallies_batch(tables: RallyTables, num_rallies: int, serving_team: TeamSide,
+                           alternate_serve: bool = True,
+                           momentum: float = 0.0,
+                           pressure: float = 0.0,
+                           record_events: bool = False,
+                           rng: Optional[np.random.Generator] = None) -> RallyBatch:
+    """Play ``num_rallies`` independent rallies side by side on structure-of-arrays state.
+
+    Every tick performs one state transition for all rallies still in play,
+    the way ``simulate_matches_batch`` does for matches, so the Python loop
+    runs once per transition of the longest rally. With ``alternate_serve``
+    odd-numbered rallies are served by the other team, as in
+    ``RallySimulator.simulate_multiple_rallies``. Rules match
+    ``_simulate_rally_core``; weights stay in float64 so recorded
+    probabilities agree with the scalar kernel's.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    (next_states, base_weights, positive, terminal, outcome_kind, actor_static,
+     actor_dynamic, momentum_delta, momentum_factor, pressure_factor, max_transitions) = tables
+
+    n = num_rallies
+    servers = np.full(n, TEAM_CODES[serving_team], dtype=np.int64)
+    if alternate_serve:
+        servers[1::2] = 1 - servers[1::2]
+    winners = servers.copy()
+    lengths = np.zeros(n, dtype=np.int64)
+
+    state = np.full(n, SERVE_READY, dtype=np.int64)
+    last_team = np.full(n, -1, dtype=np.int64)
+    momentum_level = np.full(n, momentum, dtype=np.float64)
+    pressure_level = np.full(n, pressure, dtype=np.float64)
+
+    trace_states = trace_teams = trace_probs = None
+    if record_events:
+        trace_states = np.full((n, max_transitions), -1, dtype=np.int64)
+        trace_teams = np.zeros((n, max_transitions), dtype=np.int64)
+        trace_probs = np.zeros((n, max_transitions), dtype=np.float64)
+
+    alive = np.arange(n)
+    while alive.size:
+        serving = servers[alive]
+        current = state[alive]
+
+        # Weighted choice of the next state for every live rally
+        candidates = next_states[serving, current]
+        valid = candidates >= 0
+        count = valid.sum(axis=1)
+        adjustment = (momentum_level[alive] * momentum_factor - pressure_level[alive] * pressure_factor)[:, None]
+        weights = np.where(
+            valid,
+            apply_adjustment(base_weights[serving, current], positive[np.maximum(candidates, 0)], adjustment),
+            0.0
+        )
+        cumulative = np.cumsum(weights, axis=1)
+        total = cumulative[:, -1]
+
+        # A state without outcomes ends the rally where it stands
+        stuck = (count == 0) | (total <= 0.0)
+        if stuck.any():
+            keep = ~stuck
+            alive, serving, current = alive[keep], serving[keep], current[keep]
+            weights, cumulative, total, count = weights[keep], cumulative[keep], total[keep], count[keep]
+            if not alive.size:
+                break
+
+        m = alive.size
+        rows = np.arange(m)
+        threshold = rng.random(m) * total
+        k = np.minimum((cumulative <= threshold[:, None]).sum(axis=1), count - 1)
+        chosen = next_states[serving, current, k].astype(np.int64)
+
+        previous_team = last_team[alive]
+        actor = np.where(
+            previous_team < 0,
+            actor_static[chosen, serving],
+            actor_dynamic[chosen, current, np.maximum(previous_team, 0), serving]
+        ).astype(np.int64)
+
+        # Momentum is tracked from team A's perspective
+        signed_delta = np.where(actor == 0, momentum_delta[chosen], -momentum_delta[chosen])
+        momentum_level[alive] = np.clip(momentum_level[alive] + signed_delta, -1.0, 1.0)
+
+        if record_events:
+            column = lengths[alive]
+            trace_states[alive, column] = chosen
+            trace_teams[alive, column] = actor
+            trace_probs[alive, column] = weights[rows, k] / total
+
+        rally_length = lengths[alive] + 1
+        lengths[alive] = rally_length
+        pressure_level[alive] = np.where(
+            rally_length > 10, np.minimum(1.0, 0.1 * (rally_length - 10)), pressure_level[alive]
+        )
+        state[alive] = chosen
+        last_team[alive] = actor
+
+        ended = terminal[chosen] | (rally_length >= max_transitions)
+        if ended.any():
+            kind = outcome_kind[chosen[ended]]
+            done_actor = actor[ended]
+            winners[alive[ended]] = np.where(
+                kind == OUTCOME_ACTOR_WINS, done_actor,
+                np.where(kind == OUTCOME_ACTOR_LOSES, 1 - done_actor, serving[ended])
+            )
+            alive = alive[~ended]
+
+    return RallyBatch(servers, winners, lengths, trace_states, trace_teams, trace_probs)
+
+
+# Rallies per seeded block of the parallel kernel
+RALLY_BLOCK_SIZE = 1024
+
+
+@njit(parallel=True, cache=True)
+def _simulate_rallies_core(next_states: np.ndarray, base_weights: np.ndarray, positive: np.ndarray,
+                           terminal: np.ndarray, outcome_kind: np.ndarray, actor_static: np.ndarray,
+                           actor_dynamic: np.ndarray, momentum_delta: np.ndarray,
+                           momentum_factor: float, pressure_factor: float, max_transitions: int,
+                           servers: np.ndarray, momentum: float, pressure: float, seed: int,
+                           winners: np.ndarray, lengths: np.ndarray, trace_states: np.ndarray,
+                           trace_teams: np.ndarray, trace_probs: np.ndarray) -> None:
+    """Play one rally per entry of ``servers``, spread over the Numba threads.
+
+    Threads take blocks of ``RALLY_BLOCK_SIZE`` rallies. With ``seed >= 0``
+    block ``b`` reseeds its thread's generator with ``seed + b``, so results
+    do not depend on how blocks land on threads (reseeding per rally would
+    cost more than the rally). Trace arrays have one row per rally; give
+    them zero columns to skip the trace.
+    """
+    n = servers.shape[0]
+    values = np.empty((0, 0), dtype=np.float64)
+    for block in prange((n + RALLY_BLOCK_SIZE - 1) // RALLY_BLOCK_SIZE):
+        if seed >= 0:
+            np.random.seed(seed + block)
+        cursor = np.zeros(1, dtype=np.int64)
+        for i in range(block * RALLY_BLOCK_SIZE, min(n, (block + 1) * RALLY_BLOCK_SIZE)):
+            winner, length = _simulate_rally_core(
+                next_states, base_weights, positive, terminal, outcome_kind,
+                actor_static, actor_dynamic, momentum_delta,
+                momentum_factor, pressure_factor, max_transitions,
+                servers[i], momentum, pressure, values, cursor,
+                trace_states[i], trace_teams[i], trace_probs[i]
+            )
+            winners[i] = winner
+            lengths[i] = length
+
+
+def simulate_rallies_parallel(tables: RallyTables, num_rallies: int, serving_team: TeamSide,
+                              alternate_serve: bool = True,
+                              momentum: float = 0.0,
+                              pressure: float = 0.0,
+                              record_events: bool = False,
+                              seed: Optional[int] = None,
+                              num_threads: Optional[int] = None) -> RallyBatch:
+    """Same contract as ``simulate_rallies_batch``, one compiled rally per loop iteration.
+
+    Rallies are independent, so the loop runs under ``prange`` across the
+    Numba thread pool; ``num_threads`` caps the pool for this call. Pass a
+    ``seed`` for reproducible results. Without Numba the loop runs serially
+    as plain Python, so prefer ``simulate_rallies_batch`` there.
+    """
+    n = num_rallies
+    servers = np.full(n, TEAM_CODES[serving_team], dtype=np.int64)
+    if alternate_serve:
+        servers[1::2] = 1 - servers[1::2]
+    winners = np.empty(n, dtype=np.int64)
+    lengths = np.empty(n, dtype=np.int64)
+
+    columns = tables.max_transitions if record_events else 0
+    trace_states = np.full((n, columns), -1, dtype=np.int64)
+    trace_teams = np.zeros((n, columns), dtype=np.int64)
+    trace_probs = np.zeros((n, columns), dtype=np.float64)
+
+    if num_threads is not None and set_num_threads is not None:
+        set_num_threads(num_threads)
+    _simulate_rallies_core(
+        *tables, servers, float(momentum), float(pressure), -1 if seed is None else seed,
+        winners, lengths, trace_states, trace_teams, trace_probs
+    )
+
+    if not record_events:
+        trace_states = trace_teams = trace_probs = None
+    return RallyBatch(servers, winners, lengths, trace_states, trace_teams, trace_probs)
+
+
+class KernelRallySimulator(RallySimulator):
+    """``RallySimulator`` whose Markov walk runs in the compiled rally kernel.
+
+    The kernel samples the whole rally on integer codes and records each
+    transition; the ``RallyEvent`` objects, contexts and point outcome are
+    then rebuilt with the parent class's own rules, so results carry the
+    same detail as the pure-Python simulator. Single rallies draw from the
+    kernels' generator (see ``seed_kernels``); ``simulate_multiple_rallies``
+    takes its draws, or the parallel kernel's seed, from the simulator's own
+    NumPy generator. Both are seeded by ``set_random_seed``. Like the tables, the walk models momentum and
+    pressure but not fatigue.
+    """
+
+    def __init__(self, tables: RallyTables):
+        super().__init__()
+        self.tables = tables
+        # Reused trace buffers; a rally never exceeds the tables' transition cap
+        self._trace_states = np.empty(tables.max_transitions, dtype=np.int64)
+        self._trace_teams = np.empty(tables.max_transitions, dtype=np.int64)
+        self._trace_probs = np.empty(tables.max_transitions, dtype=np.float64)
+
+    def set_random_seed(self, seed: int) -> None:
+        """Seed the kernels' generators as well as the parent's."""
+        super().set_random_seed(seed)
+        seed_kernels(seed)
+
+    def simulate_rally(
+        self,
+        serving_team: TeamSide,
+        team_a_stats: TeamStatisticsBase,
+        team_b_stats: TeamStatisticsBase,
+        initial_context: Optional[RallyContext] = None,
+        uniforms: Optional[UniformStream] = None
+    ) -> RallyResult:
+        """Simulate a rally in the kernel, then build its events in Python.
+
+        ``team_a_stats`` and ``team_b_stats`` must be the teams the tables
+        were built from; ``uniforms`` is ignored.
+        """
+        context = initial_context.copy() if initial_context is not None else RallyContext(
+            current_state=RallyState.SERVE_READY,
+            serving_team=serving_team,
+            rally_length=0,
+            team_a_score=0,
+            team_b_score=0,
+            set_number=1
+        )
+
+        _, length = _trace_rally_core(
+            *self.tables, TEAM_CODES[serving_team], float(context.momentum), float(context.pressure_level),
+            self._trace_states, self._trace_teams, self._trace_probs
+        )
+        return self._result_from_trace(
+            serving_team, team_a_stats, team_b_stats, context,
+            self._trace_states[:length].tolist(),
+            self._trace_teams[:length].tolist(),
+            self._trace_probs[:length].tolist()
+        )
+
+    def simulate_multiple_rallies(
+        self,
+        num_rallies: int,
+        serving_team: TeamSide,
+        team_a_stats: TeamStatisticsBase,
+        team_b_stats: TeamStatisticsBase,
+        base_context: Optional[RallyContext] = None
+    ) -> List[RallyResult]:
+        """Walk all rallies in one batch, across cores when compiled, then build their events."""
+        momentum = float(base_context.momentum) if base_context is not None else 0.0
+        pressure = float(base_context.pressure_level) if base_context is not None else 0.0
+        if NUMBA_AVAILABLE:
+            batch = simulate_rallies_parallel(
+                self.tables, num_rallies, serving_team, momentum=momentum, pressure=pressure,
+                record_events=True, seed=int(self._rng.integers(2 ** 31))
+            )
+        else:
+            batch = simulate_rallies_batch(
+                self.tables, num_rallies, serving_team, momentum=momentum, pressure=pressure,
+                record_events=True, rng=self._rng
+            )
+
+        results = []
+        for i, (server, length) in enumerate(zip(batch.servers.tolist(), batch.lengths.tolist())):
+            current_serving_team = TEAMS[server]
+            context = base_context.copy() if base_context is not None else RallyContext(
+                current_state=RallyState.SERVE_READY,
+                serving_team=current_serving_team,
+                rally_length=0,
+                team_a_score=0,
+                team_b_score=0,
+                set_number=1
+            )
+            results.append(self._result_from_trace(
+                current_serving_team, team_a_stats, team_b_stats, context,
+                batch.trace_states[i, :length].tolist(),
+                batch.trace_teams[i, :length].tolist(),
+                batch.trace_probs[i, :length].tolist()
+            ))
+        return results
+
+    def _result_from_trace(self, serving_team: TeamSide,
+                           team_a_stats: TeamStatisticsBase,
+                           team_b_stats: TeamStatisticsBase,
+                           context: RallyContext,
+                           states: List[int], teams: List[int], probabilities: List[float]) -> RallyResult:
+        """Rebuild a rally's events and outcome from its recorded transitions."""
+        length = len(states)
+        result = RallyResult(
+            winner=serving_team,
+            point_outcome=PointOutcome.ERROR,
+            rally_length=length,
+            events=[],
+            final_context=context
+        )
+
+        current_state = RallyState.SERVE_READY
+        last_team = None
+        full_detail = self.event_detail_level == "full"
+        for i, (code, team, probability) in enumerate(zip(states, teams, probabilities)):
+            next_state = STATES[code]
+            acting_team = TEAMS[team]
+
+            event = RallyEvent(
+                sequence_number=i + 1,
+                state=next_state,
+                action_type=self._get_action_type(current_state, next_state),
+                performing_team=acting_team,
+                probability=probability
+            )
+            if full_detail:
+                baseline_acting_team = self._get_acting_team(current_state, context)
+                acting_stats = team_a_stats if baseline_acting_team == TeamSide.TEAM_A else team_b_stats
+                event.context = context.snapshot()
+                event.skill_used = self._get_skill_used(current_state, next_state)
+                event.effectiveness = self._calculate_effectiveness(next_state, acting_stats)
+            result.events.append(event)
+            result.total_probability *= probability
+            if acting_team == TeamSide.TEAM_A:
+                result.team_a_actions += 1
+            else:
+                result.team_b_actions += 1
+
+            current_state = next_state
+            last_team = acting_team
+            # As in ``simulate_rally``, a terminal state only advances the
+            # context's state and length
+            if next_state in TERMINAL_STATES:
+                context.current_state = next_state
+                context.rally_length += 1
+                break
+            context = self._update_context(context, next_state, acting_team)
+
+        result.winner, result.point_outcome = self._determine_point_outcome(
+            current_state, context.serving_team, last_team
+        )
+        result.final_state = current_state
+        result.final_context = context
+        return result
+
+
+def warm_kernels(tables: RallyTables) -> None:
+    """Load the set and rally kernels into this process by running each once.
+
+    Worker processes call this on start, so their first task does not wait
+    for the kernels to be loaded from Numba's cache (or compiled).
+    """
+    simulate_set(tables, 1, 1, TeamSide.TEAM_A)
+    trace_states = np.empty(tables.max_transitions, dtype=np.int64)
+    trace_teams = np.empty(tables.max_transitions, dtype=np.int64)
+    trace_probs = np.empty(tables.max_transitions, dtype=np.float64)
+    _trace_rally_core(*tables, TEAM_CODES[TeamSide.TEAM_A], 0.0, 0.0,
+                      trace_states, trace_teams, trace_probs)
+
+
+SetKernel = Callable[..., Tuple[int, int, int]]
+
+# Set kernels specialised for one pair of teams, keyed on their tables
+SPECIALIZED_KERNEL_LIMIT = 16
+_specialized_kernels: "OrderedDict[tuple, SetKernel]" = OrderedDict()
+_specialized_lock = threading.Lock()
+
+
+def _compile_set_kernel(tables: RallyTables) -> SetKernel:
+    """Compile a set kernel with ``tables`` frozen in as compile-time constants.
+
+    Numba treats arrays captured from the enclosing scope as constants, and
+    the inlined rally loop then reads transition rows from constant data
+    instead of unboxing eleven table arguments on every call.
+    """
+    (next_states, base_weights, positive, terminal, outcome_kind, actor_static,
+     actor_dynamic, momentum_delta, momentum_factor, pressure_factor, max_transitions) = tables
+
+    @njit(nogil=True)
+    def set_core(target: int, min_lead: int, server: int, momentum_enabled: bool,
+                 pressure_enabled: bool, values: np.ndarray, cursor: np.ndarray) -> Tuple[int, int, int]:
+        return _simulate_set_core(
+            next_states, base_weights, positive, terminal, outcome_kind,
+            actor_static, actor_dynamic, momentum_delta,
+            momentum_factor, pressure_factor, max_transitions,
+            target, min_lead, server, momentum_enabled, pressure_enabled, values, cursor
+        )
+
+    def kernel(target: int, min_lead: int, server: TeamSide,
+               momentum_enabled: bool = True, pressure_enabled: bool = True,
+               draws: Optional[DrawStream] = None) -> Tuple[int, int, int]:
+        draws = draws if draws is not None else draw_stream()
+        return set_core(target, min_lead, TEAM_CODES[server], momentum_enabled,
+                        pressure_enabled, draws.values, draws.cursor)
+
+    # Compile now, with the argument types used in practice
+    kernel(21, 2, TeamSide.TEAM_A, True, True, draw_stream())
+    return kernel
+
+
+def specialized_set_kernel(tables: RallyTables, compile_if_missing: bool = True) -> Optional[SetKernel]:
+    """Return a compiled set kernel dedicated to ``tables``.
+
+    Compiling takes a second or two, so kernels are cached per team pair and
+    only worth building for large or repeated batches. The returned callable
+    takes the same arguments as ``simulate_set`` without ``tables``.
+    """
+    key = (tables.next_states.tobytes(), tables.base_weights.tobytes(),
+           tables.momentum_factor, tables.pressure_factor, tables.max_transitions)
+    with _specialized_lock:
+        kernel = _specialized_kernels.get(key)
+        if kernel is not None:
+            _specialized_kernels.move_to_end(key)
+        elif compile_if_missing and NUMBA_AVAILABLE:
+            kernel = _compile_set_kernel(tables)
+            _specialized_kernels[key] = kernel
+            if len(_specialized_kernels) > SPECIALIZED_KERNEL_LIMIT:
+                _specialized_kernels.popitem(last=False)
+    return kernel
+
+
+def simulate_matches_batch(tables: RallyTables, num_matches: int, sets_to_win: int,
+                           deciding_set_target: int = 15,
+                           momentum_enabled: bool = True,
+                           pressure_enabled: bool = True,
+                           rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Play ``num_matches`` matches side by side on structure-of-arrays state.
+
+    Every tick performs one rally state transition for all matches still in
+    play, so the Python loop runs once per transition of the longest match
+    rather than once per transition of every match. Rules match
+    ``_simulate_set_core``.
+
+    The per-tick weight arithmetic runs in float32: every tick touches an
+    ``(N, K)`` block of weights, and halving its width matters more than the
+    bits lost on probabilities that are only meaningful to a few places.
+
+    Returns ``(set_scores, set_rallies, sets_played)`` with shapes
+    ``(N, max_sets, 2)``, ``(N, max_sets)`` and ``(N,)``.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    (next_states, base_weights, positive, terminal, outcome_kind, actor_static,
+     actor_dynamic, momentum_delta, momentum_factor, pressure_factor, max_transitions) = tables
+    base_weights = base_weights.astype(np.float32)
+    momentum_delta = momentum_delta.astype(np.float32)
+    momentum_factor = np.float32(momentum_factor)
+    pressure_factor = np.float32(pressure_factor)
+
+    n = num_matches
+    max_sets = 2 * sets_to_win - 1
+    set_scores = np.zeros((n, max_sets, 2), dtype=np.int32)
+    set_rallies = np.zeros((n, max_sets), dtype=np.int32)
+    sets_won = np.zeros((n, 2), dtype=np.int32)
+    set_index = np.zeros(n, dtype=np.int64)
+
+    # Set state
+    scores = np.zeros((n, 2), dtype=np.int32)
+    target = np.full(n, 21, dtype=np.int32)
+    recent = np.zeros((n, 3), dtype=np.int64)
+    rallies = np.zeros(n, dtype=np.int64)
+
+    # Rally state
+    server = np.zeros(n, dtype=np.int64)
+    state = np.full(n, SERVE_READY, dtype=np.int64)
+    last_team = np.full(n, -1, dtype=np.int64)
+    momentum = np.zeros(n, dtype=np.float32)
+    pressure = np.zeros(n, dtype=np.float32)
+    length = np.zeros(n, dtype=np.int64)
+
+    alive = np.arange(n)
+    while alive.size:
+        m = alive.size
+        serving = server[alive]
+        current = state[alive]
+
+        # Weighted choice of the next state for every live match
+        candidates = next_states[serving, current]
+        valid = candidates >= 0
+        adjustment = (momentum[alive] * momentum_factor - pressure[alive] * pressure_factor)[:, None]
+        weights = apply_adjustment(base_weights[serving, current], positive[np.maximum(candidates, 0)], adjustment)
+        cumulative = np.cumsum(np.where(valid, weights, np.float32(0.0)), axis=1)
+        threshold = rng.random(m, dtype=np.float32) * cumulative[:, -1]
+        k = np.minimum((cumulative <= threshold[:, None]).sum(axis=1), valid.sum(axis=1) - 1)
+        chosen = candidates[np.arange(m), k].astype(np.int64)
+
+        previous_team = last_team[alive]
+        actor = np.where(
+            previous_team < 0,
+            actor_static[chosen, serving],
+            actor_dynamic[chosen, current, np.maximum(previous_team, 0), serving]
+        ).astype(np.int64)
+
+        # Momentum is tracked from team A's perspective
+        signed_delta = np.where(actor == 0, momentum_delta[chosen], -momentum_delta[chosen])
+        momentum[alive] = np.clip(momentum[alive] + signed_delta, -1.0, 1.0)
+        rally_length = length[alive] + 1
+        length[alive] = rally_length
+        pressure[alive] = np.where(rally_length > 10, np.minimum(1.0, 0.1 * (rally_length - 10)), pressure[alive])
+        state[alive] = chosen
+        last_team[alive] = actor
+
+        ended = terminal[chosen] | (rally_length >= max_transitions)
+        if not ended.any():
+            continue
+
+        # Award the point for every finished rally
+        done = alive[ended]
+        kind = outcome_kind[chosen[ended]]
+        done_actor = actor[ended]
+        winner = np.where(kind == OUTCOME_ACTOR_WINS, done_actor,
+                          np.where(kind == OUTCOME_ACTOR_LOSES, 1 - done_actor, serving[ended]))
+        scores[done, winner] += 1
+        recent[done, rallies[done] % 3] = winner
+        rallies[done] += 1
+        server[done] = winner
+
+        lead = np.abs(scores[done, 0] - scores[done, 1])
+        set_over = (scores[done].max(axis=1) >= target[done]) & (lead >= 2)
+        finished_set = done[set_over]
+        match_over = np.zeros(done.size, dtype=np.bool_)
+        if finished_set.size:
+            slot = set_index[finished_set]
+            set_scores[finished_set, slot] = scores[finished_set]
+            set_rallies[finished_set, slot] = rallies[finished_set]
+            sets_won[finished_set, (scores[finished_set, 1] > scores[finished_set, 0]).astype(np.int64)] += 1
+            set_index[finished_set] += 1
+            match_over[set_over] = sets_won[finished_set].max(axis=1) >= sets_to_win
+
+            # Start the next set; serve alternates between sets
+            next_set = done[set_over & ~match_over]
+            scores[next_set] = 0
+            rallies[next_set] = 0
+            server[next_set] = set_index[next_set] % 2
+            deciding = (set_index[next_set] == max_sets - 1) & (sets_to_win > 1)
+            target[next_set] = np.where(deciding, deciding_set_target, 21)
+
+        # Reset rally state and set-level context for the next rally
+        restart = done[~match_over]
+        state[restart] = SERVE_READY
+        last_team[restart] = -1
+        length[restart] = 0
+        pressure[restart] = 0.0
+        momentum[restart] = 0.0
+        if pressure_enabled and restart.size:
+            score_ratio = scores[restart].max(axis=1) / target[restart]
+            pressure[restart] = np.where(score_ratio >= 0.8, np.minimum(1.0, (score_ratio - 0.8) * 5.0), 0.0)
+        if momentum_enabled and restart.size:
+            played = rallies[restart]
+            window = np.minimum(played, 3)
+            in_window = np.arange(3)[None, :] < window[:, None]
+            wins_a = ((recent[restart] == 0) & in_window).sum(axis=1)
+            momentum[restart] = np.where(played > 0, (2 * wins_a - window) / np.maximum(window, 1), 0.0)
+
+        if match_over.any():
+            alive = alive[~np.isin(alive, done[match_over])]
+
+    return set_scores, set_rallies, set_index
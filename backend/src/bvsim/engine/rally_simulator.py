@@ -1,17 +1,18 @@
 """Main rally simulation engine for beach volleyball."""
 
-from typing import List, Dict, Optional, Tuple, Any
-from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 import logging
-import random
+from itertools import chain
 from dataclasses import dataclass, field
 from enum import Enum
 
+import numpy as np
+
 from .rally_states import (
-    RallyState, RallyContext, TeamSide, ActionType, 
-    is_terminal_state, get_valid_next_states
+    RALLY_STATE_NAMES, RallyState, RallyContext, ContextSnapshot, TeamSide, ActionType, 
+    TERMINAL_STATES
 )
-from .probability_engine import ProbabilityEngine, TransitionProbabilities
+from .probability_engine import STATE_INDEX, ProbabilityEngine, TransitionProbabilities
 from ..schemas.team_statistics import TeamStatisticsBase
 
 
@@ -26,20 +27,190 @@ class PointOutcome(str, Enum):
     ERROR = "error"
 
 
-@dataclass
+class UniformStream:
+    """Uniform [0, 1) draws served from a bulk-generated NumPy buffer.
+    
+    One ``Generator.random(size)`` call fills the whole buffer, which is much
+    cheaper than one ``Generator.random()`` call per state transition. Values
+    are kept as Python floats and handed out by a list iterator, refilled
+    lazily whenever a buffer runs out.
+    """
+    
+    __slots__ = ('_rng', '_size', '_draws')
+    
+    def __init__(self, seed: Optional[int] = None, size: int = 4096,
+                 rng: Optional[np.random.Generator] = None):
+        self._rng = rng if rng is not None else np.random.default_rng(seed)
+        self._size = size
+        self._draws = chain.from_iterable(iter(self._fill, None))
+    
+    def _fill(self) -> List[float]:
+        return self._rng.random(self._size).tolist()
+    
+    def next(self) -> float:
+        """Return the next uniform draw, refilling the buffer when exhausted."""
+        return next(self._draws)
+
+
+# How the acting team follows from the previous event and the context
+SAME_TEAM, OTHER_TEAM, SERVING_TEAM, RECEIVING_TEAM = range(4)
+
+# Row of ``ACTING_TEAM_RULES`` used before the rally's first event
+NO_PREVIOUS_STATE = len(RallyState)
+
+
+def _acting_team_rules() -> Tuple[Tuple[int, ...], ...]:
+    """Acting team rule for each state, indexed by ``[last_state][state]``."""
+    receptions = (RallyState.RECEPTION_PERFECT, RallyState.RECEPTION_GOOD, RallyState.RECEPTION_POOR)
+    sets = (RallyState.SET_PERFECT, RallyState.SET_GOOD, RallyState.SET_POOR)
+    defenses = (
+        RallyState.DIG_PERFECT, RallyState.DIG_GOOD, RallyState.DIG_POOR,
+        RallyState.BLOCK_CONTROLLED, RallyState.BLOCK_TOUCH
+    )
+    
+    # Without a deciding previous action the receiving team handles the
+    # serve and the first ball attack sequence; the serving team serves,
+    # defends that first attack and plays every other action
+    first_ball = frozenset(receptions + sets + (RallyState.ATTACK_IN_PLAY, RallyState.ATTACK_BLOCKED))
+    default = [RECEIVING_TEAM if state in first_ball else SERVING_TEAM for state in RallyState]
+    rules = [list(default) for _ in range(NO_PREVIOUS_STATE + 1)]
+    
+    def add(last_states, states, rule):
+        for last_state in last_states:
+            for state in states:
+                rules[last_state][state] = rule
+    
+    # The receiving team handles the serve
+    add((RallyState.SERVE_IN_PLAY,), receptions, RECEIVING_TEAM)
+    # The team that received sets
+    add(receptions, sets + (RallyState.SET_ERROR,), SAME_TEAM)
+    # The team that set attacks
+    add(sets + (RallyState.TRANSITION_SET,),
+        (RallyState.ATTACK_IN_PLAY, RallyState.ATTACK_KILL, RallyState.TRANSITION_ATTACK), SAME_TEAM)
+    # The defending team blocks an attack
+    add((RallyState.ATTACK_IN_PLAY, RallyState.TRANSITION_ATTACK), (RallyState.ATTACK_BLOCKED,), OTHER_TEAM)
+    # The team that is not attacking digs or blocks
+    add((RallyState.ATTACK_IN_PLAY, RallyState.ATTACK_BLOCKED, RallyState.TRANSITION_ATTACK),
+        defenses, OTHER_TEAM)
+    # The team that just dug or blocked, or set in transition, sets in transition
+    add(defenses + (RallyState.TRANSITION_SET,), (RallyState.TRANSITION_SET,), SAME_TEAM)
+    return tuple(tuple(row) for row in rules)
+
+
+# Acting team rules resolved by one table lookup per transition
+ACTING_TEAM_RULES: Tuple[Tuple[int, ...], ...] = _acting_team_rules()
+
+
+def _action_type_of(state: RallyState) -> ActionType:
+    """Action that produces ``state`` after the serve, read from the state name."""
+    for keyword, action_type in (
+        ("reception", ActionType.RECEPTION),
+        ("set", ActionType.SET),
+        ("attack", ActionType.ATTACK),
+        ("dig", ActionType.DIG),
+        ("block", ActionType.BLOCK),
+        ("transition", ActionType.TRANSITION),
+    ):
+        if keyword in RALLY_STATE_NAMES[state]:
+            return action_type
+    return ActionType.SERVE  # Default
+
+
+def _effectiveness_of(state: RallyState) -> Optional[float]:
+    """Effectiveness of the action that produced ``state``."""
+    # Positive outcomes
+    if state in (
+        RallyState.SERVE_ACE, RallyState.ATTACK_KILL, RallyState.BLOCK_KILL,
+        RallyState.RECEPTION_PERFECT, RallyState.SET_PERFECT, RallyState.DIG_PERFECT
+    ):
+        return 1.0
+    # Good outcomes
+    if state in (
+        RallyState.RECEPTION_GOOD, RallyState.SET_GOOD, RallyState.DIG_GOOD,
+        RallyState.BLOCK_CONTROLLED, RallyState.ATTACK_IN_PLAY
+    ):
+        return 0.75
+    # Poor outcomes
+    if state in (
+        RallyState.RECEPTION_POOR, RallyState.SET_POOR, RallyState.DIG_POOR,
+        RallyState.BLOCK_TOUCH, RallyState.ATTACK_BLOCKED
+    ):
+        return 0.25
+    # Error outcomes
+    if "error" in RALLY_STATE_NAMES[state]:
+        return 0.0
+    return None
+
+
+SKILL_BY_ACTION_TYPE: Dict[ActionType, Optional[str]] = {
+    ActionType.SERVE: "serve_effectiveness",
+    ActionType.RECEPTION: "serve_receive",
+    ActionType.SET: "setting_accuracy",
+    ActionType.ATTACK: "attack_efficiency",
+    ActionType.DIG: "digging_efficiency",
+    ActionType.BLOCK: "blocking_effectiveness",
+    ActionType.TRANSITION: None
+}
+
+# Per-event lookups, resolved once for the closed set of rally states
+ACTION_TYPE_BY_STATE: Dict[RallyState, ActionType] = {state: _action_type_of(state) for state in RallyState}
+SKILL_BY_STATE: Dict[RallyState, Optional[str]] = {
+    state: SKILL_BY_ACTION_TYPE[action_type] for state, action_type in ACTION_TYPE_BY_STATE.items()
+}
+EFFECTIVENESS_BY_STATE: Dict[RallyState, Optional[float]] = {state: _effectiveness_of(state) for state in RallyState}
+
+# Dense action type codes for the array views of a rally's events
+ACTION_TYPE_NAMES: Tuple[str, ...] = tuple(action_type.value for action_type in ActionType)
+ACTION_TYPE_CODES: Dict[ActionType, int] = {action_type: code for code, action_type in enumerate(ActionType)}
+
+
+def _momentum_change_of(state: RallyState) -> float:
+    """Momentum the acting team gains from reaching ``state``."""
+    if state in (RallyState.SERVE_ACE, RallyState.ATTACK_KILL, RallyState.BLOCK_KILL):
+        return 0.3  # Big positive momentum
+    if state in (RallyState.RECEPTION_PERFECT, RallyState.SET_PERFECT):
+        return 0.1  # Small positive momentum
+    if "error" in RALLY_STATE_NAMES[state]:
+        return -0.3  # Big negative momentum
+    if state in (RallyState.RECEPTION_POOR, RallyState.SET_POOR):
+        return -0.1  # Small negative momentum
+    return 0.0  # No momentum change
+
+
+# States in which the acting team commits an error and loses the point
+ERROR_STATES = frozenset(state for state in RallyState if RALLY_STATE_NAMES[state].endswith("_error"))
+
+# Point outcome when each team wins
+WIN_OUTCOME: Dict[TeamSide, PointOutcome] = {
+    TeamSide.TEAM_A: PointOutcome.TEAM_A_WIN,
+    TeamSide.TEAM_B: PointOutcome.TEAM_B_WIN
+}
+
+
+# Momentum change indexed by state code: a tuple for the per-transition
+# Python lookup, and the same values as an array for the kernels
+MOMENTUM_CHANGE_BY_STATE: Tuple[float, ...] = tuple(_momentum_change_of(state) for state in RallyState)
+MOMENTUM_DELTA = np.array(MOMENTUM_CHANGE_BY_STATE, dtype=np.float64)
+
+
+@dataclass(slots=True)
 class RallyEvent:
-    """Represents a single event in a rally."""
+    """Represents a single event in a rally.
+    
+    The metadata fields stay ``None`` for events simulated with
+    ``event_detail_level = "lite"``.
+    """
     
     sequence_number: int
     state: RallyState
     action_type: ActionType
     performing_team: TeamSide
-    probability: Decimal
-    context: RallyContext
+    probability: float
+    context: Optional[ContextSnapshot] = None
     
     # Additional event metadata
     skill_used: Optional[str] = None
-    effectiveness: Optional[Decimal] = None
+    effectiveness: Optional[float] = None
     notes: Optional[str] = None
 
 
@@ -57,7 +228,7 @@ class RallyResult:
     final_state: Optional[RallyState] = None
     
     # Statistics
-    total_probability: Decimal = Decimal("1.0")
+    total_probability: float = 1.0
     team_a_actions: int = 0
     team_b_actions: int = 0
     
@@ -65,13 +236,37 @@ class RallyResult:
     final_context: Optional[RallyContext] = None
     
     def get_event_summary(self) -> Dict[str, int]:
-        """Get summary of events by action type."""
+        """Get summary of events by action type.
+        
+        A rally holds only a handful of events, so a dict count beats
+        building arrays here; ``summarize_event_types`` vectorizes the
+        count across many rallies.
+        """
         summary = {}
         for event in self.events:
             action = event.action_type.value
             summary[action] = summary.get(action, 0) + 1
         return summary
     
+    def events_soa(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the events' states (``STATE_INDEX`` codes) and teams (0 for A, 1 for B) as arrays."""
+        states = np.fromiter((STATE_INDEX[e.state] for e in self.events), dtype=np.int8, count=len(self.events))
+        teams = np.fromiter((e.performing_team is TeamSide.TEAM_B for e in self.events),
+                            dtype=np.int8, count=len(self.events))
+        return states, teams
+    
+    def event_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return the events' action types (``ACTION_TYPE_CODES``), teams (0 for A, 1 for B) and
+        effectiveness (NaN where unset) as parallel arrays."""
+        count = len(self.events)
+        action_type_ids = np.fromiter((ACTION_TYPE_CODES[e.action_type] for e in self.events),
+                                      dtype=np.int8, count=count)
+        performing_team_ids = np.fromiter((e.performing_team is TeamSide.TEAM_B for e in self.events),
+                                          dtype=np.int8, count=count)
+        effectiveness = np.fromiter((np.nan if e.effectiveness is None else e.effectiveness for e in self.events),
+                                    dtype=np.float32, count=count)
+        return action_type_ids, performing_team_ids, effectiveness
+    
     def get_team_performance(self, team: TeamSide) -> Dict[str, Any]:
         """Get performance metrics for a specific team."""
         team_events = [e for e in self.events if e.performing_team == team]
@@ -84,6 +279,16 @@ class RallyResult:
         }
 
 
+def summarize_event_types(results: Iterable[RallyResult]) -> Dict[str, int]:
+    """Count the events of many rallies by action type in one pass."""
+    action_type_ids = np.fromiter(
+        (ACTION_TYPE_CODES[event.action_type] for result in results for event in result.events),
+        dtype=np.int8
+    )
+    counts = np.bincount(action_type_ids, minlength=len(ACTION_TYPE_NAMES))
+    return {ACTION_TYPE_NAMES[code]: count for code, count in enumerate(counts.tolist()) if count}
+
+
 class RallySimulator:
     """Simulates individual beach volleyball rallies."""
     
@@ -96,25 +301,36 @@ class RallySimulator:
         self.max_rally_length = 50
         self.max_state_transitions = 100
         
-        # Random seed for reproducible testing
-        self._random_seed: Optional[int] = None
+        # "full" events carry a context snapshot, skill and effectiveness;
+        # "lite" events only the state, action, team and probability
+        self.event_detail_level = "full"
+        
+        # Each simulator owns its NumPy generator so simulators on different
+        # threads do not share state; transitions draw from it in bulk
+        self._rng = np.random.default_rng()
+        self._uniforms = UniformStream(rng=self._rng)
     
     def set_random_seed(self, seed: int) -> None:
         """Set random seed for reproducible simulations."""
-        self._random_seed = seed
-        random.seed(seed)
+        self._rng = np.random.default_rng(seed)
+        self._uniforms = UniformStream(rng=self._rng)
     
     def simulate_rally(
         self,
         serving_team: TeamSide,
         team_a_stats: TeamStatisticsBase,
         team_b_stats: TeamStatisticsBase,
-        initial_context: Optional[RallyContext] = None
+        initial_context: Optional[RallyContext] = None,
+        uniforms: Optional[UniformStream] = None
     ) -> RallyResult:
-        """Simulate a complete rally from serve to point completion."""
+        """Simulate a complete rally from serve to point completion.
+        
+        When ``uniforms`` is given, state selection draws from that bulk
+        buffer instead of the simulator's own stream.
+        """
         
-        # Initialize context
-        context = initial_context or RallyContext(
+        # Initialize context; the rally advances its own copy in place
+        context = initial_context.copy() if initial_context is not None else RallyContext(
             current_state=RallyState.SERVE_READY,
             serving_team=serving_team,
             rally_length=0,
@@ -132,79 +348,111 @@ class RallySimulator:
             final_context=context
         )
         
+        # Debug messages are only formatted when debug logging is on
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            self.logger.debug(f"Starting rally simulation: {serving_team} serving")
+        
+        # Only the walk's callees can raise; a failed rally reports an
+        # error outcome at the last state it reached
+        try:
+            self._walk_rally(result, context, team_a_stats, team_b_stats,
+                             (uniforms if uniforms is not None else self._uniforms).next)
+        except Exception as e:
+            self.logger.error(f"Error in rally simulation: {e}")
+            result.point_outcome = PointOutcome.ERROR
+            result.final_state = result.events[-1].state if result.events else RallyState.SERVE_READY
+            return result
+        
+        if debug:
+            self.logger.debug(f"Rally completed: {result.winner} wins after {result.rally_length} actions")
+        return result
+    
+    def _walk_rally(
+        self,
+        result: RallyResult,
+        context: RallyContext,
+        team_a_stats: TeamStatisticsBase,
+        team_b_stats: TeamStatisticsBase,
+        draw: Callable[[], float]
+    ) -> None:
+        """Step the rally from the serve to its end, filling in ``result``."""
         current_state = RallyState.SERVE_READY
         sequence_number = 1
         total_transitions = 0
-        
-        self.logger.debug(f"Starting rally simulation: {serving_team} serving")
-        
-        try:
-            while not is_terminal_state(current_state) and total_transitions < self.max_state_transitions:
-                # Calculate transition probabilities first (using current acting team as baseline)
-                baseline_acting_team = self._get_acting_team(current_state, context)
-                acting_stats = team_a_stats if baseline_acting_team == TeamSide.TEAM_A else team_b_stats
-                opponent_stats = team_b_stats if baseline_acting_team == TeamSide.TEAM_A else team_a_stats
-                
-                transition_probs = self.probability_engine.calculate_transition_probabilities(
-                    current_state, context, acting_stats, opponent_stats
-                )
-                
-                if not transition_probs.transitions:
-                    self.logger.warning(f"No valid transitions from state: {current_state}")
-                    break
-                
-                # Select next state based on probabilities
-                next_state = self._select_next_state(transition_probs)
-                probability = transition_probs.get_probability(next_state)
-                
-                # NOW determine which team performs the next state action
-                acting_team = self._get_acting_team_dynamic(next_state, context, result.events)
-                
-                # Create rally event
-                event = RallyEvent(
-                    sequence_number=sequence_number,
-                    state=next_state,
-                    action_type=self._get_action_type(current_state, next_state),
-                    performing_team=acting_team,
-                    probability=probability,
-                    context=context,
-                    skill_used=self._get_skill_used(current_state, next_state),
-                    effectiveness=self._calculate_effectiveness(next_state, acting_stats)
-                )
-                
-                result.events.append(event)
-                result.total_probability *= probability
-                
-                # Update counts
-                if acting_team == TeamSide.TEAM_A:
-                    result.team_a_actions += 1
-                else:
-                    result.team_b_actions += 1
-                
-                # Update context for next iteration
-                context = self._update_context(context, next_state, acting_team)
-                current_state = next_state
-                sequence_number += 1
-                total_transitions += 1
-                
-                self.logger.debug(f"Transition {total_transitions}: {current_state} by {acting_team}")
+        full_detail = self.event_detail_level == "full"
+        log_transitions = self.logger.isEnabledFor(logging.DEBUG)
+        # State and team of the latest event, which decide possession
+        last_state: Optional[RallyState] = None
+        last_team: Optional[TeamSide] = None
+        
+        while total_transitions < self.max_state_transitions:
+            # Calculate transition probabilities first (using current acting team as baseline)
+            baseline_acting_team = self._get_acting_team(current_state, context)
+            acting_stats = team_a_stats if baseline_acting_team == TeamSide.TEAM_A else team_b_stats
+            opponent_stats = team_b_stats if baseline_acting_team == TeamSide.TEAM_A else team_a_stats
             
-            # Determine final outcome
-            result.winner, result.point_outcome = self._determine_point_outcome(
-                current_state, context, result.events
+            # Sample the next state straight from the probability engine
+            uniform = draw()
+            next_state, probability = self.probability_engine.sample_next_state(
+                current_state, context, acting_stats, opponent_stats, uniform
             )
-            result.final_state = current_state
-            result.rally_length = total_transitions
-            result.final_context = context
             
-            self.logger.debug(f"Rally completed: {result.winner} wins after {result.rally_length} actions")
+            if next_state is None:
+                self.logger.warning(f"No valid transitions from state: {current_state.name}")
+                break
             
-        except Exception as e:
-            self.logger.error(f"Error in rally simulation: {e}")
-            result.point_outcome = PointOutcome.ERROR
-            result.final_state = current_state
+            # NOW determine which team performs the next state action
+            acting_team = self._get_acting_team(next_state, context, last_state, last_team)
+            
+            # Create rally event
+            event = RallyEvent(
+                sequence_number=sequence_number,
+                state=next_state,
+                action_type=self._get_action_type(current_state, next_state),
+                performing_team=acting_team,
+                probability=probability
+            )
+            if full_detail:
+                event.context = context.snapshot()
+                event.skill_used = self._get_skill_used(current_state, next_state)
+                event.effectiveness = self._calculate_effectiveness(next_state, acting_stats)
+            
+            result.events.append(event)
+            result.total_probability *= probability
+            
+            # Update counts
+            if acting_team == TeamSide.TEAM_A:
+                result.team_a_actions += 1
+            else:
+                result.team_b_actions += 1
+            
+            current_state = last_state = next_state
+            last_team = acting_team
+            sequence_number += 1
+            total_transitions += 1
+            
+            if log_transitions:
+                self.logger.debug(f"Transition {total_transitions}: {current_state.name} by {acting_team}")
+            
+            # A terminal state ends the rally at once; its momentum and
+            # pressure would never be read, so only the state and length
+            # of the context advance
+            if next_state in TERMINAL_STATES:
+                context.current_state = next_state
+                context.rally_length += 1
+                break
+            
+            # Update context for next iteration
+            context = self._update_context(context, next_state, acting_team)
         
-        return result
+        # Determine final outcome
+        result.winner, result.point_outcome = self._determine_point_outcome(
+            current_state, context.serving_team, last_team
+        )
+        result.final_state = current_state
+        result.rally_length = total_transitions
+        result.final_context = context
     
     def simulate_multiple_rallies(
         self,
@@ -214,7 +462,12 @@ class RallySimulator:
         team_b_stats: TeamStatisticsBase,
         base_context: Optional[RallyContext] = None
     ) -> List[RallyResult]:
-        """Simulate multiple rallies and return results."""
+        """Simulate multiple rallies and return results.
+        
+        The probability engine caches each state's base distribution per team
+        pair, so only the first rally computes them; later rallies pay just
+        the per-step momentum and pressure scaling.
+        """
         
         results = []
         
@@ -244,183 +497,52 @@ class RallySimulator:
         
         return results
     
-    def _get_acting_team_dynamic(self, state: RallyState, context: RallyContext, events: List[RallyEvent]) -> TeamSide:
-        """Determine which team is performing the current action based on rally flow and previous events."""
-        
-        # If no events yet, use the basic logic
-        if not events:
-            return self._get_acting_team(state, context)
-        
-        # Look at the last event to determine current possession
-        last_event = events[-1]
-        last_performing_team = last_event.performing_team
-        
-        # Special handling for serve reception - always the receiving team
-        if state in [RallyState.RECEPTION_PERFECT, RallyState.RECEPTION_GOOD, RallyState.RECEPTION_POOR]:
-            # If the last event was a serve, the receiving team handles reception
-            if last_event.state in [RallyState.SERVE_IN_PLAY]:
-                return context.get_receiving_team()
-        
-        # Set actions are performed by the team that just received
-        elif state in [RallyState.SET_PERFECT, RallyState.SET_GOOD, RallyState.SET_POOR, RallyState.SET_ERROR]:
-            # If the last action was a reception, the same team sets
-            if last_event.state in [RallyState.RECEPTION_PERFECT, RallyState.RECEPTION_GOOD, RallyState.RECEPTION_POOR]:
-                return last_performing_team  # Same team that received
-        
-        # Attack actions are performed by the team that just set
-        elif state in [RallyState.ATTACK_IN_PLAY, RallyState.ATTACK_KILL, RallyState.TRANSITION_ATTACK]:
-            # If the last action was a set, the same team attacks
-            if last_event.state in [RallyState.SET_PERFECT, RallyState.SET_GOOD, RallyState.SET_POOR, RallyState.TRANSITION_SET]:
-                return last_performing_team  # Same team that set
-        
-        # Block actions are performed by the team defending against an attack
-        elif state in [RallyState.ATTACK_BLOCKED]:
-            # If the last action was an attack, the defending team blocks
-            if last_event.state in [RallyState.ATTACK_IN_PLAY, RallyState.TRANSITION_ATTACK]:
-                return TeamSide.TEAM_A if last_performing_team == TeamSide.TEAM_B else TeamSide.TEAM_B
-        
-        # Defensive actions are performed by the team that is NOT attacking
-        elif state in [
-            RallyState.DIG_PERFECT, RallyState.DIG_GOOD, RallyState.DIG_POOR,
-            RallyState.BLOCK_CONTROLLED, RallyState.BLOCK_TOUCH
-        ]:
-            # If the last action was an attack, the defending team is the opposite
-            if last_event.state in [RallyState.ATTACK_IN_PLAY, RallyState.ATTACK_BLOCKED, RallyState.TRANSITION_ATTACK]:
-                return TeamSide.TEAM_A if last_performing_team == TeamSide.TEAM_B else TeamSide.TEAM_B
-        
-        # Transition logic based on the current state and who performed the last action
-        elif state in [RallyState.TRANSITION_SET, RallyState.TRANSITION_ATTACK]:
-            # Transition actions are performed by the team that just gained possession
-            # This happens after a dig or block, so the team that just defended now attacks
-            
-            # If the last action was a dig or block, the same team continues with transition
-            if last_event.state in [
-                RallyState.DIG_PERFECT, RallyState.DIG_GOOD, RallyState.DIG_POOR,
-                RallyState.BLOCK_CONTROLLED, RallyState.BLOCK_TOUCH
-            ]:
-                return last_performing_team  # Same team that dug/blocked
-            
-            # If the last action was a transition set, the same team attacks
-            elif last_event.state == RallyState.TRANSITION_SET:
-                return last_performing_team  # Same team that set
-                
-        # For all other states, use the standard logic
-        return self._get_acting_team(state, context)
-
-    def _get_acting_team(self, state: RallyState, context: RallyContext) -> TeamSide:
-        """Determine which team is performing the current action based on volleyball flow."""
-        
-        # Serving team always serves
-        if state in [RallyState.SERVE_READY]:
+    def _get_acting_team(self, state: RallyState, context: RallyContext,
+                         last_state: Optional[RallyState] = None,
+                         last_team: Optional[TeamSide] = None) -> TeamSide:
+        """Determine which team is performing the current action based on rally flow.
+        
+        ``last_state`` and ``last_team`` describe the previous event, or are
+        ``None`` before the first one; see ``ACTING_TEAM_RULES``.
+        """
+        rule = ACTING_TEAM_RULES[NO_PREVIOUS_STATE if last_state is None else last_state][state]
+        if rule == SERVING_TEAM:
             return context.serving_team
-        
-        # Receiving team handles serve reception and first ball attack sequence
-        elif state in [
-            RallyState.RECEPTION_PERFECT, RallyState.RECEPTION_GOOD, RallyState.RECEPTION_POOR,
-            RallyState.SET_PERFECT, RallyState.SET_GOOD, RallyState.SET_POOR,
-            RallyState.ATTACK_IN_PLAY, RallyState.ATTACK_BLOCKED
-        ]:
+        if rule == RECEIVING_TEAM:
             return context.get_receiving_team()
-        
-        # Serving team defends against first attack
-        elif state in [
-            RallyState.DIG_PERFECT, RallyState.DIG_GOOD, RallyState.DIG_POOR,
-            RallyState.BLOCK_CONTROLLED, RallyState.BLOCK_TOUCH
-        ]:
-            return context.serving_team
-        
-        # Transition actions: performed by the team that just defended (gained possession)
-        elif state in [RallyState.TRANSITION_SET, RallyState.TRANSITION_ATTACK]:
-            # The team that just dug/blocked is now attacking
-            # This is the serving team after they defended the first attack
-            return context.serving_team
-        
-        else:
-            # Default fallback
-            return context.serving_team
+        if rule == SAME_TEAM:
+            return last_team
+        return TeamSide.TEAM_A if last_team == TeamSide.TEAM_B else TeamSide.TEAM_B
     
-    def _select_next_state(self, transition_probs: TransitionProbabilities) -> RallyState:
+    def _select_next_state(self, transition_probs: TransitionProbabilities,
+                           uniforms: Optional[UniformStream] = None) -> RallyState:
         """Select the next state based on transition probabilities."""
         
-        states = list(transition_probs.transitions.keys())
-        probabilities = [float(prob) for prob in transition_probs.transitions.values()]
-        
-        if not states:
+        if not transition_probs.transitions:
             raise ValueError("No valid state transitions available")
         
-        # Use weighted random selection
-        return random.choices(states, weights=probabilities, k=1)[0]
+        stream = uniforms if uniforms is not None else self._uniforms
+        return transition_probs.sample(stream.next())
     
     def _get_action_type(self, current_state: RallyState, next_state: RallyState) -> ActionType:
         """Determine the action type for the transition."""
-        
-        if current_state == RallyState.SERVE_READY:
+        if current_state is RallyState.SERVE_READY:
             return ActionType.SERVE
-        elif "reception" in next_state.value:
-            return ActionType.RECEPTION
-        elif "set" in next_state.value:
-            return ActionType.SET
-        elif "attack" in next_state.value:
-            return ActionType.ATTACK
-        elif "dig" in next_state.value:
-            return ActionType.DIG
-        elif "block" in next_state.value:
-            return ActionType.BLOCK
-        elif "transition" in next_state.value:
-            return ActionType.TRANSITION
-        else:
-            return ActionType.SERVE  # Default
+        return ACTION_TYPE_BY_STATE[next_state]
     
     def _get_skill_used(self, current_state: RallyState, next_state: RallyState) -> Optional[str]:
         """Determine which skill was used for this transition."""
-        
-        action_type = self._get_action_type(current_state, next_state)
-        
-        skill_mapping = {
-            ActionType.SERVE: "serve_effectiveness",
-            ActionType.RECEPTION: "serve_receive",
-            ActionType.SET: "setting_accuracy",
-            ActionType.ATTACK: "attack_efficiency",
-            ActionType.DIG: "digging_efficiency",
-            ActionType.BLOCK: "blocking_effectiveness"
-        }
-        
-        return skill_mapping.get(action_type)
+        if current_state is RallyState.SERVE_READY:
+            return SKILL_BY_ACTION_TYPE[ActionType.SERVE]
+        return SKILL_BY_STATE[next_state]
     
     def _calculate_effectiveness(
         self, 
         state: RallyState, 
         team_stats: TeamStatisticsBase
-    ) -> Optional[Decimal]:
+    ) -> Optional[float]:
         """Calculate the effectiveness of the action based on the outcome state."""
-        
-        # Positive outcomes
-        if state in [
-            RallyState.SERVE_ACE, RallyState.ATTACK_KILL, RallyState.BLOCK_KILL,
-            RallyState.RECEPTION_PERFECT, RallyState.SET_PERFECT, RallyState.DIG_PERFECT
-        ]:
-            return Decimal("1.0")
-        
-        # Good outcomes
-        elif state in [
-            RallyState.RECEPTION_GOOD, RallyState.SET_GOOD, RallyState.DIG_GOOD,
-            RallyState.BLOCK_CONTROLLED, RallyState.ATTACK_IN_PLAY
-        ]:
-            return Decimal("0.75")
-        
-        # Poor outcomes
-        elif state in [
-            RallyState.RECEPTION_POOR, RallyState.SET_POOR, RallyState.DIG_POOR,
-            RallyState.BLOCK_TOUCH, RallyState.ATTACK_BLOCKED
-        ]:
-            return Decimal("0.25")
-        
-        # Error outcomes
-        elif "error" in state.value:
-            return Decimal("0.0")
-        
-        else:
-            return None
+        return EFFECTIVENESS_BY_STATE[state]
     
     def _update_context(
         self, 
@@ -428,98 +550,57 @@ class RallySimulator:
         new_state: RallyState, 
         acting_team: TeamSide
     ) -> RallyContext:
-        """Update rally context after a state transition."""
+        """Advance the rally context in place after a state transition; returns it."""
         
-        # Create new context (immutable update)
-        new_context = RallyContext(
-            current_state=new_state,
-            serving_team=context.serving_team,
-            rally_length=context.rally_length + 1,
-            team_a_score=context.team_a_score,
-            team_b_score=context.team_b_score,
-            set_number=context.set_number,
-            momentum=context.momentum,
-            pressure_level=context.pressure_level,
-            fatigue_team_a=context.fatigue_team_a,
-            fatigue_team_b=context.fatigue_team_b,
-            wind_factor=context.wind_factor
-        )
+        context.current_state = new_state
+        context.rally_length += 1
         
         # Update momentum based on positive/negative outcomes
         momentum_change = self._calculate_momentum_change(new_state, acting_team)
         if acting_team == TeamSide.TEAM_A:
-            new_context.momentum = max(Decimal("-1.0"), min(Decimal("1.0"), 
-                context.momentum + momentum_change))
+            momentum = context.momentum + momentum_change
         else:
-            new_context.momentum = max(Decimal("-1.0"), min(Decimal("1.0"), 
-                context.momentum - momentum_change))
+            momentum = context.momentum - momentum_change
+        # Clamp to [-1, 1] with comparisons rather than min/max calls
+        context.momentum = 1.0 if momentum >= 1.0 else (momentum if momentum > -1.0 else -1.0)
         
         # Increase pressure as rally gets longer
-        if new_context.rally_length > 10:
-            new_context.pressure_level = min(Decimal("1.0"), 
-                Decimal("0.1") * (new_context.rally_length - 10))
+        if context.rally_length > 10:
+            pressure_level = 0.1 * (context.rally_length - 10)
+            context.pressure_level = pressure_level if pressure_level < 1.0 else 1.0
         
-        return new_context
+        return context
     
-    def _calculate_momentum_change(self, state: RallyState, acting_team: TeamSide) -> Decimal:
+    def _calculate_momentum_change(self, state: RallyState, acting_team: TeamSide) -> float:
         """Calculate momentum change based on the outcome state."""
-        
-        if state in [RallyState.SERVE_ACE, RallyState.ATTACK_KILL, RallyState.BLOCK_KILL]:
-            return Decimal("0.3")  # Big positive momentum
-        elif state in [RallyState.RECEPTION_PERFECT, RallyState.SET_PERFECT]:
-            return Decimal("0.1")  # Small positive momentum
-        elif "error" in state.value:
-            return Decimal("-0.3")  # Big negative momentum
-        elif state in [RallyState.RECEPTION_POOR, RallyState.SET_POOR]:
-            return Decimal("-0.1")  # Small negative momentum
-        else:
-            return Decimal("0.0")  # No momentum change
+        return MOMENTUM_CHANGE_BY_STATE[state]
     
     def _determine_point_outcome(
         self, 
         final_state: RallyState, 
-        context: RallyContext,
-        events: List[RallyEvent]
+        serving_team: TeamSide,
+        last_team: Optional[TeamSide]
     ) -> Tuple[TeamSide, PointOutcome]:
-        """Determine who won the point based on the final state."""
+        """Determine who won the point from the final state and the team that produced it.
+        
+        ``last_team`` performed the rally's last event, which reached
+        ``final_state``; it is ``None`` when the rally has no events.
+        """
         
         # Direct terminal states
         if final_state == RallyState.SERVE_ACE:
-            return context.serving_team, (
-                PointOutcome.TEAM_A_WIN if context.serving_team == TeamSide.TEAM_A 
-                else PointOutcome.TEAM_B_WIN
-            )
+            return serving_team, WIN_OUTCOME[serving_team]
         
-        elif final_state in [RallyState.ATTACK_KILL, RallyState.BLOCK_KILL]:
-            # Determine winner based on who performed the winning action using dynamic logic
-            # If the last event matches the final state, use that team directly
-            if events and events[-1].state == final_state:
-                acting_team = events[-1].performing_team
-            else:
-                acting_team = self._get_acting_team_dynamic(final_state, context, events)
-            return acting_team, (
-                PointOutcome.TEAM_A_WIN if acting_team == TeamSide.TEAM_A 
-                else PointOutcome.TEAM_B_WIN
-            )
+        elif final_state in (RallyState.ATTACK_KILL, RallyState.BLOCK_KILL):
+            # The team that performed the winning action wins
+            return last_team, WIN_OUTCOME[last_team]
         
-        elif "error" in final_state.value:
+        elif final_state in ERROR_STATES:
             # Error means the acting team loses
-            # If the last event matches the final state, use that team directly
-            if events and events[-1].state == final_state:
-                acting_team = events[-1].performing_team
-            else:
-                acting_team = self._get_acting_team_dynamic(final_state, context, events)
-            losing_team = acting_team
-            winning_team = (
-                TeamSide.TEAM_B if losing_team == TeamSide.TEAM_A 
-                else TeamSide.TEAM_A
-            )
-            return winning_team, (
-                PointOutcome.TEAM_A_WIN if winning_team == TeamSide.TEAM_A 
-                else PointOutcome.TEAM_B_WIN
-            )
+            winning_team = TeamSide.TEAM_B if last_team == TeamSide.TEAM_A else TeamSide.TEAM_A
+            return winning_team, WIN_OUTCOME[winning_team]
         
         else:
             # Shouldn't reach here with proper terminal states
-            self.logger.warning(f"Unexpected final state: {final_state}")
-            return context.serving_team, PointOutcome.ERROR
+            self.logger.warning(f"Unexpected final state: {final_state.name}")
+            return serving_team, PointOutcome.ERROR
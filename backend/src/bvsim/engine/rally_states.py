@@ -1,58 +1,69 @@
 """Rally state definitions for beach volleyball simulation."""
 
-from enum import Enum
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
-from decimal import Decimal
+from enum import Enum, IntEnum
+from typing import Dict, List, NamedTuple, Optional, Any, Tuple
+from dataclasses import dataclass, replace
 
+import numpy as np
 
-class RallyState(str, Enum):
-    """Enumeration of all possible rally states in beach volleyball."""
+
+class RallyState(IntEnum):
+    """Enumeration of all possible rally states in beach volleyball.
+    
+    Values are dense integer codes in declaration order, so a state compares
+    and hashes as a plain ``int`` and indexes arrays directly (see
+    ``TERMINAL_MASK`` and ``VALID_TRANSITION_MASK``). Serialized output uses
+    the lower-case names in ``RALLY_STATE_NAMES``.
+    """
     
     # Serve states
-    SERVE_READY = "serve_ready"
-    SERVE_ACE = "serve_ace"
-    SERVE_ERROR = "serve_error"
-    SERVE_IN_PLAY = "serve_in_play"
+    SERVE_READY = 0
+    SERVE_ACE = 1
+    SERVE_ERROR = 2
+    SERVE_IN_PLAY = 3
     
     # Reception states  
-    RECEPTION_PERFECT = "reception_perfect"
-    RECEPTION_GOOD = "reception_good"
-    RECEPTION_POOR = "reception_poor"
-    RECEPTION_ERROR = "reception_error"
+    RECEPTION_PERFECT = 4
+    RECEPTION_GOOD = 5
+    RECEPTION_POOR = 6
+    RECEPTION_ERROR = 7
     
     # Setting states
-    SET_PERFECT = "set_perfect"
-    SET_GOOD = "set_good"
-    SET_POOR = "set_poor"
-    SET_ERROR = "set_error"
+    SET_PERFECT = 8
+    SET_GOOD = 9
+    SET_POOR = 10
+    SET_ERROR = 11
     
     # Attack states
-    ATTACK_KILL = "attack_kill"
-    ATTACK_ERROR = "attack_error"
-    ATTACK_IN_PLAY = "attack_in_play"
-    ATTACK_BLOCKED = "attack_blocked"
+    ATTACK_KILL = 12
+    ATTACK_ERROR = 13
+    ATTACK_IN_PLAY = 14
+    ATTACK_BLOCKED = 15
     
     # Defense states
-    DIG_PERFECT = "dig_perfect"
-    DIG_GOOD = "dig_good"
-    DIG_POOR = "dig_poor"
-    DIG_ERROR = "dig_error"
+    DIG_PERFECT = 16
+    DIG_GOOD = 17
+    DIG_POOR = 18
+    DIG_ERROR = 19
     
     # Block states
-    BLOCK_KILL = "block_kill"
-    BLOCK_CONTROLLED = "block_controlled"
-    BLOCK_ERROR = "block_error"
-    BLOCK_TOUCH = "block_touch"
+    BLOCK_KILL = 20
+    BLOCK_CONTROLLED = 21
+    BLOCK_ERROR = 22
+    BLOCK_TOUCH = 23
     
     # Transition states
-    TRANSITION_ATTACK = "transition_attack"
-    TRANSITION_SET = "transition_set"
+    TRANSITION_ATTACK = 24
+    TRANSITION_SET = 25
     
     # Terminal states
-    POINT_WON = "point_won"
-    POINT_LOST = "point_lost"
-    RALLY_CONTINUATION = "rally_continuation"
+    POINT_WON = 26
+    POINT_LOST = 27
+    RALLY_CONTINUATION = 28
+
+
+# Serialized name of each state, indexed by its code
+RALLY_STATE_NAMES: Tuple[str, ...] = tuple(state.name.lower() for state in RallyState)
 
 
 class ActionType(str, Enum):
@@ -80,7 +91,7 @@ class StateTransition:
     
     from_state: RallyState
     to_state: RallyState
-    probability: Decimal
+    probability: float
     action_type: ActionType
     performing_team: TeamSide
     conditions: Optional[Dict[str, Any]] = None
@@ -91,9 +102,21 @@ class StateTransition:
             raise ValueError(f"Probability must be between 0 and 1, got {self.probability}")
 
 
-@dataclass
+class ContextSnapshot(NamedTuple):
+    """The parts of a ``RallyContext`` that change during a rally, as of one event."""
+    
+    rally_length: int
+    momentum: float
+    pressure_level: float
+
+
+@dataclass(slots=True)
 class RallyContext:
-    """Context information for the current rally state."""
+    """Context information for the current rally state.
+    
+    A simulated rally advances one instance in place; events keep a
+    ``snapshot()`` of the fields that change, not the instance itself.
+    """
     
     # Current state
     current_state: RallyState
@@ -105,14 +128,23 @@ class RallyContext:
     team_b_score: int
     set_number: int
     
-    # Momentum and pressure factors
-    momentum: Decimal = Decimal("0.0")  # -1 to 1
-    pressure_level: Decimal = Decimal("0.0")  # 0 to 1
+    # Momentum and pressure factors (plain floats: they are recomputed on
+    # every rally and only ever scale probabilities)
+    momentum: float = 0.0  # -1 to 1
+    pressure_level: float = 0.0  # 0 to 1
     
     # Environmental factors
-    fatigue_team_a: Decimal = Decimal("0.0")  # 0 to 1
-    fatigue_team_b: Decimal = Decimal("0.0")  # 0 to 1
-    wind_factor: Optional[Decimal] = None  # 0 to 2
+    fatigue_team_a: float = 0.0  # 0 to 1
+    fatigue_team_b: float = 0.0  # 0 to 1
+    wind_factor: Optional[float] = None  # 0 to 2
+    
+    def copy(self) -> "RallyContext":
+        """Return an independent copy, e.g. to advance without touching the original."""
+        return replace(self)
+    
+    def snapshot(self) -> ContextSnapshot:
+        """Capture the fields that change from transition to transition."""
+        return ContextSnapshot(self.rally_length, self.momentum, self.pressure_level)
     
     def get_serving_team(self) -> TeamSide:
         """Get the currently serving team."""
@@ -135,7 +167,7 @@ class RallyContext:
 
 
 # State transition mappings
-TERMINAL_STATES = {
+TERMINAL_STATES = frozenset({
     RallyState.SERVE_ACE,
     RallyState.SERVE_ERROR,
     RallyState.RECEPTION_ERROR,
@@ -147,9 +179,9 @@ TERMINAL_STATES = {
     RallyState.BLOCK_ERROR,
     RallyState.POINT_WON,
     RallyState.POINT_LOST
-}
+})
 
-CONTINUATION_STATES = {
+CONTINUATION_STATES = frozenset({
     RallyState.SERVE_IN_PLAY,
     RallyState.RECEPTION_PERFECT,
     RallyState.RECEPTION_GOOD,
@@ -167,7 +199,7 @@ CONTINUATION_STATES = {
     RallyState.TRANSITION_ATTACK,
     RallyState.TRANSITION_SET,
     RallyState.RALLY_CONTINUATION
-}
+})
 
 # Valid state transitions mapping
 VALID_TRANSITIONS: Dict[RallyState, List[RallyState]] = {
@@ -277,6 +309,21 @@ VALID_TRANSITIONS: Dict[RallyState, List[RallyState]] = {
     ]
 }
 
+# Read-only copies handed out by ``get_valid_next_states``
+_VALID_NEXT_STATES: Dict[RallyState, Tuple[RallyState, ...]] = {
+    state: tuple(next_states) for state, next_states in VALID_TRANSITIONS.items()
+}
+
+
+# The same sets as masks indexed by state code, for array and compiled code.
+# Python callers keep the sets: membership beats a NumPy scalar index there.
+TERMINAL_MASK = np.array([state in TERMINAL_STATES for state in RallyState], dtype=np.bool_)
+CONTINUATION_MASK = np.array([state in CONTINUATION_STATES for state in RallyState], dtype=np.bool_)
+VALID_TRANSITION_MASK = np.array(
+    [[next_state in VALID_TRANSITIONS.get(state, ()) for next_state in RallyState] for state in RallyState],
+    dtype=np.bool_
+)
+
 
 def is_terminal_state(state: RallyState) -> bool:
     """Check if a state is terminal (ends the rally)."""
@@ -288,6 +335,6 @@ def is_continuation_state(state: RallyState) -> bool:
     return state in CONTINUATION_STATES
 
 
-def get_valid_next_states(current_state: RallyState) -> List[RallyState]:
-    """Get list of valid next states from current state."""
-    return VALID_TRANSITIONS.get(current_state, [])
+def get_valid_next_states(current_state: RallyState) -> Tuple[RallyState, ...]:
+    """Get the valid next states from current state."""
+    return _VALID_NEXT_STATES.get(current_state, ())
@@ -1,15 +1,43 @@
 """Main FastAPI application entry point."""
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from datetime import datetime
+from fastapi import FastAPI, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
 import os
+import time
 
-from .core.database import check_database_connection
+# orjson is optional; without it responses are encoded with the stdlib json
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as DefaultResponse
+except ImportError:
+    DefaultResponse = JSONResponse
+
+from .core.cache import cached, init_response_cache
+from .core.database import REDIS_URL, check_database_ready, pool_status
 from .schemas.common import HealthCheck
 from .api.rally import router as rally_router
-from .api.monte_carlo import router as monte_carlo_router
+from .api.monte_carlo import monte_carlo_engine, router as monte_carlo_router
+
+# Process start, for uptime; monotonic so clock changes do not skew it
+START_TIME = time.monotonic()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Connect the response cache to Redis on startup and stop the
+    simulation worker pools on shutdown."""
+    await init_response_cache(REDIS_URL)
+    yield
+    await monte_carlo_engine.aclose()
+
 
 app = FastAPI(
+    lifespan=lifespan,
+    default_response_class=DefaultResponse,
     title="Beach Volleyball Simulator API",
     description="API for beach volleyball point simulation and statistical analysis",
     version="1.0.0",
@@ -26,6 +54,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Analytics payloads are long lists of numbers and compress well
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 
 @app.get("/", response_model=dict)
 async def root():
@@ -38,21 +69,47 @@ async def root():
     }
 
 
+@app.get("/live")
+async def liveness():
+    """Liveness probe: the process is serving requests. Touches nothing else."""
+    return {"status": "ok"}
+
+
+@app.get("/ready")
+async def readiness(response: Response):
+    """Readiness probe: the database is reachable.
+    
+    The ping result is reused for a couple of seconds, so frequent probes
+    do not load the database.
+    """
+    if await check_database_ready():
+        return {"status": "ready"}
+    response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {"status": "not_ready"}
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
-    db_connected = await check_database_connection()
+    db_connected = await check_database_ready()
     
     return {
         "status": "healthy" if db_connected else "unhealthy",
-        "timestamp": "2025-07-10T15:45:00Z",
+        "timestamp": datetime.utcnow().isoformat() + "Z",
         "version": "1.0.0",
         "database_connected": db_connected,
-        "uptime_seconds": 0.0,
+        "uptime_seconds": time.monotonic() - START_TIME,
     }
 
 
+@app.get("/metrics")
+async def metrics():
+    """Connection pool metrics; never cached."""
+    return {"database_pool": pool_status()}
+
+
 @app.get("/api/info")
+@cached(expire=3600)
 async def api_info():
     """Get API information."""
     return {
@@ -92,5 +149,7 @@ app.include_router(analytics_router)
 # app.include_router(simulations.router, prefix="/api/simulations", tags=["simulations"])
 
 if __name__ == "__main__":
+    # Single-process development server; production runs gunicorn with
+    # gunicorn_conf.py. Reloading needs the app as an import string.
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
+    uvicorn.run("bvsim.main:app", host="0.0.0.0", port=8000, reload=True)
@@ -1,11 +1,19 @@
 """Models package."""
 
-from .database import Base, TeamStatistics, Simulation, SimulationPoint, ImportanceAnalysis
+from .database import (
+    Base, TeamStatistics, Simulation, SimulationPoint, ImportanceAnalysis, simulation_detail_query,
+    insert_simulation_points, insert_simulation_points_async,
+    top_importances_query
+)
 
 __all__ = [
     "Base",
     "TeamStatistics", 
     "Simulation",
     "SimulationPoint",
-    "ImportanceAnalysis"
+    "ImportanceAnalysis",
+    "simulation_detail_query",
+    "insert_simulation_points",
+    "insert_simulation_points_async",
+    "top_importances_query"
 ]
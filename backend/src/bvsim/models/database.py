@@ -1,12 +1,58 @@
 """Database models for the Beach Volleyball Simulator."""
 
-from sqlalchemy import Column, Integer, String, DECIMAL, DateTime, ForeignKey, Text, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    Column, Integer, String, DECIMAL, DateTime, ForeignKey, Text, Boolean, Index, LargeBinary, Select, insert, select
+)
+from sqlalchemy.orm import Session, joinedload, relationship, selectinload
 from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.types import TypeDecorator
 from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Mapping, Optional
+import json
 
 from ..core.database import Base
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# Points written per executemany round trip
+POINT_INSERT_BATCH_SIZE = 1000
+
+# msgpack is optional; without it rally states are packed as compact JSON
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+
+class PackedRallyStates(TypeDecorator):
+    """Rally progression stored as msgpack bytes.
+    
+    Reads also accept UTF-8 JSON bytes, which is what rows migrated from the
+    old JSONB column and rows written without msgpack hold.
+    """
+    
+    impl = LargeBinary
+    cache_ok = True
+    
+    def process_bind_param(self, value: Any, dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        if MSGPACK_AVAILABLE:
+            return msgpack.packb(value, use_bin_type=True)
+        return json.dumps(value, separators=(",", ":")).encode("utf-8")
+    
+    def process_result_value(self, value: Optional[bytes], dialect) -> Any:
+        if value is None:
+            return None
+        # msgpack never starts an array or map with a JSON opening byte
+        if value[:1] in (b"[", b"{"):
+            return json.loads(value)
+        if not MSGPACK_AVAILABLE:
+            raise ValueError("Rally states are msgpack-encoded but msgpack is not installed")
+        return msgpack.unpackb(value, raw=False)
+
 
 class TeamStatistics(Base):
     """Team fundamental statistics for simulation input."""
@@ -85,17 +131,23 @@ class Simulation(Base):
     # Configuration JSON
     config = Column(JSONB, nullable=True)
     
-    # Relationships
+    # Relationships; the large collections raise on lazy access so that
+    # queries load them up front (see simulation_detail_query)
     team_a = relationship("TeamStatistics", foreign_keys=[team_a_id], back_populates="simulations_as_team_a")
     team_b = relationship("TeamStatistics", foreign_keys=[team_b_id], back_populates="simulations_as_team_b")
-    points = relationship("SimulationPoint", back_populates="simulation", cascade="all, delete-orphan")
-    analyses = relationship("ImportanceAnalysis", back_populates="simulation", cascade="all, delete-orphan")
+    points = relationship("SimulationPoint", back_populates="simulation", cascade="all, delete-orphan", lazy="raise")
+    analyses = relationship("ImportanceAnalysis", back_populates="simulation", cascade="all, delete-orphan", lazy="raise")
 
 
 class SimulationPoint(Base):
     """Individual point results from simulation."""
     
     __tablename__ = "simulation_points"
+    __table_args__ = (
+        # Points of one simulation by winner, and in point order
+        Index("ix_point_sim_winner", "simulation_id", "winner_team"),
+        Index("ix_point_sim_num", "simulation_id", "point_number"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     simulation_id = Column(Integer, ForeignKey("simulations.id"), nullable=False, index=True)
@@ -105,8 +157,9 @@ class SimulationPoint(Base):
     winner_team = Column(String(1), nullable=False)  # 'A' or 'B'
     serving_team = Column(String(1), nullable=False)  # 'A' or 'B'
     
-    # Rally progression stored as JSON
-    rally_states = Column(JSONB, nullable=False)
+    # Rally progression packed as bytes; count queries use total_contacts
+    # and never decode it
+    rally_states = Column(PackedRallyStates, nullable=False)
     total_contacts = Column(Integer, nullable=False, default=0)
     rally_duration_ms = Column(Integer, nullable=True)
     
@@ -118,6 +171,10 @@ class ImportanceAnalysis(Base):
     """Feature importance analysis results."""
     
     __tablename__ = "importance_analyses"
+    __table_args__ = (
+        # Ranked results of one simulation's analysis method
+        Index("ix_ia_sim_method_rank", "simulation_id", "method", "rank"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     simulation_id = Column(Integer, ForeignKey("simulations.id"), nullable=False, index=True)
@@ -144,3 +201,68 @@ class ImportanceAnalysis(Base):
     
     # Relationship
     simulation = relationship("Simulation", back_populates="analyses")
+
+
+def top_importances_query(simulation_id: int) -> Select:
+    """Select a simulation's top-ranked features, best first."""
+    return (
+        select(ImportanceAnalysis)
+        .where(ImportanceAnalysis.simulation_id == simulation_id, ImportanceAnalysis.rank <= 3)
+        .order_by(ImportanceAnalysis.rank, ImportanceAnalysis.importance_score.desc())
+    )
+
+
+def simulation_detail_query(simulation_id: int) -> Select:
+    """Select a simulation with its teams joined and its points loaded.
+    
+    The points come in one extra ``IN`` query however many there are, so
+    the whole detail costs two round trips.
+    """
+    return (
+        select(Simulation)
+        .where(Simulation.id == simulation_id)
+        .options(
+            joinedload(Simulation.team_a),
+            joinedload(Simulation.team_b),
+            selectinload(Simulation.points)
+        )
+    )
+
+
+def _point_batches(simulation_id: int, points: Iterable[Mapping[str, Any]],
+                   batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Group point mappings into batches, each row carrying the simulation's key."""
+    batch: List[Dict[str, Any]] = []
+    for point in points:
+        batch.append({**point, "simulation_id": simulation_id})
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def insert_simulation_points(session: Session, simulation_id: int, points: Iterable[Mapping[str, Any]],
+                             batch_size: int = POINT_INSERT_BATCH_SIZE) -> int:
+    """Insert a simulation's points in executemany batches.
+    
+    Rows are set against ``simulation_id`` directly instead of going through
+    ``Simulation.points``, so no ORM objects are built. Returns the number
+    of points inserted; the caller commits.
+    """
+    inserted = 0
+    for batch in _point_batches(simulation_id, points, batch_size):
+        session.execute(insert(SimulationPoint), batch)
+        inserted += len(batch)
+    return inserted
+
+
+async def insert_simulation_points_async(session: "AsyncSession", simulation_id: int,
+                                         points: Iterable[Mapping[str, Any]],
+                                         batch_size: int = POINT_INSERT_BATCH_SIZE) -> int:
+    """Async counterpart of :func:`insert_simulation_points`."""
+    inserted = 0
+    for batch in _point_batches(simulation_id, points, batch_size):
+        await session.execute(insert(SimulationPoint), batch)
+        inserted += len(batch)
+    return inserted
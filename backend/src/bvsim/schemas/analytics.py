@@ -1,6 +1,6 @@
 """Pydantic schemas for analytics and importance analysis."""
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict, Any, Union
 from decimal import Decimal
 from datetime import datetime
@@ -8,6 +8,9 @@ from enum import Enum
 
 from .team_statistics import TeamStatisticsBase
 
+# Per-item results are built by the hundred and never changed afterwards
+RESULT_ITEM_CONFIG = ConfigDict(frozen=True, extra="forbid")
+
 
 class AnalysisMethod(str, Enum):
     """Analysis method enumeration."""
@@ -40,6 +43,8 @@ class AnalysisType(str, Enum):
 
 class SHAPValue(BaseModel):
     """SHAP value for a specific feature in a prediction."""
+    model_config = RESULT_ITEM_CONFIG
+    
     feature_name: str
     shap_value: Decimal
     base_value: Decimal
@@ -62,18 +67,33 @@ class SHAPAnalysisResult(BaseModel):
 
 
 class FeatureImportance(BaseModel):
-    """Individual feature importance result."""
+    """Individual feature importance result.
+    
+    Scores are statistical estimates rather than exact quantities, so they
+    are plain floats; the database keeps its DECIMAL columns.
+    """
+    
+    model_config = ConfigDict(**RESULT_ITEM_CONFIG, json_schema_extra={
+        "example": {
+            "statistic_name": "attack_kill_percentage",
+            "feature_category": "attack",
+            "importance_score": 0.1842,
+            "marginal_impact": 0.0184,
+            "rank": 1,
+            "interpretation": "Attack Kill Percentage is a critical factor for winning"
+        }
+    })
     
     statistic_name: str = Field(..., description="Name of the statistic")
     feature_category: FeatureCategory = Field(..., description="Category of the feature")
-    importance_score: Decimal = Field(..., description="Importance score (0-1)")
-    marginal_impact: Decimal = Field(
+    importance_score: float = Field(..., ge=0.0, description="Importance score (0-1)")
+    marginal_impact: float = Field(
         ..., description="Marginal impact on win probability"
     )
-    confidence_interval_lower: Optional[Decimal] = Field(
+    confidence_interval_lower: Optional[float] = Field(
         None, description="Lower bound of confidence interval"
     )
-    confidence_interval_upper: Optional[Decimal] = Field(
+    confidence_interval_upper: Optional[float] = Field(
         None, description="Upper bound of confidence interval"
     )
     rank: Optional[int] = Field(None, description="Importance ranking")
@@ -97,12 +117,12 @@ class ImportanceAnalysisResult(BaseModel):
     
     # Analysis metadata
     total_features_analyzed: int = Field(..., description="Total features analyzed")
-    analysis_time_seconds: Decimal = Field(..., description="Analysis execution time")
+    analysis_time_seconds: float = Field(..., description="Analysis execution time")
     sample_size: int = Field(..., description="Sample size used for analysis")
     
     # Model performance metrics
-    model_accuracy: Optional[Decimal] = Field(None, description="Model accuracy")
-    model_auc: Optional[Decimal] = Field(None, description="Model AUC score")
+    model_accuracy: Optional[float] = Field(None, description="Model accuracy")
+    model_auc: Optional[float] = Field(None, description="Model AUC score")
     
     # Analysis configuration
     analysis_config: Optional[Dict[str, Any]] = Field(
@@ -117,7 +137,7 @@ class SensitivityAnalysisRequest(BaseModel):
     
     simulation_id: int = Field(..., description="Source simulation ID")
     statistic_name: str = Field(..., description="Statistic to analyze")
-    change_amounts: List[Decimal] = Field(
+    change_amounts: List[float] = Field(
         ..., description="List of change amounts to test (e.g., [1.0, 2.0, 5.0])"
     )
     change_type: str = Field(
@@ -129,13 +149,15 @@ class SensitivityAnalysisRequest(BaseModel):
 class SensitivityDataPoint(BaseModel):
     """Single data point in sensitivity analysis."""
     
-    change_amount: Decimal = Field(..., description="Amount of change applied")
-    baseline_value: Decimal = Field(..., description="Original statistic value")
-    new_value: Decimal = Field(..., description="Modified statistic value")
-    baseline_win_probability: Decimal = Field(..., description="Original win probability")
-    new_win_probability: Decimal = Field(..., description="New win probability")
-    absolute_change: Decimal = Field(..., description="Absolute change in win probability")
-    relative_change: Decimal = Field(..., description="Relative change in win probability")
+    model_config = RESULT_ITEM_CONFIG
+    
+    change_amount: float = Field(..., description="Amount of change applied")
+    baseline_value: float = Field(..., description="Original statistic value")
+    new_value: float = Field(..., description="Modified statistic value")
+    baseline_win_probability: float = Field(..., ge=0.0, le=1.0, description="Original win probability")
+    new_win_probability: float = Field(..., ge=0.0, le=1.0, description="New win probability")
+    absolute_change: float = Field(..., description="Absolute change in win probability")
+    relative_change: float = Field(..., description="Relative change in win probability")
 
 
 class SensitivityAnalysisResult(BaseModel):
@@ -151,15 +173,15 @@ class SensitivityAnalysisResult(BaseModel):
     )
     
     # Summary statistics
-    average_marginal_impact: Decimal = Field(
+    average_marginal_impact: float = Field(
         ..., description="Average marginal impact per unit change"
     )
-    elasticity: Decimal = Field(
+    elasticity: float = Field(
         ..., description="Elasticity measure (% change in output / % change in input)"
     )
     
     # Analysis metadata
-    analysis_time_seconds: Decimal = Field(..., description="Analysis execution time")
+    analysis_time_seconds: float = Field(..., description="Analysis execution time")
     created_at: datetime = Field(..., description="Analysis creation time")
 
 
@@ -186,9 +208,9 @@ class TeamComparisonResult(BaseModel):
     team_b_name: str
     
     # Win probability comparison
-    team_a_win_probability: Decimal
-    team_b_win_probability: Decimal
-    probability_difference: Decimal
+    team_a_win_probability: float = Field(..., ge=0.0, le=1.0)
+    team_b_win_probability: float = Field(..., ge=0.0, le=1.0)
+    probability_difference: float
     
     # Key differentiating factors
     top_advantages_team_a: List[FeatureImportance]
@@ -266,6 +288,8 @@ class AdvancedAnalyticsRequest(BaseModel):
 
 class FeatureImpactAssessment(BaseModel):
     """Comprehensive impact assessment for a feature."""
+    model_config = RESULT_ITEM_CONFIG
+    
     feature_name: str
     category: FeatureCategory
     current_value: Decimal
@@ -17,8 +17,9 @@ Match-level schemas for beach volleyball simulation.
 Defines data models for matches, sets, and tournaments.
 """
 
-from pydantic import BaseModel, Field, field_validator, ConfigDict
-from typing import List, Optional, Dict, Any, Annotated
+from pydantic import BaseModel, Field, field_validator, model_validator, ConfigDict
+from typing import List, Optional, Dict, Any, Annotated, Deque
+from collections import deque
 from enum import Enum
 from datetime import datetime
 from decimal import Decimal
@@ -153,13 +154,36 @@ class TournamentResult(BaseModel):
     bracket_size: int
 
 
+RECENT_RALLY_WINDOW = 5
+
+
 class MomentumState(BaseModel):
     """Current momentum state in a match."""
     team_a_momentum: Decimal = Field(default=Decimal('0.0'), ge=Decimal('-1.0'), le=Decimal('1.0'))
     team_b_momentum: Decimal = Field(default=Decimal('0.0'), ge=Decimal('-1.0'), le=Decimal('1.0'))
     consecutive_points_a: int = Field(default=0, ge=0)
     consecutive_points_b: int = Field(default=0, ge=0)
-    recent_rally_outcomes: List[str] = Field(default_factory=list, max_length=5)
+    # Ring buffer of the last five rally winners; the win counters mirror its
+    # contents so momentum never has to rescan it.
+    recent_rally_outcomes: Deque[str] = Field(
+        default_factory=lambda: deque(maxlen=RECENT_RALLY_WINDOW),
+        max_length=RECENT_RALLY_WINDOW
+    )
+    recent_wins_a: int = Field(default=0, ge=0)
+    recent_wins_b: int = Field(default=0, ge=0)
+    
+    @field_validator('recent_rally_outcomes')
+    @classmethod
+    def bound_recent_outcomes(cls, v: Deque[str]) -> Deque[str]:
+        if v.maxlen != RECENT_RALLY_WINDOW:
+            v = deque(v, maxlen=RECENT_RALLY_WINDOW)
+        return v
+    
+    @model_validator(mode='after')
+    def count_recent_wins(self) -> 'MomentumState':
+        self.recent_wins_a = self.recent_rally_outcomes.count('A')
+        self.recent_wins_b = self.recent_rally_outcomes.count('B')
+        return self
 
 
 class PressureSituation(BaseModel):
@@ -1,11 +1,13 @@
 """Pydantic schemas for team statistics."""
 
-from pydantic import BaseModel, Field, field_validator, model_validator
-from typing import Optional, Self, List, Dict, Any
+from pydantic import BaseModel, Field, PrivateAttr, field_validator, model_validator
+from typing import Optional, Self, List, Dict, Any, Tuple
 from decimal import Decimal
 from datetime import datetime
 from enum import Enum
 
+import numpy as np
+
 
 class TeamStatisticsBase(BaseModel):
     """Base schema for team statistics."""
@@ -90,6 +92,9 @@ class TeamStatisticsBase(BaseModel):
         description="Percentage of blocking faults"
     )
     
+    # Bumped whenever a statistic is reassigned; see ``stats_version``
+    _version: int = PrivateAttr(default=0)
+    
     @model_validator(mode='after')
     def validate_percentages(self) -> Self:
         """Validate all percentage relationships."""
@@ -116,6 +121,32 @@ class TeamStatisticsBase(BaseModel):
             raise ValueError("Attack kill and error percentages cannot exceed 100%")
         
         return self
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name in TEAM_STATISTIC_FIELDS:
+            self._version += 1
+    
+    @property
+    def stats_version(self) -> int:
+        """Number of times a statistic has been reassigned on this instance.
+        
+        Caches keyed on the instance's identity include it so that in-place
+        edits invalidate them.
+        """
+        # Read the private store directly; ``self._version`` goes through
+        # BaseModel.__getattr__, which is slow enough to matter per rally
+        return self.__pydantic_private__["_version"]
+    
+    def to_array(self) -> np.ndarray:
+        """Return the statistics as a flat float64 vector in ``TEAM_STATISTIC_FIELDS`` order."""
+        return np.array([getattr(self, name) for name in TEAM_STATISTIC_FIELDS], dtype=np.float64)
+
+
+# Canonical order of the numeric statistics returned by ``TeamStatisticsBase.to_array``
+TEAM_STATISTIC_FIELDS: Tuple[str, ...] = tuple(
+    name for name, info in TeamStatisticsBase.model_fields.items() if info.annotation is Decimal
+)
 
 
 class TeamStatisticsCreate(TeamStatisticsBase):
@@ -0,0 +1,9 @@
+"""Gunicorn worker classes for serving the API."""
+
+from uvicorn.workers import UvicornWorker
+
+
+class UvloopWorker(UvicornWorker):
+    """Uvicorn worker pinned to uvloop and httptools, without access logs."""
+
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools", "access_log": False}
@@ -87,7 +87,7 @@ def test_single_rally():
     print(f"  Winner: {result.winner}")
     print(f"  Point Outcome: {result.point_outcome}")
     print(f"  Rally Length: {result.rally_length}")
-    print(f"  Final State: {result.final_state}")
+    print(f"  Final State: {result.final_state.name if result.final_state is not None else None}")
     print(f"  Total Probability: {result.total_probability}")
     print(f"  Team A Actions: {result.team_a_actions}")
     print(f"  Team B Actions: {result.team_b_actions}")
@@ -99,7 +99,7 @@ def test_single_rally():
     
     print(f"\nFirst 5 Events:")
     for i, event in enumerate(result.events[:5]):
-        print(f"  {i+1}. {event.performing_team} -> {event.state} (p={event.probability:.3f})")
+        print(f"  {i+1}. {event.performing_team} -> {event.state.name} (p={event.probability:.3f})")
     
     return result
 
@@ -179,7 +179,7 @@ def test_probability_engine():
     
     print(f"Serve probabilities for strong team:")
     for state, prob in probs.transitions.items():
-        print(f"  {state}: {prob:.3f}")
+        print(f"  {state.name}: {prob:.3f}")
     
     # Test with weaker team
     probs_weak = engine.calculate_transition_probabilities(
@@ -188,7 +188,7 @@ def test_probability_engine():
     
     print(f"\nServe probabilities for weaker team:")
     for state, prob in probs_weak.transitions.items():
-        print(f"  {state}: {prob:.3f}")
+        print(f"  {state.name}: {prob:.3f}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,38 @@
+"""
+Shared fixtures for the backend tests.
+"""
+
+from decimal import Decimal
+from typing import Callable
+
+import pytest
+
+from bvsim.schemas.team_statistics import TeamStatisticsBase
+
+
+@pytest.fixture
+def make_team() -> Callable[[str, str, str], TeamStatisticsBase]:
+    """Factory for team statistics that differ only in ace and kill percentage."""
+    def make(name: str, ace: str, kill: str) -> TeamStatisticsBase:
+        return TeamStatisticsBase(
+            name=name,
+            service_ace_percentage=Decimal(ace),
+            service_error_percentage=Decimal('8.0'),
+            serve_success_rate=Decimal('85.0'),
+            perfect_pass_percentage=Decimal('35.0'),
+            good_pass_percentage=Decimal('45.0'),
+            poor_pass_percentage=Decimal('15.0'),
+            reception_error_percentage=Decimal('5.0'),
+            assist_percentage=Decimal('55.0'),
+            ball_handling_error_percentage=Decimal('3.0'),
+            attack_kill_percentage=Decimal(kill),
+            attack_error_percentage=Decimal('15.0'),
+            hitting_efficiency=Decimal('0.30'),
+            first_ball_kill_percentage=Decimal('12.0'),
+            dig_percentage=Decimal('35.0'),
+            block_kill_percentage=Decimal('10.0'),
+            controlled_block_percentage=Decimal('20.0'),
+            blocking_error_percentage=Decimal('4.0')
+        )
+
+    return make
@@ -7,11 +7,11 @@ import numpy as np
 from decimal import Decimal
 from unittest.mock import AsyncMock, patch
 
-from src.bvsim.engine.advanced_analytics import AdvancedAnalyticsEngine
-from src.bvsim.schemas.analytics import (
+from bvsim.engine.advanced_analytics import AdvancedAnalyticsEngine, sensitivity_data_points
+from bvsim.schemas.analytics import (
     AdvancedAnalyticsRequest, AnalysisType, ScenarioAnalysisRequest
 )
-from src.bvsim.schemas.team_statistics import TeamStatisticsBase
+from bvsim.schemas.team_statistics import TeamStatisticsBase
 
 
 @pytest.fixture
@@ -150,6 +150,20 @@ class TestAdvancedAnalyticsEngine:
         assert result.team_a_analytics is not None
         # Sensitivity results would be in the analytics response
     
+    @pytest.mark.asyncio
+    async def test_sensitivity_win_rates_from_match_batches(self, analytics_engine, sample_team_a, sample_team_b):
+        """Test sweep win rates are batch estimates that follow the statistic."""
+        values = [Decimal('35.0'), Decimal('45.0'), Decimal('55.0')]
+        
+        results = await analytics_engine._analyze_sensitivity(
+            sample_team_a, sample_team_b, {"attack_kill_percentage": values}, random_seed=5
+        )
+        
+        win_rates = [point['win_rate'] for point in results["attack_kill_percentage"]]
+        assert all(0.0 < rate < 1.0 for rate in win_rates)
+        assert win_rates == sorted(win_rates)
+        assert results["attack_kill_percentage"][1]['absolute_change'] == pytest.approx(0.0)
+    
     @pytest.mark.asyncio
     async def test_comprehensive_analysis(self, analytics_engine, sample_team_a, sample_team_b):
         """Test all analysis types together."""
@@ -267,7 +281,7 @@ class TestAdvancedAnalyticsEngine:
     
     def test_feature_category_mapping(self, analytics_engine):
         """Test feature category mapping."""
-        from src.bvsim.schemas.analytics import FeatureCategory
+        from bvsim.schemas.analytics import FeatureCategory
         
         category = analytics_engine._get_feature_category("team_a_service_ace_percentage")
         assert category == FeatureCategory.SERVE
@@ -286,6 +300,26 @@ class TestAdvancedAnalyticsEngine:
         assert 0 <= margin <= 1
         assert isinstance(margin, float)
     
+    def test_sensitivity_data_points(self):
+        """Test sensitivity data points are derived from one sweep."""
+        points, marginal_impact, elasticity = sensitivity_data_points(
+            10.0, 0.5, [10.0, 12.0, 15.0], [0.5, 0.55, 0.6]
+        )
+        
+        assert [p.change_amount for p in points] == [0.0, 2.0, 5.0]
+        assert points[1].absolute_change == pytest.approx(0.05)
+        assert points[1].relative_change == pytest.approx(0.1)
+        # Unchanged values are left out of the averages
+        assert marginal_impact == pytest.approx((0.025 + 0.02) / 2)
+        assert elasticity == pytest.approx((0.5 + 0.4) / 2)
+    
+    def test_sensitivity_data_points_zero_baseline(self):
+        """Test a zero baseline win probability gives zero relative change."""
+        points, _, elasticity = sensitivity_data_points(10.0, 0.0, [12.0], [1.0])
+        
+        assert points[0].relative_change == 0.0
+        assert elasticity == 0.0
+    
     @pytest.mark.asyncio
     async def test_different_model_types(self, analytics_engine, sample_team_a, sample_team_b):
         """Test different ML model types."""
@@ -6,8 +6,8 @@ import pytest
 from fastapi.testclient import TestClient
 from decimal import Decimal
 
-from src.bvsim.main import app
-from src.bvsim.schemas.team_statistics import TeamStatisticsBase
+from bvsim.main import app
+from bvsim.schemas.team_statistics import TeamStatisticsBase
 
 
 @pytest.fixture
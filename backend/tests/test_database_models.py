@@ -0,0 +1,147 @@
+"""
+Tests for the database models' relationship loading.
+"""
+
+import pytest
+from decimal import Decimal
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from bvsim.models.database import (
+    Base, TeamStatistics, Simulation, SimulationPoint, PackedRallyStates, simulation_detail_query,
+    insert_simulation_points, ImportanceAnalysis, top_importances_query
+)
+from bvsim.schemas.team_statistics import TEAM_STATISTIC_FIELDS
+
+
+@compiles(JSONB, "sqlite")
+def _compile_jsonb_for_sqlite(type_, compiler, **kw):
+    """Store the PostgreSQL JSONB columns as SQLite JSON."""
+    return "JSON"
+
+
+def _team(name: str) -> TeamStatistics:
+    return TeamStatistics(name=name, **{field: Decimal('10.0') for field in TEAM_STATISTIC_FIELDS})
+
+
+@pytest.fixture
+def engine():
+    """In-memory database holding one simulation with 50 points."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        simulation = Simulation(team_a=_team("Team A"), team_b=_team("Team B"), num_points=50)
+        simulation.points = [
+            SimulationPoint(point_number=i, winner_team="A" if i % 2 else "B", serving_team="A",
+                            rally_states=["serve_ready", "serve_ace"], total_contacts=1)
+            for i in range(50)
+        ]
+        session.add(simulation)
+        session.commit()
+    yield engine
+    engine.dispose()
+
+
+def _count_queries(engine):
+    """Count the statements executed on ``engine`` from now on."""
+    statements = []
+    event.listen(engine, "before_cursor_execute",
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    return statements
+
+
+class TestSimulationLoading:
+    """Test that simulations load their relationships without N+1 queries."""
+
+    def test_detail_query_loads_simulation_in_two_queries(self, engine):
+        """Test the detail query fetches teams and points in at most two round trips."""
+        with Session(engine) as session:
+            statements = _count_queries(engine)
+            simulation = session.scalars(simulation_detail_query(1)).unique().one()
+
+            assert simulation.team_a.name == "Team A"
+            assert simulation.team_b.name == "Team B"
+            assert len(simulation.points) == 50
+            assert sum(point.total_contacts for point in simulation.points) == 50
+            assert len(statements) <= 2
+
+    def test_lazy_points_access_raises(self, engine):
+        """Test points must be loaded explicitly rather than lazily."""
+        with Session(engine) as session:
+            simulation = session.scalars(select(Simulation)).one()
+
+            with pytest.raises(InvalidRequestError):
+                simulation.points
+
+            with pytest.raises(InvalidRequestError):
+                simulation.analyses
+
+
+class TestPackedRallyStates:
+    """Test rally states are stored as packed bytes."""
+
+    def test_rally_states_round_trip(self, engine):
+        """Test rally states read back as the list that was written."""
+        with Session(engine) as session:
+            point = session.scalars(select(SimulationPoint).limit(1)).one()
+
+            assert point.rally_states == ["serve_ready", "serve_ace"]
+
+    def test_rally_states_stored_as_bytes(self, engine):
+        """Test the column holds bytes rather than JSON text."""
+        with engine.connect() as connection:
+            raw = connection.exec_driver_sql("SELECT rally_states FROM simulation_points LIMIT 1").scalar_one()
+
+        assert isinstance(raw, bytes)
+
+    def test_reads_json_encoded_rows(self):
+        """Test rows migrated from the JSON column still decode."""
+        packed = PackedRallyStates()
+
+        assert packed.process_result_value(b'["serve_ready","serve_error"]', None) == ["serve_ready", "serve_error"]
+
+
+class TestInsertSimulationPoints:
+    """Test points are written in batches."""
+
+    def test_points_inserted_in_batches(self, engine):
+        """Test 2500 points go in as three executemany statements."""
+        points = [
+            {"point_number": 50 + i, "winner_team": "A", "serving_team": "B",
+             "rally_states": ["serve_ready", "serve_error"], "total_contacts": 1}
+            for i in range(2500)
+        ]
+        with Session(engine) as session:
+            statements = _count_queries(engine)
+            inserted = insert_simulation_points(session, 1, points)
+            session.commit()
+
+            assert inserted == 2500
+            assert len([s for s in statements if s.startswith("INSERT")]) <= 3
+
+            simulation = session.scalars(simulation_detail_query(1)).unique().one()
+            assert len(simulation.points) == 2550
+            last_point = max(simulation.points, key=lambda point: point.point_number)
+            assert last_point.rally_states == ["serve_ready", "serve_error"]
+
+
+class TestTopImportances:
+    """Test the top importances lookup behind the analytics overview."""
+
+    def test_table_fallback_returns_top_three_ranks(self, engine):
+        """Test ranks beyond three are left out and results come best first."""
+        with Session(engine) as session:
+            session.add_all([
+                ImportanceAnalysis(simulation_id=1, statistic_name=f"stat_{rank}", feature_category="attack",
+                                   importance_score=Decimal(str(1 / rank)), marginal_impact=Decimal("0.01"),
+                                   method="shap", rank=rank)
+                for rank in (4, 2, 1, 3)
+            ])
+            session.commit()
+
+            rows = session.scalars(top_importances_query(1)).all()
+
+            assert [row.rank for row in rows] == [1, 2, 3]
@@ -0,0 +1,120 @@
+"""
+Tests for the simulation paths of the Monte Carlo engine.
+"""
+
+from collections import Counter
+from decimal import Decimal
+
+import pytest
+
+from bvsim.engine.monte_carlo import MonteCarloEngine, SimulationBatch, MatchFormat
+from bvsim.engine.probability_engine import ProbabilityEngine
+from bvsim.engine.rally_kernels import NUMBA_AVAILABLE, build_rally_tables
+from bvsim.engine.rally_states import RallyState
+
+
+SEED = 11
+
+
+@pytest.fixture
+def make_batch(make_team):
+    """Factory for best-of-3 batches between two fixed teams."""
+    def make(num_simulations: int, antithetic: bool = False) -> SimulationBatch:
+        return SimulationBatch(
+            num_simulations=num_simulations,
+            team_a_stats=make_team("Team A", "12.0", "50.0"),
+            team_b_stats=make_team("Team B", "8.0", "40.0"),
+            match_format=MatchFormat.BEST_OF_3,
+            antithetic=antithetic
+        )
+
+    return make
+
+
+def _summary(batch: SimulationBatch):
+    tables = build_rally_tables(batch.team_a_stats, batch.team_b_stats)
+    return MonteCarloEngine._run_matches_sync(batch.num_simulations, batch, SEED, tables)
+
+
+class TestSimulationPaths:
+    """Test the kernel, vectorized and Python paths agree."""
+
+    @pytest.mark.skipif(not NUMBA_AVAILABLE, reason="kernels fall back to the vectorized path")
+    def test_kernel_matches_vectorized(self, make_batch):
+        """Test the compiled kernels and the NumPy batch give the same win probability."""
+        batch = make_batch(4000)
+        tables = build_rally_tables(batch.team_a_stats, batch.team_b_stats)
+
+        kernel = MonteCarloEngine._run_matches_sync(4000, batch, SEED, tables)
+        vectorized = MonteCarloEngine._run_matches_vectorized(4000, batch, SEED, tables)
+
+        assert kernel["a_won"].mean() == pytest.approx(vectorized["a_won"].mean(), abs=0.03)
+
+    def test_python_matches_vectorized(self, make_batch):
+        """Test the pure-Python rally simulator gives the same win probability."""
+        batch = make_batch(4000)
+        tables = build_rally_tables(batch.team_a_stats, batch.team_b_stats)
+
+        python = MonteCarloEngine._run_matches_sync(600, batch, SEED)
+        vectorized = MonteCarloEngine._run_matches_vectorized(4000, batch, SEED, tables)
+
+        assert python["a_won"].mean() == pytest.approx(vectorized["a_won"].mean(), abs=0.06)
+
+
+class TestStatistics:
+    """Test the aggregation of per-match summary rows."""
+
+    def test_antithetic_interval_not_wider(self, make_batch):
+        """Test the paired-t interval of antithetic pairs is no wider than the plain one."""
+        batch = make_batch(4000, antithetic=True)
+        summary = _summary(batch)
+        engine = MonteCarloEngine(max_workers=1)
+
+        paired = engine._calculate_statistics(summary, batch, 0.0, paired=True).confidence_interval_95
+        plain = engine._calculate_statistics(summary, batch, 0.0).confidence_interval_95
+
+        assert paired[1] - paired[0] <= plain[1] - plain[0]
+
+    @pytest.mark.asyncio
+    async def test_detailed_batch_not_paired(self, make_batch):
+        """Test an antithetic batch of independent detailed matches keeps the plain interval."""
+        batch = make_batch(40, antithetic=True)
+        batch.include_detailed_results = True
+        batch.random_seed_base = SEED
+        engine = MonteCarloEngine(max_workers=1)
+
+        try:
+            results = await engine.run_simulation_batch(batch)
+        finally:
+            await engine.aclose()
+
+        expected = engine._calculate_confidence_interval(results.team_a_win_probability, 40)
+        assert not results.antithetic_paired
+        assert results.confidence_interval_95 == expected
+
+    def test_set_distribution_matches_per_match_count(self, make_batch):
+        """Test the bincount set distribution equals counting each match."""
+        batch = make_batch(2000)
+        summary = _summary(batch)
+
+        results = MonteCarloEngine(max_workers=1)._calculate_statistics(summary, batch, 0.0)
+
+        expected = Counter(f"{row['sets_a']}-{row['sets_b']}" for row in summary)
+        assert results.set_distribution == dict(expected)
+
+
+class TestProbabilityCache:
+    """Test the cached base distributions of the probability engine."""
+
+    def test_stats_change_invalidates_cache(self, make_team):
+        """Test a statistic changed in place is seen by the next lookup."""
+        engine = ProbabilityEngine()
+        team = make_team("Team A", "12.0", "50.0")
+        opponent = make_team("Team B", "8.0", "40.0")
+
+        before = engine._cached_base_probabilities(RallyState.SERVE_READY, team, opponent)
+        team.service_ace_percentage = Decimal('20.0')
+        after = engine._cached_base_probabilities(RallyState.SERVE_READY, team, opponent)
+
+        assert before[RallyState.SERVE_ACE] == pytest.approx(0.12)
+        assert after[RallyState.SERVE_ACE] == pytest.approx(0.20)
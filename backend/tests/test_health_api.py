@@ -0,0 +1,58 @@
+"""
+Tests for the liveness, readiness and health endpoints.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, patch
+
+from bvsim.core import database
+from bvsim.main import app
+
+
+@pytest.fixture
+def client():
+    """Create test client with no readiness result cached."""
+    database._last_readiness = None
+    yield TestClient(app)
+    database._last_readiness = None
+
+
+class TestHealthEndpoints:
+    """Test the probe endpoints."""
+
+    def test_live_never_checks_database(self, client):
+        """Test liveness answers without pinging the database."""
+        with patch.object(database, "check_database_connection", AsyncMock(return_value=True)) as ping:
+            response = client.get("/live")
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "ok"}
+        assert ping.await_count == 0
+
+    def test_ready_reuses_recent_ping(self, client):
+        """Test readiness pings the database once per TTL."""
+        with patch.object(database, "check_database_connection", AsyncMock(return_value=True)) as ping:
+            assert client.get("/ready").status_code == 200
+            assert client.get("/ready").status_code == 200
+
+        assert ping.await_count == 1
+
+    def test_ready_unavailable_without_database(self, client):
+        """Test readiness reports 503 when the database is unreachable."""
+        with patch.object(database, "check_database_connection", AsyncMock(return_value=False)):
+            response = client.get("/ready")
+
+        assert response.status_code == 503
+        assert response.json() == {"status": "not_ready"}
+
+    def test_health_reports_current_time_and_uptime(self, client):
+        """Test health reports a live timestamp and a growing uptime."""
+        with patch.object(database, "check_database_connection", AsyncMock(return_value=True)):
+            first = client.get("/health").json()
+            second = client.get("/health").json()
+
+        assert first["database_connected"] is True
+        assert first["timestamp"].endswith("Z")
+        assert first["timestamp"] != "2025-07-10T15:45:00Z"
+        assert second["uptime_seconds"] >= first["uptime_seconds"] > 0
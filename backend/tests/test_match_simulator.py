@@ -0,0 +1,135 @@
+"""
+Tests for match simulation requests sharing one simulator.
+"""
+
+import asyncio
+import pytest
+from decimal import Decimal
+from fastapi.testclient import TestClient
+
+from bvsim.api.monte_carlo import monte_carlo_engine
+from bvsim.engine.match_simulator import MatchSimulator, MomentumEngine
+from bvsim.engine.monte_carlo import MonteCarloEngine, get_default_monte_carlo_engine
+from bvsim.main import app
+from bvsim.schemas.match import MatchSimulationRequest, MomentumState
+
+
+@pytest.fixture
+def make_request(make_team):
+    """Factory for seeded match requests between two fixed teams."""
+    def make(seed: int, effects: bool) -> MatchSimulationRequest:
+        return MatchSimulationRequest(
+            team_a=make_team("Team A", "12.0", "45.0"), team_b=make_team("Team B", "10.0", "40.0"),
+            num_simulations=50, random_seed=seed,
+            momentum_effects=effects, pressure_effects=effects
+        )
+
+    return make
+
+
+class TestConcurrentMatchSimulation:
+    """Test overlapping requests on one simulator stay independent."""
+
+    @pytest.mark.asyncio
+    async def test_seeded_results_unaffected_by_overlap(self, make_request):
+        """Test a seeded request gives the same result alone and overlapped."""
+        simulator = MatchSimulator()
+
+        alone = await simulator.run_match_simulation(make_request(7, True))
+        overlapped, _ = await asyncio.gather(
+            simulator.run_match_simulation(make_request(7, True)),
+            simulator.run_match_simulation(make_request(9, False))
+        )
+
+        assert overlapped.statistics.team_a_wins == alone.statistics.team_a_wins
+        assert overlapped.statistics.avg_rally_length == alone.statistics.avg_rally_length
+
+    def test_effect_engines_not_toggled(self, make_team):
+        """Test a match without effects leaves the shared engines enabled."""
+        simulator = MatchSimulator()
+
+        simulator.simulate_match(make_team("Team A", "12.0", "45.0"), make_team("Team B", "10.0", "40.0"),
+                                 enable_momentum=False, enable_pressure=False,
+                                 include_rally_details=False)
+
+        assert simulator.momentum_engine.enable_momentum
+        assert simulator.pressure_engine.enable_pressure
+
+
+class TestEffectAdjustedTeams:
+    """Test the cache of effect-adjusted team copies."""
+
+    def test_in_place_change_rebuilds_adjusted_team(self, make_team):
+        """Test a statistic changed in place is seen by the next adjusted copy."""
+        simulator = MatchSimulator()
+        team = make_team("Team A", "12.0", "45.0")
+
+        assert simulator._apply_effects_to_team(team, 0.1).service_ace_percentage == Decimal('13.2')
+
+        team.service_ace_percentage = Decimal('30.0')
+
+        assert simulator._apply_effects_to_team(team, 0.1).service_ace_percentage == Decimal('33.0')
+
+    def test_entry_of_other_team_not_reused(self, make_team):
+        """Test an entry is only returned for the team that built it."""
+        simulator = MatchSimulator()
+        team = make_team("Team A", "12.0", "45.0")
+        other = make_team("Team B", "20.0", "45.0")
+        # Plant team's entry under the other team's key, as a recycled id would
+        simulator._team_cache[(id(other), other.stats_version, 0.1)] = (team, team)
+
+        assert simulator._apply_effects_to_team(other, 0.1).service_ace_percentage == Decimal('22.0')
+
+
+class TestMomentumState:
+    """Test momentum updates on immutable states."""
+
+    def test_update_leaves_input_state_unchanged(self):
+        """Test updating momentum returns a new state and leaves the input alone."""
+        engine = MomentumEngine()
+        state = MomentumState()
+
+        for _ in range(5):
+            new_state = engine.update_momentum(state, 'A', 'A')
+
+        assert list(state.recent_rally_outcomes) == []
+        assert state.recent_wins_a == 0
+        assert list(new_state.recent_rally_outcomes) == ['A']
+        assert new_state.recent_wins_a == 1
+
+    def test_chained_updates_keep_counters_in_step(self):
+        """Test the win counters follow the outcome buffer across updates."""
+        engine = MomentumEngine()
+        state = MomentumState()
+
+        for winner in ['A', 'B', 'A', 'A', 'B', 'A', 'A']:
+            state = engine.update_momentum(state, winner, 'A')
+
+        assert list(state.recent_rally_outcomes) == ['A', 'A', 'B', 'A', 'A']
+        assert (state.recent_wins_a, state.recent_wins_b) == (4, 1)
+
+
+class TestWorkerPools:
+    """Test the simulation worker pools."""
+
+    def test_engine_shared_by_api_and_match_simulator(self):
+        """Test the API and the match simulator use one engine and its pools."""
+        assert MatchSimulator().monte_carlo_engine is monte_carlo_engine
+        assert monte_carlo_engine is get_default_monte_carlo_engine()
+
+    def test_workers_not_forked(self):
+        """Test worker processes do not fork the threaded server process."""
+        engine = MonteCarloEngine(max_workers=1)
+        try:
+            assert engine.process_pool()._mp_context.get_start_method() in ("forkserver", "spawn")
+        finally:
+            asyncio.run(engine.aclose())
+
+    def test_app_shutdown_closes_pools(self):
+        """Test leaving the app's lifespan shuts every started pool down."""
+        with TestClient(app):
+            monte_carlo_engine.process_pool()
+            monte_carlo_engine._get_pool(use_kernels=True)
+
+        assert monte_carlo_engine._pool is None
+        assert monte_carlo_engine._thread_pool is None